@@ -7,8 +7,8 @@ import { TopBar } from "@/components/layout/TopBar";
 import { ChapterView } from "@/components/bibel/ChapterView";
 import { ChapterNavigation } from "@/components/bibel/ChapterNavigation";
 import { useTranslation } from "@/components/providers/TranslationProvider";
-import { loadBook } from "@/lib/bible-loader";
-import { getBookById, Book, Chapter } from "@/lib/types";
+import { getManifest, loadBook, loadColdData, loadRenderTokens } from "@/lib/bible-loader";
+import { getBookById, Book, BookColdData, BookRenderTokens, Chapter } from "@/lib/types";
 import { motion } from "framer-motion";
 
 interface PageProps {
@@ -24,6 +24,8 @@ export default function LesenPage({ params }: PageProps) {
   const { translation } = useTranslation();
 
   const [bookData, setBookData] = useState<Book | null>(null);
+  const [renderTokens, setRenderTokens] = useState<BookRenderTokens | null>(null);
+  const [coldData, setColdData] = useState<BookColdData | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(false);
 
@@ -37,12 +39,16 @@ export default function LesenPage({ params }: PageProps) {
       setLoading(true);
       setError(false);
 
-      const book = await loadBook(translation, buch);
+      const [book, tokens] = await Promise.all([
+        loadBook(translation, buch),
+        loadRenderTokens(translation, buch),
+      ]);
 
       if (cancelled) return;
 
       if (book) {
         setBookData(book);
+        setRenderTokens(tokens);
       } else {
         setError(true);
       }
@@ -56,6 +62,37 @@ export default function LesenPage({ params }: PageProps) {
     };
   }, [translation, buch]);
 
+  // Ausgelagerte Einleitung/Fußnoten erst nach dem ersten Rendern nachladen,
+  // und nur wenn das Kapitel sie braucht
+  useEffect(() => {
+    let cancelled = false;
+    setColdData(null);
+
+    const entry = getManifest(translation)?.books[buch];
+    const chapterVerses = bookData?.chapters.find((c) => c.number === chapterNum)?.verses;
+    const needed =
+      (chapterNum === 1 && entry?.hasIntroduction) ||
+      chapterVerses?.some((v) => v.footnoteCount);
+
+    if (!bookData || !entry?.hasColdData || !needed) return;
+
+    loadColdData(translation, buch).then((data) => {
+      if (!cancelled) setColdData(data);
+    });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [translation, buch, bookData, chapterNum]);
+
+  // Sprungziel aus "Gehe zu Stelle" (#v16) anspringen, sobald das Kapitel gerendert ist
+  useEffect(() => {
+    if (loading) return;
+    const match = /^#v(\d+)$/.exec(window.location.hash);
+    if (!match) return;
+    document.querySelector(`[data-verse="${match[1]}"]`)?.scrollIntoView({ block: "center" });
+  }, [loading, buch, chapterNum]);
+
   // Handle loading and errors
   if (!bookMeta) {
     notFound();
@@ -117,7 +154,9 @@ export default function LesenPage({ params }: PageProps) {
         bookName={bookData.name}
         chapterNumber={chapter.number}
         verses={chapter.verses}
-        introduction={bookData.introduction}
+        tokens={renderTokens?.chapters.find((c) => c.number === chapterNum)?.verses}
+        coldFootnotes={coldData?.footnotes}
+        introduction={bookData.introduction ?? coldData?.introduction}
       />
 
       {/* Navigation */}
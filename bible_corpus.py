@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Shared reader for the Bible corpus in data/bibel.
+
+Parses the generated TypeScript book modules back into plain Python dicts so
+the build tools can work on the same data the app imports. Book order and
+translation folders are read from lib/types.ts, which stays the single source
+of truth for both the app and the toolchain.
+"""
+
+import functools
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from safe_io import write_text_atomic
+
+DATA_DIR = "data/bibel"
+TYPES_FILE = "lib/types.ts"
+GENERATED_DIR = "public/generated"
+
+TESTAMENT_FOLDERS = {"old": "AT", "new": "NT"}
+COLD_SUFFIX = ".cold.json"
+FOOTNOTE_DICTIONARY = "footnotes.json"
+
+_WORD_RE = re.compile(r"[^\W\d_]+(?:[-'’][^\W\d_]+)*")
+
+
+class ParseError(ValueError):
+    """Raised when a book module cannot be parsed."""
+
+
+class _LiteralParser:
+    """Minimal parser for the JavaScript object literals used in book modules."""
+
+    _ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+    def __init__(self, source: str, pos: int = 0):
+        self.source = source
+        self.pos = pos
+
+    def error(self, message: str) -> ParseError:
+        line = self.source.count('\n', 0, self.pos) + 1
+        return ParseError(f"{message} (line {line})")
+
+    def skip_ws(self) -> None:
+        src = self.source
+        while self.pos < len(src):
+            ch = src[self.pos]
+            if ch.isspace():
+                self.pos += 1
+            elif src.startswith('//', self.pos):
+                end = src.find('\n', self.pos)
+                self.pos = len(src) if end == -1 else end + 1
+            elif src.startswith('/*', self.pos):
+                end = src.find('*/', self.pos)
+                self.pos = len(src) if end == -1 else end + 2
+            else:
+                break
+
+    def parse_value(self):
+        self.skip_ws()
+        if self.pos >= len(self.source):
+            raise self.error("Unexpected end of input")
+        ch = self.source[self.pos]
+        if ch == '{':
+            return self.parse_object()
+        if ch == '[':
+            return self.parse_array()
+        if ch in '"\'`':
+            return self.parse_string()
+        match = re.compile(r'-?\d+(?:\.\d+)?').match(self.source, self.pos)
+        if match:
+            self.pos = match.end()
+            text = match.group()
+            return float(text) if '.' in text else int(text)
+        for word, value in (("true", True), ("false", False), ("null", None), ("undefined", None)):
+            if self.source.startswith(word, self.pos):
+                self.pos += len(word)
+                return value
+        raise self.error(f"Unexpected character {ch!r}")
+
+    def parse_string(self) -> str:
+        src = self.source
+        quote = src[self.pos]
+        self.pos += 1
+        parts = []
+        start = self.pos
+        while True:
+            if self.pos >= len(src):
+                raise self.error("Unterminated string")
+            ch = src[self.pos]
+            if ch == quote:
+                parts.append(src[start:self.pos])
+                self.pos += 1
+                return ''.join(parts)
+            if ch == '\\':
+                parts.append(src[start:self.pos])
+                esc = src[self.pos + 1]
+                if esc == 'u':
+                    parts.append(chr(int(src[self.pos + 2:self.pos + 6], 16)))
+                    self.pos += 6
+                else:
+                    parts.append(self._ESCAPES.get(esc, esc))
+                    self.pos += 2
+                start = self.pos
+            elif quote == '`' and src.startswith('${', self.pos):
+                raise self.error("Template expressions are not supported")
+            else:
+                self.pos += 1
+
+    def parse_key(self) -> str:
+        self.skip_ws()
+        if self.source[self.pos] in '"\'':
+            return self.parse_string()
+        match = re.compile(r'[A-Za-z_$][\w$]*').match(self.source, self.pos)
+        if not match:
+            raise self.error("Expected property name")
+        self.pos = match.end()
+        return match.group()
+
+    def expect(self, ch: str) -> None:
+        self.skip_ws()
+        if not self.source.startswith(ch, self.pos):
+            raise self.error(f"Expected {ch!r}")
+        self.pos += 1
+
+    def parse_object(self) -> Dict:
+        self.expect('{')
+        result = {}
+        while True:
+            self.skip_ws()
+            if self.source[self.pos] == '}':
+                self.pos += 1
+                return result
+            key = self.parse_key()
+            self.expect(':')
+            result[key] = self.parse_value()
+            self.skip_ws()
+            if self.source[self.pos] == ',':
+                self.pos += 1
+
+    def parse_array(self) -> List:
+        self.expect('[')
+        result = []
+        while True:
+            self.skip_ws()
+            if self.source[self.pos] == ']':
+                self.pos += 1
+                return result
+            result.append(self.parse_value())
+            self.skip_ws()
+            if self.source[self.pos] == ',':
+                self.pos += 1
+
+
+def parse_exports(source: str) -> Dict[str, object]:
+    """Parse every `export const name[: Type] = <literal>;` in a module."""
+    exports = {}
+    for match in re.finditer(r'^export\s+const\s+([\w$]+)(?:\s*:\s*[\w.]+)?\s*=\s*', source, re.MULTILINE):
+        name = match.group(1)
+        parser = _LiteralParser(source, match.end())
+        parser.skip_ws()
+        if re.match(r'[{\["\'`\d-]', source[parser.pos]):
+            exports[name] = parser.parse_value()
+    return exports
+
+
+def export_name(book_id: str) -> str:
+    """Export name of a book module (identifiers cannot start with a digit)."""
+    return f"_{book_id}" if book_id[0].isdigit() else book_id
+
+
+def load_book_file(path: str) -> Dict:
+    """Load a single book module and return the Book object as a dict."""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    book_id = os.path.splitext(os.path.basename(path))[0]
+    exports = parse_exports(source)
+    book = exports.get(export_name(book_id)) or exports.get(book_id)
+    if not isinstance(book, dict):
+        raise ParseError(f"{path}: no Book export found")
+    cold_file = cold_path(path)
+    if os.path.exists(cold_file):
+        with open(cold_file, 'r', encoding='utf-8') as f:
+            cold = json.load(f)
+        # data/bibel/<folder>/<AT|NT>/<book>.ts -> data/bibel/<folder>/footnotes.json
+        translation_dir = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+        dictionary = _load_footnote_dictionary(os.path.join(translation_dir, FOOTNOTE_DICTIONARY))
+        merge_cold_fields(book, cold, book_index(book_id), dictionary)
+    return book
+
+
+@functools.lru_cache(maxsize=None)
+def _load_footnote_dictionary(path: str) -> Tuple[str, ...]:
+    if not os.path.exists(path):
+        return ()
+    with open(path, 'r', encoding='utf-8') as f:
+        return tuple(json.load(f))
+
+
+def cold_path(book_file: str) -> str:
+    """Companion file with the cold fields of a book module (Mt.ts -> Mt.cold.json)."""
+    return os.path.splitext(book_file)[0] + COLD_SUFFIX
+
+
+def verse_key(vid: int, part: int = 0) -> str:
+    """Key of a verse in cold data: its verse id, split verses (Gen 2,4b) as "<id>.<part>"."""
+    return str(vid) if part == 0 else f"{vid}.{part}"
+
+
+def _verse_keys(book: Dict, index: int) -> Iterator[Tuple[Dict, str]]:
+    for chapter in book['chapters']:
+        parts: Dict[int, int] = {}
+        for verse in chapter['verses']:
+            part = parts.get(verse['number'], 0)
+            parts[verse['number']] = part + 1
+            yield verse, verse_key(verse_id(index, chapter['number'], verse['number']), part)
+
+
+def split_cold_fields(book: Dict, index: int) -> Tuple[Dict, Dict]:
+    """
+    Split a book into the hot part needed for the first paint and its cold
+    fields. The cold dict holds the introduction and the footnotes keyed by
+    verse_key(); hot verses keep only `footnoteCount`, so the markers can be
+    placed before the footnotes are loaded.
+    """
+    hot = {key: value for key, value in book.items() if key not in ('introduction', 'chapters')}
+    hot['chapters'] = [
+        {'number': chapter['number'], 'verses': [dict(v) for v in chapter['verses']]}
+        for chapter in book['chapters']
+    ]
+    cold: Dict = {}
+    if book.get('introduction'):
+        cold['introduction'] = book['introduction']
+    footnotes = {}
+    for verse, key in _verse_keys(hot, index):
+        notes = verse.pop('footnotes', None)
+        if notes:
+            footnotes[key] = notes
+            verse['footnoteCount'] = len(notes)
+    cold['footnotes'] = footnotes
+    return hot, cold
+
+
+def merge_cold_fields(book: Dict, cold: Dict, index: int, dictionary: Sequence[str] = ()) -> None:
+    """
+    Inverse of split_cold_fields(), in place. Footnotes given as integers are
+    references into the translation's footnote dictionary
+    (build_footnote_dictionary.py).
+    """
+    if cold.get('introduction'):
+        book['introduction'] = cold['introduction']
+    footnotes = cold.get('footnotes', {})
+    for verse, key in _verse_keys(book, index):
+        verse.pop('footnoteCount', None)
+        if key in footnotes:
+            verse['footnotes'] = [dictionary[f] if isinstance(f, int) else f for f in footnotes[key]]
+
+
+def book_index(book_id: str) -> int:
+    """1-based canonical index of a book (0 for books not in BIBLE_BOOKS)."""
+    return next((book['index'] for book in load_book_catalog() if book['id'] == book_id), 0)
+
+
+def load_types_source() -> str:
+    with open(TYPES_FILE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def load_translations() -> Dict[str, str]:
+    """Return translation id -> data folder, as declared in lib/types.ts."""
+    source = load_types_source()
+    block = source[source.index('export const TRANSLATIONS'):]
+    block = block[:block.index('} as const;')]
+    return {
+        m.group(1): m.group(2)
+        for m in re.finditer(r'\bid: "(\w+)",[^}]*?\bfolder: "([^"]+)"', block)
+    }
+
+
+def load_book_catalog() -> List[Dict]:
+    """
+    Return the canonical book list from BIBLE_BOOKS in lib/types.ts.
+    Each entry has id, name, shortName, chapters, testament and a 1-based index.
+    """
+    source = load_types_source()
+    block = source[source.index('export const BIBLE_BOOKS'):]
+    block = block[:block.index('} as const;')]
+    catalog = []
+    testament = None
+    for line in block.splitlines():
+        section = re.match(r'\s*(old|new): \[', line)
+        if section:
+            testament = section.group(1)
+            continue
+        entry = re.search(
+            r'id: "([^"]+)", name: "([^"]+)", shortName: "([^"]+)", chapters: (\d+)', line
+        )
+        if entry and testament:
+            catalog.append({
+                'index': len(catalog) + 1,
+                'id': entry.group(1),
+                'name': entry.group(2),
+                'shortName': entry.group(3),
+                'chapters': int(entry.group(4)),
+                'testament': testament,
+            })
+    return catalog
+
+
+def book_name_variants(name: str) -> List[str]:
+    """
+    Spellings under which a German book name appears in sources, e.g.
+    "1. Korinther" -> "1. Korinther", "1 Korinther", "1.Korinther", "1Korinther"
+    and "1. Mose (Genesis)" -> also "1. Mose" and "Genesis".
+    """
+    names = [name]
+    paren = re.match(r'^(.*?)\s*\((.+)\)$', name)
+    if paren:
+        names = [name, paren.group(1), paren.group(2)]
+    variants = []
+    for n in names:
+        numbered = re.match(r'^(\d)\.?\s*(.+)$', n)
+        candidates = [n]
+        if numbered:
+            num, rest = numbered.groups()
+            candidates = [f"{num}. {rest}", f"{num} {rest}", f"{num}.{rest}", f"{num}{rest}"]
+        for c in candidates:
+            if c not in variants:
+                variants.append(c)
+    return variants
+
+
+def book_name_mapping(testament: Optional[str] = None) -> Dict[str, str]:
+    """German book name (in all spellings from book_name_variants) -> book id."""
+    mapping = {}
+    for book in load_book_catalog():
+        if testament and book['testament'] != testament:
+            continue
+        for variant in book_name_variants(book['name']):
+            mapping.setdefault(variant, book['id'])
+    return mapping
+
+
+def manifest_path(folder: str) -> str:
+    return os.path.join(DATA_DIR, folder, "manifest.json")
+
+
+def load_manifest(translation_id: str) -> Optional[Dict]:
+    """Book manifest of a translation as written by build_manifest.py, if present."""
+    folder = load_translations()[translation_id]
+    path = manifest_path(folder)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def available_translations() -> Dict[str, str]:
+    """Translations whose data folder actually exists on disk."""
+    return {
+        tid: folder for tid, folder in load_translations().items()
+        if os.path.isdir(os.path.join(DATA_DIR, folder))
+    }
+
+
+def book_path(folder: str, testament: str, book_id: str) -> str:
+    return os.path.join(DATA_DIR, folder, TESTAMENT_FOLDERS[testament], f"{book_id}.ts")
+
+
+def iter_books(translation_id: str) -> Iterator[Tuple[Dict, Dict]]:
+    """Yield (catalog entry, book dict) for every book present, in canonical order."""
+    folder = load_translations()[translation_id]
+    for meta in load_book_catalog():
+        path = book_path(folder, meta['testament'], meta['id'])
+        if os.path.exists(path):
+            yield meta, load_book_file(path)
+
+
+def verse_id(book_index: int, chapter: int, verse: int) -> int:
+    """Stable integer verse id in BBCCCVVV form."""
+    return book_index * 1_000_000 + chapter * 1000 + verse
+
+
+def split_verse_id(vid: int) -> Tuple[int, int, int]:
+    return vid // 1_000_000, vid // 1000 % 1000, vid % 1000
+
+
+def iter_verses(translation_id: str) -> Iterator[Dict]:
+    """
+    Stream flat verse records for a translation, in canonical order.
+
+    Each record has id, seq, part, bookId, bookIndex, chapter, verse, text and
+    the optional heading, footnotes and synopsis fields of the source verse. `id` is the
+    BBCCCVVV reference id; a few EÜ verses are split into several entries with
+    the same number (e.g. Gen 2,4a/4b, the Greek additions in Esther), which
+    share the id and are told apart by `part` (0, 1, ...). `seq` is the
+    0-based position in the translation and is unique.
+    """
+    seq = 0
+    for meta, book in iter_books(translation_id):
+        for chapter in book['chapters']:
+            parts: Dict[int, int] = {}
+            for verse in chapter['verses']:
+                part = parts.get(verse['number'], 0)
+                parts[verse['number']] = part + 1
+                yield {
+                    'id': verse_id(meta['index'], chapter['number'], verse['number']),
+                    'seq': seq,
+                    'part': part,
+                    'bookId': meta['id'],
+                    'bookIndex': meta['index'],
+                    'chapter': chapter['number'],
+                    'verse': verse['number'],
+                    'text': verse.get('text', ''),
+                    'heading': verse.get('heading'),
+                    'footnotes': verse.get('footnotes'),
+                    'synopsis': verse.get('synopsis'),
+                }
+                seq += 1
+
+
+def plain_text(text: str) -> str:
+    """Verse text without the ' / ' poetry line markers."""
+    return re.sub(r'\s+/\s+', ' ', text)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split verse text into words (letters only, hyphenated compounds kept)."""
+    return _WORD_RE.findall(text)
+
+
+def tokenize_with_offsets(text: str) -> Iterator[Tuple[str, int, int]]:
+    """Like tokenize(), but yield (word, start, end) character positions."""
+    for match in _WORD_RE.finditer(text):
+        yield match.group(), match.start(), match.end()
+
+
+def normalize_term(word: str) -> str:
+    """Case-folded search term; umlauts and ß are kept as they are."""
+    return word.lower()
+
+
+def generated_path(translation_id: Optional[str], *parts: str) -> str:
+    """Path below public/generated for a (translation specific) build artifact."""
+    base = os.path.join(GENERATED_DIR, translation_id) if translation_id else GENERATED_DIR
+    return os.path.join(base, *parts)
+
+
+def json_payload(data) -> bytes:
+    """Compact UTF-8 JSON, the form chapters and books are shipped in as artifacts."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_json(path: str, data, compact: bool = True) -> bool:
+    """
+    Write a JSON build artifact atomically (see safe_io). Returns False if the
+    file already had exactly this content.
+    """
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+    return write_text_atomic(path, text)
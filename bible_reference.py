@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Parse German Bible references and resolve them to verse lists.
+
+Understands every spelling used in the corpus and the tools: full names from
+BIBLE_BOOKS ("1. Korinther", "Hebräer"), their variants ("1 Korinther",
+"1Kor"), the short names of both translations and the EÜ footnote
+abbreviations ("Dtn", "Ijob", "1 Kön"). Book names are matched through a
+character trie, so a reference in running text costs one walk per position.
+
+Supported forms:
+    Joh 3,16          1 Kor 13,4-7        Mt 5,3–7,29       Ex 13,2.12
+    Ps 23             Ex 13 - 15          Am 3,9f           112,1; Jos 1,8
+
+In books with a single chapter (Obadja, Philemon, 2./3. Johannes, Judas) a
+number after the book name is a verse: "Jud 5" is Jud 1,5.
+
+Ranges are expanded with per-chapter verse-count prefix sums taken from the
+translation manifest (build_manifest.py), so no book module is loaded.
+
+--export-aliases writes all spellings as {normalized alias: book id} to
+public/generated/book-aliases.json for the app's "go to reference" input
+(lib/bible-reference.ts); normalized means lowercase without spaces and dots.
+
+Usage:
+    python3 bible_reference.py "1 Kor 13,4-7" "Mt 5,3–7,29" [--translation neue]
+    python3 bible_reference.py --check-footnotes einheitsuebersetzung
+    python3 bible_reference.py --export-aliases
+"""
+
+import argparse
+import bisect
+import re
+import sys
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from bible_corpus import book_name_variants, generated_path, iter_verses, load_book_catalog, load_manifest, write_json
+
+# Abbreviations used by the EÜ (Loccumer Richtlinien) and common alternatives
+# that are not derivable from BIBLE_BOOKS
+EXTRA_ABBREVIATIONS = {
+    "genesis": ["Gen"], "exodus": ["Ex"], "leviticus": ["Lev"], "numbers": ["Num"],
+    "deuteronomy": ["Dtn"], "judges": ["Richter"], "1samuel": ["1 Sam"], "2samuel": ["2 Sam"],
+    "1kings": ["1 Kön", "1 Kg"], "2kings": ["2 Kön", "2 Kg"], "1chronicles": ["1 Chr"],
+    "2chronicles": ["2 Chr"], "ezra": ["Esra"], "nehemiah": ["Nehemia"], "esther": ["Ester", "Esther"],
+    "job": ["Ijob", "Hiob", "Job"], "psalms": ["Psalm", "Psalmen"], "proverbs": ["Sprichwörter"],
+    "ecclesiastes": ["Koh", "Kohelet", "Prediger"], "songofsolomon": ["Hoheslied"],
+    "isaiah": ["Jesaja"], "jeremiah": ["Jeremia"], "lamentations": ["Klagelieder"],
+    "ezekiel": ["Ez", "Ezechiel", "Hes"], "joel": ["Joël"], "obadiah": ["Obadja", "Obd"],
+    "micah": ["Micha"], "habakkuk": ["Habakuk"], "zephaniah": ["Zefanja"],
+    "zechariah": ["Sach", "Sacharja"], "malachi": ["Maleachi"], "tobit": ["Tob"],
+    "judith": ["Jdt", "Judit"], "wisdom": ["Weish", "Weisheit"], "sirach": ["Sir", "Jesus Sirach"],
+    "baruch": ["Bar"], "1maccabees": ["1 Makk"], "2maccabees": ["2 Makk"],
+    "john": ["Johannes"], "acts": ["Apostelgeschichte"], "philemon": ["Phlm", "Philemon"],
+    "revelation": ["Offb", "Apokalypse"],
+}
+
+_SKIP = ' .'
+_TERMINAL = '\0'
+
+
+class Reference(NamedTuple):
+    """A contiguous passage; verses are None for whole chapters."""
+    book: str
+    start_chapter: int
+    start_verse: Optional[int]
+    end_chapter: int
+    end_verse: Optional[int]
+
+
+def _alias_key(alias: str) -> str:
+    return ''.join(ch for ch in alias.lower() if ch not in _SKIP)
+
+
+def book_aliases() -> Dict[str, str]:
+    """All spellings of all book names -> book id (first spelling wins)."""
+    aliases: Dict[str, str] = {}
+    for book in load_book_catalog():
+        names = [book['name'], book['shortName']] + EXTRA_ABBREVIATIONS.get(book['id'], [])
+        for name in names:
+            for variant in book_name_variants(name):
+                aliases.setdefault(variant, book['id'])
+    return aliases
+
+
+def build_trie() -> Dict:
+    """Character trie over all book aliases (lowercase, without spaces and dots)."""
+    trie: Dict = {}
+    for alias, book_id in book_aliases().items():
+        key = _alias_key(alias)
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node.setdefault(_TERMINAL, book_id)
+    return trie
+
+
+def alias_table() -> Dict[str, str]:
+    """Normalized alias (as in the trie) -> book id, for clients without the trie."""
+    table: Dict[str, str] = {}
+    for alias, book_id in book_aliases().items():
+        table.setdefault(_alias_key(alias), book_id)
+    return dict(sorted(table.items()))
+
+
+_trie: Optional[Dict] = None
+_single_chapter: Optional[set] = None
+
+
+def _get_trie() -> Dict:
+    global _trie
+    if _trie is None:
+        _trie = build_trie()
+    return _trie
+
+
+def is_single_chapter(book: str) -> bool:
+    global _single_chapter
+    if _single_chapter is None:
+        _single_chapter = {b['id'] for b in load_book_catalog() if b['chapters'] == 1}
+    return book in _single_chapter
+
+
+def match_book(text: str, pos: int = 0) -> Optional[Tuple[str, int]]:
+    """
+    Longest book alias starting at `pos`. Returns (book id, end position) or
+    None. The alias must start with a digit or a capital letter (so "am" in
+    running text is not Amos) and end at a word boundary.
+    """
+    if pos >= len(text) or not (text[pos].isdigit() or text[pos].isupper()):
+        return None
+    node = _get_trie()
+    best = None
+    i = pos
+    while i < len(text):
+        ch = text[i].lower()
+        if ch in node:
+            node = node[ch]
+            i += 1
+            if _TERMINAL in node and (i >= len(text) or not text[i].isalpha()):
+                best = (node[_TERMINAL], i)
+        elif ch in _SKIP and i > pos:
+            i += 1
+        else:
+            break
+    return best
+
+
+def book_id_for_name(name: str) -> Optional[str]:
+    """Book id if `name` as a whole is a known book name or abbreviation."""
+    name = name.strip()
+    match = match_book(name)
+    if match and match[1] == len(name):
+        return match[0]
+    return None
+
+
+_NUM = re.compile(r'\s*(\d+)')
+_VERSE = re.compile(r'(\d+)[a-e]?(ff|f)?')
+_DASH = re.compile(r'\s*[-–]\s*')
+# EÜ footnotes mark the verses they annotate as "(12f)" / "(16-17)"; what
+# follows refers to the annotated book again
+_VERSE_MARKER = re.compile(r'\(\d+[a-e]?(?:ff|f|\s*[-–]\s*\d+[a-e]?)?\)')
+
+
+def _parse_verses(text: str, pos: int, book: str, chapter: int) -> Tuple[List[Reference], int]:
+    """Parse a verse list after 'chapter,' e.g. '3-7', '2.12', '9f', '3–7,29'."""
+    refs = []
+    while True:
+        m = _VERSE.match(text, pos)
+        if not m:
+            break
+        verse = int(m.group(1))
+        end_chapter, end_verse = chapter, verse
+        if m.group(2) == 'f':
+            end_verse = verse + 1
+        elif m.group(2) == 'ff':
+            end_verse = verse + 2
+        pos = m.end()
+
+        dash = _DASH.match(text, pos)
+        if dash:
+            cross = re.compile(r'(\d+),(\d+)[a-e]?').match(text, dash.end())
+            simple = _VERSE.match(text, dash.end())
+            if cross:
+                end_chapter, end_verse = int(cross.group(1)), int(cross.group(2))
+                pos = cross.end()
+            elif simple:
+                end_verse = int(simple.group(1))
+                pos = simple.end()
+
+        refs.append(Reference(book, chapter, verse, end_chapter, end_verse))
+        chapter = end_chapter
+        if text.startswith('.', pos) and pos + 1 < len(text) and text[pos + 1].isdigit():
+            pos += 1
+            continue
+        break
+    return refs, pos
+
+
+def _parse_spec(text: str, pos: int, book: str, require_verse: bool) -> Tuple[List[Reference], int]:
+    """Parse 'chapter[,verses]' or a chapter range at pos."""
+    m = _NUM.match(text, pos)
+    if not m:
+        return [], pos
+    chapter = int(m.group(1))
+    pos = m.end()
+
+    if text.startswith(',', pos) and pos + 1 < len(text) and text[pos + 1].isdigit():
+        return _parse_verses(text, pos + 1, book, chapter)
+    if require_verse:
+        return [], pos
+    if is_single_chapter(book):
+        # "Jud 5", "Phlm 8-10": the number is a verse of chapter 1
+        return _parse_verses(text, m.start(1), book, 1)
+
+    end_chapter = chapter
+    dash = _DASH.match(text, pos)
+    if dash:
+        m = re.compile(r'(\d+)(?![\d,])').match(text, dash.end())
+        if m:
+            end_chapter = int(m.group(1))
+            pos = m.end()
+    return [Reference(book, chapter, None, end_chapter, None)], pos
+
+
+def parse_references(text: str, default_book: Optional[str] = None) -> List[Reference]:
+    """
+    Find all references in `text`. A reference without a book name (as in
+    footnotes: "112,1; Jos 1,8") belongs to the last named book, or to
+    `default_book`, and must have a verse so plain numbers are not mistaken
+    for chapters.
+    """
+    refs: List[Reference] = []
+    book = default_book
+    pos = 0
+    while pos < len(text):
+        marker = _VERSE_MARKER.match(text, pos)
+        if marker:
+            book = default_book
+            pos = marker.end()
+            continue
+        at_word_start = pos == 0 or not text[pos - 1].isalnum()
+        if at_word_start:
+            match = match_book(text, pos)
+            if match and _NUM.match(text, match[1]):
+                found, end = _parse_spec(text, match[1], match[0], require_verse=False)
+                if found:
+                    book = match[0]
+                    refs.extend(found)
+                    pos = end
+                    continue
+            if book and text[pos].isdigit() and (pos == 0 or text[pos - 1] not in ',.-–'):
+                found, end = _parse_spec(text, pos, book, require_verse=True)
+                if found:
+                    refs.extend(found)
+                    pos = end
+                    continue
+        pos += 1
+    return refs
+
+
+class VerseAddressing:
+    """
+    Maps (book, chapter, verse) to a linear verse number of a translation and
+    back, using prefix sums of the per-chapter verse counts in the manifest.
+    """
+
+    def __init__(self, translation_id: str):
+        manifest = load_manifest(translation_id)
+        if manifest is None:
+            raise FileNotFoundError(f"No manifest for '{translation_id}' (run build_manifest.py)")
+        self.chapter_keys: List[Tuple[str, int]] = []
+        self.first_chapter: Dict[str, int] = {}
+        counts = []
+        for book_id, entry in manifest['books'].items():
+            self.first_chapter[book_id] = len(self.chapter_keys)
+            for number, verses in enumerate(entry['verses'], start=1):
+                self.chapter_keys.append((book_id, number))
+                counts.append(verses)
+        self.chapter_counts: Dict[str, int] = {b: e['chapters'] for b, e in manifest['books'].items()}
+        self.verse_counts = np.asarray(counts, dtype=np.int64)
+        # prefix[i] = number of verses before chapter i
+        self.prefix = np.concatenate(([0], np.cumsum(self.verse_counts))).tolist()
+        self.total = self.prefix[-1]
+
+    def chapter_index(self, book: str, chapter: int) -> Optional[int]:
+        if book not in self.first_chapter or not 1 <= chapter <= self.chapter_counts[book]:
+            return None
+        return self.first_chapter[book] + chapter - 1
+
+    def address(self, book: str, chapter: int, verse: int) -> Optional[int]:
+        """Linear verse number (0-based) or None if out of range."""
+        index = self.chapter_index(book, chapter)
+        if index is None or not 1 <= verse <= self.verse_counts[index]:
+            return None
+        return self.prefix[index] + verse - 1
+
+    def locate(self, number: int) -> Tuple[str, int, int]:
+        """Inverse of address()."""
+        index = bisect.bisect_right(self.prefix, number) - 1
+        book, chapter = self.chapter_keys[index]
+        return book, chapter, number - self.prefix[index] + 1
+
+    def span(self, ref: Reference) -> Optional[Tuple[int, int]]:
+        """First and last linear verse number of a reference, clipped to the book."""
+        if ref.book not in self.first_chapter:
+            return None
+        last_chapter = min(ref.end_chapter, self.chapter_counts[ref.book])
+        start_index = self.chapter_index(ref.book, ref.start_chapter)
+        end_index = self.chapter_index(ref.book, last_chapter)
+        if start_index is None or end_index is None or end_index < start_index:
+            return None
+        start = self.prefix[start_index] + (ref.start_verse or 1) - 1
+        end_verse = ref.end_verse if ref.end_verse is not None else self.verse_counts[end_index]
+        end = self.prefix[end_index] + min(int(end_verse), int(self.verse_counts[end_index])) - 1
+        if start > end or start >= self.prefix[start_index + 1]:
+            return None
+        return start, end
+
+    def expand(self, ref: Reference) -> Iterator[Tuple[str, int, int]]:
+        """Yield (book, chapter, verse) for every verse of the reference, in O(verses)."""
+        span = self.span(ref)
+        if span is None:
+            return
+        start, end = span
+        index = bisect.bisect_right(self.prefix, start) - 1
+        number = start
+        while number <= end:
+            book, chapter = self.chapter_keys[index]
+            last = min(end, self.prefix[index + 1] - 1)
+            for n in range(number, last + 1):
+                yield book, chapter, n - self.prefix[index] + 1
+            number = last + 1
+            index += 1
+
+
+def resolve(text: str, translation_id: str, default_book: Optional[str] = None) -> List[Tuple[str, int, int]]:
+    """Parse `text` and return all verses it refers to."""
+    addressing = VerseAddressing(translation_id)
+    verses = []
+    for ref in parse_references(text, default_book):
+        verses.extend(addressing.expand(ref))
+    return verses
+
+
+def check_footnotes(translation_id: str) -> None:
+    """Report how many footnote references resolve to existing verses."""
+    addressing = VerseAddressing(translation_id)
+    total = resolved = 0
+    unresolved: List[str] = []
+    for verse in iter_verses(translation_id):
+        for footnote in verse['footnotes'] or []:
+            for ref in parse_references(footnote, default_book=verse['bookId']):
+                total += 1
+                if addressing.span(ref) is not None:
+                    resolved += 1
+                elif len(unresolved) < 10:
+                    unresolved.append(f"{verse['bookId']} {verse['chapter']},{verse['verse']}: {footnote[:80]}")
+    print(f"{translation_id}: {resolved}/{total} footnote references resolve")
+    for line in unresolved:
+        print(f"  ✗ {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse and resolve Bible references")
+    parser.add_argument("references", nargs="*")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    parser.add_argument("--check-footnotes", metavar="TRANSLATION")
+    parser.add_argument("--export-aliases", action="store_true")
+    args = parser.parse_args()
+
+    if args.check_footnotes:
+        check_footnotes(args.check_footnotes)
+        return
+    if args.export_aliases:
+        path = generated_path(None, "book-aliases.json")
+        aliases = alias_table()
+        write_json(path, aliases)
+        print(f"✓ {len(aliases)} aliases of {len(set(aliases.values()))} books written to {path}")
+        return
+    if not args.references:
+        parser.print_usage()
+        sys.exit(1)
+
+    addressing = VerseAddressing(args.translation)
+    for text in args.references:
+        refs = parse_references(text)
+        if not refs:
+            print(f"{text}: no reference found")
+            continue
+        for ref in refs:
+            verses = list(addressing.expand(ref))
+            if not verses:
+                print(f"{text}: {ref} is not in {args.translation}")
+                continue
+            first, last = verses[0], verses[-1]
+            print(f"{text}: {first[0]} {first[1]},{first[2]} – {last[1]},{last[2]} ({len(verses)} verses)")
+
+
+if __name__ == "__main__":
+    main()
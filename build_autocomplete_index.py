@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Build the autocomplete index for book navigation and search suggestions.
+
+Suggestions come from three sources, each with a ranking weight:
+
+    book      every name and abbreviation of a book ("1 Kor", "Offb",
+              "Genesis"), ranked above everything else in canonical order
+    heading   section headings, pointing to their first verse
+    term      words of the translation occurring at least MIN_TERM_COUNT
+              times, weighted by frequency
+
+Keys are normalized (case-folded, dots removed, whitespace collapsed) and
+stored sorted. For every prefix that matches more than TOP_K suggestions the
+top TOP_K entries are precomputed; any other prefix matches at most TOP_K
+entries, which are found with one binary search over the sorted keys. Every
+keystroke is therefore answered without scanning or loading book data.
+
+Output: public/generated/<translation>/autocomplete.json
+
+    {"entries": {"labels": [...], "kinds": [...], "targets": [...], "weights": [...]},
+     "keys": [...], "keyEntries": [...], "top": {"prefix": [entry, ...]}}
+
+Usage:
+    python3 build_autocomplete_index.py                     # Build for all translations
+    python3 build_autocomplete_index.py --suggest "1 ko" lie [--translation neue]
+"""
+
+import argparse
+import bisect
+import json
+import re
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from bible_corpus import available_translations, generated_path, iter_verses, load_manifest, write_json
+from bible_reference import book_aliases
+from build_spelling_index import build_vocabulary
+
+TOP_K = 8
+MIN_TERM_COUNT = 2
+
+BOOK_WEIGHT = 10_000_000
+HEADING_WEIGHT = 100
+
+
+def normalize_key(text: str) -> str:
+    return re.sub(r'\s+', ' ', text.casefold().replace('.', '')).strip()
+
+
+def collect_entries(translation_id: str) -> Tuple[List[Tuple[str, str, str, int]], List[Tuple[str, int]]]:
+    """Return entries (label, kind, target, weight) and their (key, entry index) pairs."""
+    entries: List[Tuple[str, str, str, int]] = []
+    keys: List[Tuple[str, int]] = []
+
+    manifest = load_manifest(translation_id)
+    book_entries: Dict[str, int] = {}
+    for position, (book_id, book) in enumerate(manifest['books'].items()):
+        book_entries[book_id] = len(entries)
+        entries.append((book['name'], 'book', book_id, BOOK_WEIGHT - position))
+        keys.append((normalize_key(book['name']), book_entries[book_id]))
+    for alias, book_id in book_aliases().items():
+        if book_id in book_entries:
+            keys.append((normalize_key(alias), book_entries[book_id]))
+
+    seen_headings = set()
+    for verse in iter_verses(translation_id):
+        heading = verse['heading']
+        if not heading or heading in seen_headings:
+            continue
+        seen_headings.add(heading)
+        target = f"{verse['bookId']} {verse['chapter']},{verse['verse']}"
+        keys.append((normalize_key(heading), len(entries)))
+        entries.append((heading, 'heading', target, HEADING_WEIGHT))
+
+    for term, count in build_vocabulary(translation_id).items():
+        if count >= MIN_TERM_COUNT:
+            keys.append((normalize_key(term), len(entries)))
+            entries.append((term, 'term', term, count))
+
+    return entries, sorted(set(keys))
+
+
+def top_entries(entry_ids, weights: List[int]) -> List[int]:
+    return sorted(set(entry_ids), key=lambda i: (-weights[i], i))[:TOP_K]
+
+
+def build_index(translation_id: str) -> Dict[str, int]:
+    """Build and write the autocomplete index of one translation."""
+    entries, keys = collect_entries(translation_id)
+    weights = [entry[3] for entry in entries]
+
+    by_prefix = defaultdict(set)
+    for key, entry in keys:
+        for length in range(1, len(key) + 1):
+            by_prefix[key[:length]].add(entry)
+    top = {
+        prefix: top_entries(entry_ids, weights)
+        for prefix, entry_ids in sorted(by_prefix.items())
+        if len(entry_ids) > TOP_K
+    }
+
+    write_json(generated_path(translation_id, "autocomplete.json"), {
+        'entries': {
+            'labels': [entry[0] for entry in entries],
+            'kinds': [entry[1] for entry in entries],
+            'targets': [entry[2] for entry in entries],
+            'weights': weights,
+        },
+        'keys': [key for key, _ in keys],
+        'keyEntries': [entry for _, entry in keys],
+        'top': top,
+    })
+    return {'entries': len(entries), 'keys': len(keys), 'prefixes': len(top)}
+
+
+class AutocompleteIndex:
+    """Loaded autocomplete index of one translation."""
+
+    def __init__(self, translation_id: str):
+        with open(generated_path(translation_id, "autocomplete.json"), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.labels: List[str] = data['entries']['labels']
+        self.kinds: List[str] = data['entries']['kinds']
+        self.targets: List[str] = data['entries']['targets']
+        self.weights: List[int] = data['entries']['weights']
+        self.keys: List[str] = data['keys']
+        self.key_entries: List[int] = data['keyEntries']
+        self.top: Dict[str, List[int]] = data['top']
+
+    def suggest(self, text: str) -> List[Tuple[str, str, str]]:
+        """Return up to TOP_K suggestions as (label, kind, target)."""
+        prefix = normalize_key(text)
+        if not prefix:
+            return []
+        ids = self.top.get(prefix)
+        if ids is None:
+            # Not precomputed: at most TOP_K entries start with this prefix
+            lo = bisect.bisect_left(self.keys, prefix)
+            hi = bisect.bisect_left(self.keys, prefix + '￿', lo)
+            ids = top_entries(self.key_entries[lo:hi], self.weights)
+        return [(self.labels[i], self.kinds[i], self.targets[i]) for i in ids]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the autocomplete index")
+    parser.add_argument("--suggest", nargs="+", metavar="PREFIX")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    args = parser.parse_args()
+
+    if args.suggest:
+        index = AutocompleteIndex(args.translation)
+        for text in args.suggest:
+            start = time.perf_counter()
+            suggestions = index.suggest(text)
+            elapsed = (time.perf_counter() - start) * 1e6
+            found = ", ".join(f"{label} [{kind}]" for label, kind, _ in suggestions)
+            print(f"{text}: {found or '-'}  [{elapsed:.0f} µs]")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        counts = build_index(translation_id)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {counts['entries']} entries, {counts['keys']} keys, "
+              f"{counts['prefixes']} precomputed prefixes in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Compress every chapter of a translation with zstd against a dictionary
+trained on that translation's chapters.
+
+A single chapter is a few KB of JSON, too little for gzip or brotli to find
+the vocabulary and the structure ({"number":..,"text":..}) every chapter
+repeats. A shared zstd dictionary (DICTIONARY_SIZE bytes, trained once per
+translation) carries that context, so each chapter payload only encodes what
+is specific to it. Clients download the dictionary once and then fetch
+single chapters.
+
+Chapter payload: the compact JSON of {"number": n, "verses": [...]} exactly
+as in the book module (bible_corpus.json_payload()).
+
+Output in public/generated/<translation>/chapters/:
+
+    dictionary.zdict              the trained zstd dictionary
+    <bookId>/<chapter>.json.zst   chapter payloads compressed with it
+    index.json                    {"dictionaryId": n, "sizes": {bookId: [bytes per chapter]}}
+
+--benchmark compares the total size and the per-chapter decode time with
+gzip, brotli and zstd without dictionary. Every HOLDOUT-th chapter is held
+out: the dictionary is trained on the others and all codecs are measured on
+the held-out chapters only, so the ratios show how the dictionary does on
+text it has not seen (a corrected or added chapter). The sizes printed by a
+build are in-sample: there the dictionary is trained on the chapters it
+compresses, which is what is deployed.
+
+Usage:
+    python3 build_chapter_compression.py                # Build for all translations
+    python3 build_chapter_compression.py --benchmark [--translation neue]
+"""
+
+import argparse
+import gzip
+import os
+import time
+from typing import Dict, List, Tuple
+
+import zstandard
+
+from bible_corpus import available_translations, generated_path, iter_books, json_payload, write_json
+from safe_io import remove_stale, write_bytes_atomic
+
+DICTIONARY_SIZE = 112 * 1024
+LEVEL = 19
+BROTLI_QUALITY = 11
+HOLDOUT = 10
+
+
+def collect_chapters(translation_id: str) -> List[Tuple[str, int, bytes]]:
+    """(book id, chapter number, payload) for every chapter, in canonical order."""
+    return [
+        (meta['id'], chapter['number'], json_payload(chapter))
+        for meta, book in iter_books(translation_id)
+        for chapter in book['chapters']
+    ]
+
+
+def train_dictionary(payloads: List[bytes]) -> zstandard.ZstdCompressionDict:
+    return zstandard.train_dictionary(DICTIONARY_SIZE, payloads, level=LEVEL)
+
+
+def build_chapters(translation_id: str) -> Dict[str, int]:
+    chapters = collect_chapters(translation_id)
+    dictionary = train_dictionary([payload for _, _, payload in chapters])
+    compressor = zstandard.ZstdCompressor(level=LEVEL, dict_data=dictionary)
+
+    out_dir = generated_path(translation_id, "chapters")
+    written = [os.path.join(out_dir, "dictionary.zdict"), os.path.join(out_dir, "index.json")]
+    write_bytes_atomic(written[0], dictionary.as_bytes())
+
+    compressed = 0
+    sizes: Dict[str, List[int]] = {}
+    for book_id, number, payload in chapters:
+        data = compressor.compress(payload)
+        written.append(os.path.join(out_dir, book_id, f"{number}.json.zst"))
+        write_bytes_atomic(written[-1], data)
+        compressed += len(data)
+        sizes.setdefault(book_id, []).append(len(data))
+
+    write_json(os.path.join(out_dir, "index.json"), {
+        'dictionaryId': dictionary.dict_id(),
+        'sizes': sizes,
+    })
+    remove_stale(out_dir, written)
+    return {
+        'chapters': len(chapters),
+        'raw': sum(len(payload) for _, _, payload in chapters),
+        'compressed': compressed,
+        'dictionary': len(dictionary.as_bytes()),
+    }
+
+
+def _timed(function, items: List[bytes], repeat: int = 3) -> float:
+    """Best total time of applying function to all items, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(translation_id: str) -> None:
+    import brotli   # only needed for the comparison
+
+    chapters = [payload for _, _, payload in collect_chapters(translation_id)]
+    training_set = [p for i, p in enumerate(chapters) if i % HOLDOUT]
+    payloads = [p for i, p in enumerate(chapters) if not i % HOLDOUT]
+    start = time.perf_counter()
+    dictionary = train_dictionary(training_set)
+    training = time.perf_counter() - start
+
+    plain = zstandard.ZstdCompressor(level=LEVEL)
+    shared = zstandard.ZstdCompressor(level=LEVEL, dict_data=dictionary)
+    codecs = {
+        'gzip -9': (lambda p: gzip.compress(p, 9), gzip.decompress),
+        f'brotli q{BROTLI_QUALITY}': (lambda p: brotli.compress(p, quality=BROTLI_QUALITY), brotli.decompress),
+        f'zstd -{LEVEL}': (plain.compress, zstandard.ZstdDecompressor().decompress),
+        f'zstd -{LEVEL} + dict': (shared.compress, zstandard.ZstdDecompressor(dict_data=dictionary).decompress),
+    }
+
+    raw = sum(len(p) for p in payloads)
+    dictionary_size = len(dictionary.as_bytes())
+    print(f"{translation_id}: {len(payloads)} held-out chapters (every {HOLDOUT}th), {raw / 1024:.0f} KB JSON, "
+          f"median chapter {sorted(map(len, payloads))[len(payloads) // 2]} bytes")
+    print(f"  dictionary {dictionary_size / 1024:.0f} KB, trained on the other {len(training_set)} "
+          f"chapters in {training:.1f}s")
+    print(f"  {'codec':<20} {'total':>10} {'ratio':>7} {'+dict':>7} {'decode/chapter':>15}")
+    for name, (compress, decompress) in codecs.items():
+        compressed = [compress(p) for p in payloads]
+        total = sum(map(len, compressed))
+        # The dictionary is downloaded once for all chapters; charge the held-out share of it
+        with_dictionary = total + (dictionary_size * len(payloads) / len(chapters) if 'dict' in name else 0)
+        decode = _timed(decompress, compressed) / len(compressed)
+        print(f"  {name:<20} {total / 1024:>7.0f} KB {raw / total:>6.2f}x {raw / with_dictionary:>6.2f}x "
+              f"{decode * 1e6:>12.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="zstd chapter payloads with a shared dictionary")
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--translation", default=None)
+    args = parser.parse_args()
+
+    selected = [args.translation] if args.translation else list(available_translations())
+    if args.benchmark:
+        for translation_id in selected:
+            benchmark(translation_id)
+        return
+
+    for translation_id in selected:
+        start = time.perf_counter()
+        stats = build_chapters(translation_id)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {stats['chapters']} chapters, {stats['raw'] / 1024:.0f} KB -> "
+              f"{stats['compressed'] / 1024:.0f} KB + {stats['dictionary'] / 1024:.0f} KB dictionary "
+              f"(in-sample) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
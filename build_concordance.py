@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Build a KWIC (keyword in context) concordance of every translation.
+
+Every word occurrence is recorded with its verse id, its character offset in
+the verse's plain text (split verses such as Gen 2,4a/4b count as one text,
+parts joined by a space) and a fixed-width context window. Terms are
+ordered alphabetically and packed into shards of about SHARD_SIZE
+occurrences; a term is never split, and a term with SHARD_SIZE occurrences
+or more ("und") gets a shard of its own. Occurrences of a term are in
+reading order. Output in public/generated/<translation>/concordance/:
+
+    index.json       {"contextWidth": 40, "shards": [first term of each shard]}
+    shards/NNNN.json {term: {"ids": [verse id, then deltas to the previous one],
+                             "offsets": [...], "left": [...], "right": [...]}}
+
+`left` holds up to contextWidth characters before the word, `right` the word
+itself in its original spelling followed by up to contextWidth characters.
+A client finds the one shard of a term with a binary search over the small
+"shards" list; a term missing from that shard does not occur.
+
+Usage:
+    python3 build_concordance.py                       # Build for all translations
+    python3 build_concordance.py --lookup Licht [--translation neue] [--limit 20]
+"""
+
+import argparse
+import bisect
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bible_corpus import (
+    available_translations,
+    generated_path,
+    iter_verses,
+    normalize_term,
+    plain_text,
+    split_verse_id,
+    tokenize_with_offsets,
+    write_json,
+)
+from safe_io import remove_stale
+
+CONTEXT_WIDTH = 40
+SHARD_SIZE = 2000
+
+
+def collect_occurrences(translation_id: str) -> Tuple[List[Tuple[str, int, int, int, int]], List[str], List[int]]:
+    """
+    Return occurrences as (term, seq, start, end, offset), the plain text and
+    verse id of every verse record. `offset` is the position in the joined
+    text of all parts of the verse.
+    """
+    occurrences = []
+    texts: List[str] = []
+    ids: List[int] = []
+    joined_length: Dict[int, int] = {}
+
+    for verse in iter_verses(translation_id):
+        text = plain_text(verse['text'])
+        base = joined_length[verse['id']] + 1 if verse['id'] in joined_length else 0
+        joined_length[verse['id']] = base + len(text)
+        for word, start, end in tokenize_with_offsets(text):
+            occurrences.append((normalize_term(word), verse['seq'], start, end, base + start))
+        texts.append(text)
+        ids.append(verse['id'])
+
+    occurrences.sort(key=lambda o: (o[0], o[1], o[2]))
+    return occurrences, texts, ids
+
+
+def encode_shard(occurrences, texts: List[str], ids: List[int]) -> Dict:
+    """Encode the occurrences of whole terms, grouped by term with delta-coded verse ids."""
+    shard: Dict[str, Dict] = {}
+    previous_id = 0
+    for term, seq, start, end, offset in occurrences:
+        entry = shard.get(term)
+        if entry is None:
+            entry = shard[term] = {'ids': [], 'offsets': [], 'left': [], 'right': []}
+            previous_id = 0
+        text = texts[seq]
+        entry['ids'].append(ids[seq] - previous_id)
+        previous_id = ids[seq]
+        entry['offsets'].append(offset)
+        entry['left'].append(text[max(0, start - CONTEXT_WIDTH):start])
+        entry['right'].append(text[start:end + CONTEXT_WIDTH])
+    return shard
+
+
+def shard_ranges(occurrences) -> List[Tuple[int, int]]:
+    """
+    (start, end) slices of the sorted occurrences, each holding whole terms:
+    terms are added until a shard reaches SHARD_SIZE occurrences, and a term
+    that alone reaches it is put into a shard of its own.
+    """
+    ranges = []
+    shard_start = term_start = 0
+    for index in range(1, len(occurrences) + 1):
+        if index < len(occurrences) and occurrences[index][0] == occurrences[term_start][0]:
+            continue
+        # occurrences[term_start:index] is one whole term
+        if index - term_start >= SHARD_SIZE and term_start > shard_start:
+            ranges.append((shard_start, term_start))
+            shard_start = term_start
+        if index - shard_start >= SHARD_SIZE:
+            ranges.append((shard_start, index))
+            shard_start = index
+        term_start = index
+    if shard_start < len(occurrences):
+        ranges.append((shard_start, len(occurrences)))
+    return ranges
+
+
+def build_concordance(translation_id: str) -> Dict[str, int]:
+    """Build and write the sharded concordance of one translation."""
+    occurrences, texts, ids = collect_occurrences(translation_id)
+
+    out_dir = generated_path(translation_id, "concordance")
+    shard_dir = os.path.join(out_dir, "shards")
+    boundaries = []
+    written = []
+    largest = 0
+    for number, (start, end) in enumerate(shard_ranges(occurrences)):
+        boundaries.append(occurrences[start][0])
+        path = os.path.join(shard_dir, f"{number:04d}.json")
+        write_json(path, encode_shard(occurrences[start:end], texts, ids))
+        written.append(path)
+        largest = max(largest, os.path.getsize(path))
+    # Shard boundaries move whenever the text changes; drop shards past the end
+    remove_stale(shard_dir, written)
+
+    write_json(os.path.join(out_dir, "index.json"), {
+        'contextWidth': CONTEXT_WIDTH,
+        'shards': boundaries,
+    })
+    return {
+        'terms': len({occurrence[0] for occurrence in occurrences}),
+        'occurrences': len(occurrences),
+        'shards': len(boundaries),
+        'largest': largest,
+    }
+
+
+class Concordance:
+    """Read access to a built concordance."""
+
+    def __init__(self, translation_id: str):
+        self.base = generated_path(translation_id, "concordance")
+        with open(os.path.join(self.base, "index.json"), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        self.shards: List[str] = index['shards']
+
+    def _load_shard(self, number: int) -> Dict:
+        with open(os.path.join(self.base, "shards", f"{number:04d}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def entry(self, word: str) -> Optional[Dict]:
+        """Shard entry of a word, None if it does not occur."""
+        term = normalize_term(word)
+        number = bisect.bisect_right(self.shards, term) - 1
+        if number < 0:
+            return None
+        return self._load_shard(number).get(term)
+
+    def lookup(self, word: str) -> Iterator[Tuple[int, int, str, str]]:
+        """Yield (verse id, offset, left, right) for every occurrence of a word, in reading order."""
+        entry = self.entry(word) or {'ids': [], 'offsets': [], 'left': [], 'right': []}
+        verse_id = 0
+        for delta, offset, left, right in zip(entry['ids'], entry['offsets'], entry['left'], entry['right']):
+            verse_id += delta
+            yield verse_id, offset, left, right
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the KWIC concordance")
+    parser.add_argument("--lookup", metavar="WORD")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.lookup:
+        occurrences = list(Concordance(args.translation).lookup(args.lookup))
+        for verse_id, _, left, right in occurrences[:args.limit]:
+            book, chapter, verse = split_verse_id(verse_id)
+            print(f"{book:>3} {chapter:>3},{verse:<3} {left:>{CONTEXT_WIDTH}}{right}")
+        print(f"\n{len(occurrences)} occurrences of '{args.lookup}'")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        counts = build_concordance(translation_id)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {counts['occurrences']} occurrences of {counts['terms']} terms "
+              f"in {counts['shards']} shards (largest {counts['largest'] / 1024:.0f} KB) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
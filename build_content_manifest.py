@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Write every book and chapter as a content-hashed artifact and a manifest that
+maps logical ids to the hashed file names.
+
+The file name of an artifact contains the first HASH_LENGTH hex digits of the
+SHA-256 of its content, so it can be cached forever (next.config.ts serves
+/generated/*/content/ as immutable). A corpus update changes the names, and
+thus invalidates, only the books and chapters whose content changed; the
+manifest itself is small and always revalidated.
+
+Artifacts are the compact JSON of the book dict and of each
+{"number": n, "verses": [...]} chapter (bible_corpus.json_payload()).
+
+Output in public/generated/<translation>/:
+
+    content/<bookId>.<hash>.json            whole book
+    content/<bookId>/<chapter>.<hash>.json  one chapter
+    content-manifest.json
+        {"version": <hash over all artifacts>,
+         "books": {bookId: {"file": ..., "etag": ..., "size": n,
+                            "chapters": {chapter: {"file": ..., "etag": ..., "size": n}}}}}
+
+"file" is relative to public/generated/<translation>/, "etag" is the strong
+ETag ("<sha256>") a server can send for it.
+
+Artifacts are served as immutable, but the manifest is only revalidated, so
+clients and CDNs may still hold an older manifest for a while. The files of
+the last KEEP_VERSIONS manifests (the current one included) are therefore
+kept; content-history.json records them as
+{"versions": [{"version": ..., "files": [...]}, ...]}, newest first. Only
+files no longer referenced by any of these versions are removed.
+
+Usage:
+    python3 build_content_manifest.py            # All translations
+    python3 build_content_manifest.py neue       # One translation
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Set
+
+from bible_corpus import available_translations, generated_path, iter_books, json_payload, write_json
+from safe_io import remove_stale, write_bytes_atomic
+
+HASH_LENGTH = 16
+CONTENT_DIR = "content"
+MANIFEST_FILE = "content-manifest.json"
+HISTORY_FILE = "content-history.json"
+KEEP_VERSIONS = 3
+
+
+def content_entry(data: bytes, name: str, base: str, written: Set[str]) -> Dict:
+    """Write one artifact as <name>.<hash>.json below base; return its manifest entry."""
+    digest = hashlib.sha256(data).hexdigest()
+    file = f"{CONTENT_DIR}/{name}.{digest[:HASH_LENGTH]}.json"
+    write_bytes_atomic(os.path.join(base, file), data)
+    written.add(file)
+    return {'file': file, 'etag': f'"{digest}"', 'size': len(data)}
+
+
+def load_content_manifest(translation_id: str) -> Optional[Dict]:
+    path = generated_path(translation_id, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def manifest_files(manifest: Dict) -> Set[str]:
+    """All artifact files a manifest references."""
+    files = set()
+    for book in manifest['books'].values():
+        files.add(book['file'])
+        files.update(chapter['file'] for chapter in book['chapters'].values())
+    return files
+
+
+def update_history(translation_id: str, old: Optional[Dict], manifest: Dict, written: Set[str]) -> List[Dict]:
+    """Put the new version in front of the history and keep the last KEEP_VERSIONS."""
+    path = generated_path(translation_id, HISTORY_FILE)
+    versions: List[Dict] = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            versions = json.load(f)['versions']
+    elif old:
+        # First run with a history: the previous manifest is still in use
+        versions = [{'version': old['version'], 'files': sorted(manifest_files(old))}]
+
+    versions = [v for v in versions if v['version'] != manifest['version']]
+    versions.insert(0, {'version': manifest['version'], 'files': sorted(written)})
+    versions = versions[:KEEP_VERSIONS]
+    write_json(path, {'versions': versions})
+    return versions
+
+
+def changed_entries(old: Optional[Dict], new: Dict) -> Dict[str, int]:
+    """Number of books and chapters whose ETag differs from the previous manifest."""
+    old_books = (old or {}).get('books', {})
+    books = chapters = 0
+    for book_id, book in new['books'].items():
+        previous = old_books.get(book_id, {})
+        books += previous.get('etag') != book['etag']
+        previous_chapters = previous.get('chapters', {})
+        chapters += sum(
+            previous_chapters.get(number, {}).get('etag') != chapter['etag']
+            for number, chapter in book['chapters'].items()
+        )
+    return {'books': books, 'chapters': chapters}
+
+
+def build_content_manifest(translation_id: str) -> Dict:
+    base = generated_path(translation_id)
+    written: Set[str] = set()
+    books = {}
+    for meta, book in iter_books(translation_id):
+        entry = content_entry(json_payload(book), meta['id'], base, written)
+        entry['chapters'] = {
+            str(chapter['number']): content_entry(
+                json_payload(chapter), f"{meta['id']}/{chapter['number']}", base, written
+            )
+            for chapter in book['chapters']
+        }
+        books[meta['id']] = entry
+
+    version = hashlib.sha256()
+    for file in sorted(written):
+        version.update(file.encode('utf-8'))
+    manifest = {'version': version.hexdigest()[:HASH_LENGTH], 'books': books}
+
+    old = load_content_manifest(translation_id)
+    write_json(generated_path(translation_id, MANIFEST_FILE), manifest)
+    versions = update_history(translation_id, old, manifest, written)
+    keep = {file for version in versions for file in version['files']}
+    return {
+        'manifest': manifest,
+        'changed': changed_entries(old, manifest),
+        'kept': len(versions),
+        'removed': remove_stale(os.path.join(base, CONTENT_DIR), [os.path.join(base, file) for file in keep]),
+    }
+
+
+def main():
+    selected = sys.argv[1:] or list(available_translations())
+    for translation_id in selected:
+        start = time.perf_counter()
+        result = build_content_manifest(translation_id)
+        books = result['manifest']['books']
+        chapters = sum(len(book['chapters']) for book in books.values())
+        changed = result['changed']
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id} {result['manifest']['version']}: {len(books)} books "
+              f"({changed['books']} changed), {chapters} chapters ({changed['chapters']} changed), "
+              f"{result['removed']} stale files removed (files of {result['kept']} versions kept) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
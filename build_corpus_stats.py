@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Compute corpus statistics and estimated reading times per chapter and book.
+
+Counts verses, words and characters for every chapter of every translation
+and writes them as a small columnar table to
+public/generated/<translation>/stats.json, so reading plans and progress
+screens can show lengths and reading times without loading any book text.
+
+Usage:
+    python3 build_corpus_stats.py                 # All available translations
+    python3 build_corpus_stats.py neue            # A single translation
+"""
+
+import sys
+from typing import Dict
+
+import numpy as np
+
+from bible_corpus import (
+    available_translations,
+    generated_path,
+    iter_verses,
+    plain_text,
+    tokenize,
+    write_json,
+)
+
+# Average silent reading speed for German prose (words per minute)
+WORDS_PER_MINUTE = 200
+
+
+def reading_minutes(words: np.ndarray) -> np.ndarray:
+    """Estimated reading time in minutes, rounded to one decimal."""
+    return np.round(words / WORDS_PER_MINUTE, 1)
+
+
+def compute_stats(translation_id: str) -> Dict:
+    """Build the statistics table for one translation in a single pass."""
+    book_ids = []
+    chapter_keys = []
+    chapter_of_verse = []
+    word_counts = []
+    char_counts = []
+
+    for verse in iter_verses(translation_id):
+        key = (verse['bookId'], verse['chapter'])
+        if not chapter_keys or chapter_keys[-1] != key:
+            chapter_keys.append(key)
+            if not book_ids or book_ids[-1] != verse['bookId']:
+                book_ids.append(verse['bookId'])
+        text = plain_text(verse['text'])
+        chapter_of_verse.append(len(chapter_keys) - 1)
+        word_counts.append(len(tokenize(text)))
+        char_counts.append(len(text))
+
+    n_chapters = len(chapter_keys)
+    chapter_idx = np.asarray(chapter_of_verse, dtype=np.int32)
+    verses = np.bincount(chapter_idx, minlength=n_chapters)
+    words = np.bincount(chapter_idx, weights=np.asarray(word_counts), minlength=n_chapters).astype(np.int64)
+    chars = np.bincount(chapter_idx, weights=np.asarray(char_counts), minlength=n_chapters).astype(np.int64)
+
+    # Chapters are contiguous per book, so book totals are segment sums
+    book_of_chapter = np.asarray([book_ids.index(b) for b, _ in chapter_keys], dtype=np.int32)
+    starts = np.flatnonzero(np.r_[True, book_of_chapter[1:] != book_of_chapter[:-1]])
+    ends = np.r_[starts[1:], n_chapters]
+
+    books = {}
+    for i, book_id in enumerate(book_ids):
+        s, e = starts[i], ends[i]
+        book_words = int(words[s:e].sum())
+        books[book_id] = {
+            'verses': int(verses[s:e].sum()),
+            'words': book_words,
+            'characters': int(chars[s:e].sum()),
+            'minutes': float(reading_minutes(np.asarray(book_words))),
+            'chapters': {
+                'number': [c for _, c in chapter_keys[s:e]],
+                'verses': verses[s:e].tolist(),
+                'words': words[s:e].tolist(),
+                'characters': chars[s:e].tolist(),
+                'minutes': reading_minutes(words[s:e]).tolist(),
+            },
+        }
+
+    return {
+        'translation': translation_id,
+        'wordsPerMinute': WORDS_PER_MINUTE,
+        'totals': {
+            'books': len(book_ids),
+            'chapters': n_chapters,
+            'verses': int(verses.sum()),
+            'words': int(words.sum()),
+            'characters': int(chars.sum()),
+            'minutes': float(reading_minutes(np.asarray(words.sum()))),
+        },
+        'books': books,
+    }
+
+
+def main():
+    translations = available_translations()
+    selected = sys.argv[1:] or list(translations)
+
+    for translation_id in selected:
+        if translation_id not in translations:
+            print(f"Error: Unknown or missing translation '{translation_id}'")
+            sys.exit(1)
+
+        stats = compute_stats(translation_id)
+        output_path = generated_path(translation_id, "stats.json")
+        write_json(output_path, stats)
+
+        totals = stats['totals']
+        print(f"✓ {translation_id}: {totals['books']} books, {totals['chapters']} chapters, "
+              f"{totals['verses']} verses, {totals['words']} words (~{totals['minutes']:.0f} min)")
+        print(f"  Written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Record corpus versions and emit verse-level patch bundles between them, so
+offline clients can update by downloading only the verses that changed.
+
+Every run takes a snapshot of a translation ({verse key: verse}, keys as in
+bible_corpus.verse_key) and compares it with the snapshot of the last
+recorded version. If anything changed, a patch bundle with the upserted and
+deleted verses is written and the new version is appended to the chain. A
+client at version N applies the patches listed after N in order to reach the
+latest version.
+
+The version history is part of the corpus and lives in the repository, in
+data/bibel/<folder>/updates/ (commit it together with the data change, so a
+fresh checkout or CI build continues the chain instead of starting a new
+one):
+
+    chain.json       {"versions": [{"version", "created", "verses"}, ...],
+                      "patches": [{"from", "to", "file", "upserts", "deletes", "size"}, ...]}
+    <from>-<to>.json {"from": ..., "to": ..., "upserts": {key: verse, ...}, "deletes": [key, ...]}
+                     (both in canonical verse order)
+    snapshot.json    snapshot of the latest version
+
+chain.json and the patches are copied to public/generated/<translation>/updates/
+for the clients; the snapshot is only needed for the next diff. A run writes
+the patch, then chain.json, then the snapshot, all under the translation
+lock. A run that dies before the snapshot leaves an older snapshot behind;
+the next run replays the recorded patches onto it before diffing, and a
+snapshot of unknown version is diffed as empty (every verse is sent), so an
+interrupted run can make the next patch larger but never drop a change.
+
+A verse is the object of the book module ({"number", "text", "heading",
+"footnotes", ...}); book and chapter follow from the key.
+
+Usage:
+    python3 build_delta_updates.py                  # Record all translations
+    python3 build_delta_updates.py --from VERSION [--translation neue] [--output bundle.json]
+                                                    # Patches from VERSION to the latest,
+                                                    # optionally squashed into one bundle
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from bible_corpus import (
+    DATA_DIR,
+    available_translations,
+    generated_path,
+    iter_books,
+    json_payload,
+    verse_id,
+    verse_key,
+    write_json,
+)
+from safe_io import remove_stale, translation_lock, write_bytes_atomic
+
+HASH_LENGTH = 16
+UPDATES_DIR = "updates"
+SNAPSHOT_FILE = "snapshot.json"
+
+
+def history_dir(translation_id: str) -> str:
+    """Tracked version history of a translation: data/bibel/<folder>/updates/."""
+    return os.path.join(DATA_DIR, available_translations()[translation_id], UPDATES_DIR)
+
+
+def corpus_snapshot(translation_id: str) -> Dict[str, Dict]:
+    """{verse key: verse} of a translation, in canonical order."""
+    snapshot = {}
+    for meta, book in iter_books(translation_id):
+        for chapter in book['chapters']:
+            parts: Dict[int, int] = {}
+            for verse in chapter['verses']:
+                part = parts.get(verse['number'], 0)
+                parts[verse['number']] = part + 1
+                snapshot[verse_key(verse_id(meta['index'], chapter['number'], verse['number']), part)] = verse
+    return snapshot
+
+
+def snapshot_version(snapshot: Dict[str, Dict]) -> str:
+    return hashlib.sha256(json_payload(snapshot)).hexdigest()[:HASH_LENGTH]
+
+
+def diff_snapshots(old: Dict[str, Dict], new: Dict[str, Dict]) -> Dict:
+    """Upserts (new or changed verses) and deletes turning old into new."""
+    return {
+        'upserts': {key: verse for key, verse in new.items() if old.get(key) != verse},
+        'deletes': [key for key in old if key not in new],
+    }
+
+
+def _read_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def tip_snapshot(base: str, chain: Dict, snapshot: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Bring a snapshot up to the latest version of the chain with the patches recorded after it."""
+    try:
+        patches = patches_since(chain, snapshot_version(snapshot))
+    except KeyError:
+        return {}
+    for entry in patches:
+        patch = _read_json(os.path.join(base, entry['file']), None)
+        for key in patch['deletes']:
+            snapshot.pop(key, None)
+        snapshot.update(patch['upserts'])
+    return snapshot
+
+
+def adopt_published_history(translation_id: str, base: str) -> None:
+    """Continue a chain that was only kept in public/generated (before the history was tracked)."""
+    published = generated_path(translation_id, UPDATES_DIR)
+    if os.path.exists(os.path.join(base, "chain.json")) or not os.path.exists(os.path.join(published, "chain.json")):
+        return
+    for filename in os.listdir(published):
+        with open(os.path.join(published, filename), 'rb') as f:
+            write_bytes_atomic(os.path.join(base, filename), f.read())
+
+
+def record_version(translation_id: str) -> Optional[Dict]:
+    """Snapshot the translation; returns the new patch entry, or None if nothing changed."""
+    base = history_dir(translation_id)
+    with translation_lock(os.path.join(base, "chain.json")):
+        adopt_published_history(translation_id, base)
+        chain = _read_json(os.path.join(base, "chain.json"), {'versions': [], 'patches': []})
+        snapshot = corpus_snapshot(translation_id)
+        version = snapshot_version(snapshot)
+
+        previous = chain['versions'][-1]['version'] if chain['versions'] else None
+        if version == previous:
+            # Repairs a snapshot left behind by an interrupted run
+            write_json(os.path.join(base, SNAPSHOT_FILE), snapshot)
+            return None
+
+        entry = None
+        if previous is not None:
+            old = tip_snapshot(base, chain, _read_json(os.path.join(base, SNAPSHOT_FILE), {}))
+            patch = {'from': previous, 'to': version, **diff_snapshots(old, snapshot)}
+            data = json_payload(patch)
+            file = f"{previous}-{version}.json"
+            write_bytes_atomic(os.path.join(base, file), data)
+            entry = {
+                'from': previous,
+                'to': version,
+                'file': file,
+                'upserts': len(patch['upserts']),
+                'deletes': len(patch['deletes']),
+                'size': len(data),
+            }
+            chain['patches'].append(entry)
+
+        chain['versions'].append({
+            'version': version,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'verses': len(snapshot),
+        })
+        write_json(os.path.join(base, "chain.json"), chain, compact=False)
+        write_json(os.path.join(base, SNAPSHOT_FILE), snapshot)
+    return entry or {'to': version, 'upserts': len(snapshot), 'deletes': 0, 'size': 0}
+
+
+def publish_updates(translation_id: str) -> int:
+    """Copy chain.json and the patches to public/generated/<translation>/updates/; returns the file count."""
+    base = history_dir(translation_id)
+    out_dir = generated_path(translation_id, UPDATES_DIR)
+    written = []
+    with translation_lock(os.path.join(base, "chain.json")):
+        for filename in sorted(os.listdir(base)) if os.path.isdir(base) else []:
+            if filename.endswith('.json') and filename != SNAPSHOT_FILE:
+                with open(os.path.join(base, filename), 'rb') as f:
+                    written.append(os.path.join(out_dir, filename))
+                    write_bytes_atomic(written[-1], f.read())
+    remove_stale(out_dir, written)
+    return len(written)
+
+
+def patches_since(chain: Dict, version: str) -> List[Dict]:
+    """Patches a client at `version` applies, in order; raises KeyError for unknown versions."""
+    versions = [v['version'] for v in chain['versions']]
+    if version not in versions:
+        raise KeyError(version)
+    # A version can recur (an edit that was reverted); start from its last occurrence
+    return chain['patches'][len(versions) - 1 - versions[::-1].index(version):]
+
+
+def _key_order(key: str):
+    vid, _, part = key.partition('.')
+    return int(vid), int(part or 0)
+
+
+def squash_patches(patches: List[Dict]) -> Dict:
+    """Combine consecutive patches into one, so each verse is sent at most once."""
+    upserts: Dict[str, Dict] = {}
+    deletes = set()
+    for patch in patches:
+        for key, verse in patch['upserts'].items():
+            upserts[key] = verse
+            deletes.discard(key)
+        for key in patch['deletes']:
+            upserts.pop(key, None)
+            deletes.add(key)
+    return {
+        'from': patches[0]['from'] if patches else None,
+        'to': patches[-1]['to'] if patches else None,
+        'upserts': {key: upserts[key] for key in sorted(upserts, key=_key_order)},
+        'deletes': sorted(deletes, key=_key_order),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record corpus versions and verse-level patches")
+    parser.add_argument("--from", dest="from_version", metavar="VERSION")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    parser.add_argument("--output", metavar="FILE", help="write the squashed bundle to FILE")
+    args = parser.parse_args()
+
+    if args.from_version:
+        chain = _read_json(os.path.join(history_dir(args.translation), "chain.json"), {'versions': [], 'patches': []})
+        try:
+            patches = patches_since(chain, args.from_version)
+        except KeyError:
+            print(f"✗ Unknown version {args.from_version}: full download needed")
+            return
+        for patch in patches:
+            print(f"  {patch['file']}: {patch['upserts']} upserts, {patch['deletes']} deletes, {patch['size']} bytes")
+        print(f"✓ {len(patches)} patches, {sum(p['size'] for p in patches)} bytes")
+        if args.output:
+            base = history_dir(args.translation)
+            bundle = squash_patches([_read_json(os.path.join(base, p['file']), None) for p in patches])
+            data = json_payload(bundle)
+            write_bytes_atomic(args.output, data)
+            print(f"✓ Squashed bundle: {len(bundle['upserts'])} upserts, {len(bundle['deletes'])} deletes, "
+                  f"{len(data)} bytes -> {args.output}")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        entry = record_version(translation_id)
+        publish_updates(translation_id)
+        elapsed = time.perf_counter() - start
+        if entry is None:
+            print(f"✓ {translation_id}: unchanged ({elapsed:.1f}s)")
+        elif 'from' not in entry:
+            print(f"✓ {translation_id}: first version {entry['to']} ({entry['upserts']} verses) in {elapsed:.1f}s")
+        else:
+            print(f"✓ {translation_id}: {entry['from']} -> {entry['to']}, {entry['upserts']} upserts, "
+                  f"{entry['deletes']} deletes, {entry['size']} bytes in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Build an occurrence index of the people and places of every translation.
+
+German capitalizes every noun, so capitalization alone does not mark a name.
+Only capitalized words inside a sentence are evidence; at the start of a
+sentence every word is capitalized. A word is taken as a name when, inside
+sentences,
+
+    - it occurs at least MIN_COUNT times and (almost) never in lowercase,
+    - it is rarely preceded by an article or determiner (MAX_ARTICLE_SHARE):
+      "der Tempel", but "David", "Jerusalem". "des" after a noun is the
+      genitive article a name takes too ("das Gesetz des Mose") and is not
+      counted,
+    - it has no common-noun ending (-ung, -heit, ...), is no inflected form
+      of another word (Jahre -> Jahr, Körbe -> Korb), has no lowercase
+      adjective (Bronze/bronzene) and does not end in a common noun
+      (Feinmehl),
+    - it has no inflected or umlauted variants (Jahr/Jahren, Spruch/Sprüche)
+      and is not the tail of another compound (Weihrauch -> Rauch).
+
+The book names and the capitalized words the book introductions use inside
+sentences, rarely after an article, form a gazetteer. These may have
+variants and be the tail of a compound (Mose/Moses, Saul/Säule, Jesus is
+the tail of Barjesus). Once a word is accepted, its occurrences at sentence
+starts are counted as well. Genitive and Latin case forms (Davids, Jesu,
+Christi) are merged into their base name.
+
+Output in public/generated/<translation>/entities/:
+
+    index.json    {"names": [...], "slugs": [...], "counts": [...], "forms": [[...]]}
+                  (most frequent first)
+    <slug>.json   {"name": ..., "forms": [...], "count": n, "books": {bookId: n},
+                   "verses": [verse id, then deltas to the previous one]}
+
+Usage:
+    python3 build_entity_index.py                       # Build for all translations
+    python3 build_entity_index.py --show Abraham [--translation neue]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, Set, Tuple
+
+from bible_corpus import (
+    available_translations,
+    generated_path,
+    iter_books,
+    iter_verses,
+    load_book_catalog,
+    plain_text,
+    split_verse_id,
+    tokenize,
+    tokenize_with_offsets,
+    write_json,
+)
+from safe_io import remove_stale
+
+MIN_COUNT = 2
+MAX_ARTICLE_SHARE = 0.2
+MAX_LOWERCASE_SHARE = 0.05
+
+DETERMINERS = set("""
+    der die das den dem des ein eine einen einem einer eines kein keine keinen keinem keiner keines
+    mein meine meinen meinem meiner meines dein deine deinen deinem deiner deines sein seine seinen
+    seinem seiner seines ihr ihre ihren ihrem ihrer ihres unser unsere unseren unserem unserer unseres
+    euer eure euren eurem eurer eures dieser diese dieses diesen diesem jener jene jenes jenen jenem
+    jeder jede jedes jeden jedem alle aller allen welche welcher welches zum zur vom im am beim ins ans
+""".split())
+NOUN_SUFFIXES = ('ung', 'heit', 'keit', 'schaft', 'nis', 'tum', 'ling', 'chen', 'lein', 'tät', 'ismus')
+INFLECTIONS = ('e', 'en', 'er', 'n', 'es', 'ern', 'ens')
+ADJECTIVE_ENDINGS = ('ne', 'nen', 'nem', 'ner', 'nes')
+UMLAUTS = {'au': 'äu', 'a': 'ä', 'o': 'ö', 'u': 'ü'}
+UMLAUT_PLURALS = ('e', 'en')
+GENITIVE_ARTICLE = 'des'
+MIN_STEM = 3
+SENTENCE_BREAK = re.compile(r'[.!?:«»„“"]')
+
+
+def slugify(name: str) -> str:
+    ascii_name = unicodedata.normalize('NFKD', name.replace('ß', 'ss')).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '-', ascii_name.lower()).strip('-')
+
+
+def umlauted(word: str, reverse: bool = False) -> Set[str]:
+    """
+    Variants of a lowercase word with its last vowel umlauted (spruch ->
+    sprüch), or with the umlaut removed (reverse: vorwürf -> vorwurf).
+    """
+    variants = set()
+    for plain, umlaut in UMLAUTS.items():
+        old, new = (umlaut, plain) if reverse else (plain, umlaut)
+        position = word.rfind(old)
+        if position >= 0:
+            variants.add(word[:position] + new + word[position + len(old):])
+    return variants
+
+
+def capitalized_words(text: str) -> Iterator[Tuple[str, bool, bool]]:
+    """
+    (word, at sentence start, after an article) for every token of text.
+    "des" after a noun is the genitive article a name takes too ("das
+    Gesetz des Mose") and does not count; a noun in the genitive ends in -s
+    or -n itself.
+    """
+    previous, previous_end, before = None, 0, None
+    for word, start, end in tokenize_with_offsets(text):
+        sentence_start = previous is None or bool(SENTENCE_BREAK.search(text, previous_end, start))
+        genitive = (previous == GENITIVE_ARTICLE and before is not None and before[0].isupper()
+                    and not word.endswith(('s', 'n')))
+        after_article = not sentence_start and previous.lower() in DETERMINERS and not genitive
+        yield word, sentence_start, after_article
+        previous, previous_end, before = word, end, previous
+
+
+def gazetteer(translation_id: str) -> Set[str]:
+    """
+    Known names: the book names and the capitalized words the book
+    introductions use inside sentences, rarely after an article.
+    """
+    names = {w for book in load_book_catalog() for w in tokenize(book['name']) if w[0].isupper()}
+    counts = Counter()
+    after_article = Counter()
+    for _, book in iter_books(translation_id):
+        for word, sentence_start, article in capitalized_words(book.get('introduction') or ''):
+            if word[0].isupper() and not sentence_start:
+                counts[word] += 1
+                after_article[word] += article
+    return names | {w for w, count in counts.items() if after_article[w] <= MAX_ARTICLE_SHARE * count}
+
+
+def find_entities(translation_id: str) -> Dict[str, Dict]:
+    """Return {name: {"forms", "count", "books", "verses"}} for one translation."""
+    capitalized = Counter()
+    after_article = Counter()
+    lowercase = Counter()
+    vocabulary = set()
+    occurrences = defaultdict(list)   # form -> [(verse id, book id)]
+
+    for verse in iter_verses(translation_id):
+        for word, sentence_start, article in capitalized_words(plain_text(verse['text'])):
+            vocabulary.add(word.lower())
+            if not word[0].isupper():
+                lowercase[word] += 1
+                continue
+            # Counted for accepted names, but no evidence for the classification
+            occurrences[word].append((verse['id'], verse['bookId']))
+            if not sentence_start:
+                capitalized[word] += 1
+                after_article[word] += article
+
+    common_nouns = {w.lower() for w, count in capitalized.items() if after_article[w] > MAX_ARTICLE_SHARE * count}
+    compound_tails = {w[i:] for w in vocabulary if '-' not in w for i in range(MIN_STEM, len(w) - MIN_STEM)}
+    known = gazetteer(translation_id)
+
+    def is_candidate(word: str, count: int) -> bool:
+        if count < MIN_COUNT or lowercase[word.lower()] > MAX_LOWERCASE_SHARE * count:
+            return False
+        return after_article[word] <= MAX_ARTICLE_SHARE * count
+
+    def is_inflected(lower: str) -> bool:
+        """A plural or case form of a word in the vocabulary (Jahre -> Jahr, Vorwürfe -> Vorwurf)."""
+        for ending in INFLECTIONS:
+            if lower.endswith(ending) and len(lower) - len(ending) >= MIN_STEM:
+                stem = lower[:-len(ending)]
+                if stem in vocabulary or (ending in UMLAUT_PLURALS and umlauted(stem, reverse=True) & vocabulary):
+                    return True
+        return False
+
+    def is_name(word: str) -> bool:
+        lower = word.lower()
+        if lower.endswith(NOUN_SUFFIXES) or is_inflected(lower):
+            return False
+        if any(lower + ending in lowercase for ending in ADJECTIVE_ENDINGS):
+            return False
+        if any(lower[i:] in common_nouns for i in range(MIN_STEM, len(lower) - MIN_STEM + 1)):
+            return False
+        if word in known:
+            return True
+        if lower in compound_tails or any(lower + ending in vocabulary for ending in INFLECTIONS):
+            return False
+        return not any(stem + ending in vocabulary for stem in umlauted(lower) for ending in UMLAUT_PLURALS)
+
+    names = {w for w, count in capitalized.items() if is_candidate(w, count) and is_name(w)}
+
+    book_names = {w for book in load_book_catalog() for w in tokenize(book['name'])}
+
+    def base_form(word: str) -> str:
+        candidates = []
+        # Genitive -s (Davids, Salomos); names of their own that look like a
+        # genitive are book names (Judas is not Juda, Amos)
+        if word.endswith('s') and word not in book_names:
+            candidates.append(word[:-1])
+        if word.endswith('u'):   # Jesu
+            candidates.append(word + 's')
+        if word.endswith('i'):   # Christi
+            candidates.append(word[:-1] + 'us')
+        # The base form is the more frequent one (Esau/Esaus, not Esaus/Esau)
+        return next((base for base in candidates if base in names and capitalized[base] >= capitalized[word]), word)
+
+    entities: Dict[str, Dict] = {}
+    for word in sorted(names):
+        entity = entities.setdefault(base_form(word), {'forms': [], 'occurrences': []})
+        entity['forms'].append(word)
+        entity['occurrences'].extend(occurrences[word])
+
+    for name, entity in entities.items():
+        entity['occurrences'].sort()
+        entity['count'] = len(entity['occurrences'])
+        entity['books'] = dict(Counter(book_id for _, book_id in entity['occurrences']))
+        entity['verses'] = sorted({vid for vid, _ in entity['occurrences']})
+        del entity['occurrences']
+    return entities
+
+
+def build_index(translation_id: str) -> Dict[str, int]:
+    """Build and write the entity index and one page per entity."""
+    entities = find_entities(translation_id)
+    ranked = sorted(entities, key=lambda name: (-entities[name]['count'], name))
+
+    out_dir = generated_path(translation_id, "entities")
+    written = [os.path.join(out_dir, "index.json")]
+
+    slugs: Dict[str, str] = {}
+    used = set()
+    for name in ranked:
+        slug = slugify(name) or 'entity'
+        candidate, n = slug, 2
+        while candidate in used:
+            candidate, n = f"{slug}-{n}", n + 1
+        used.add(candidate)
+        slugs[name] = candidate
+
+    for name in ranked:
+        entity = entities[name]
+        verses, previous = [], 0
+        for vid in entity['verses']:
+            verses.append(vid - previous)
+            previous = vid
+        written.append(os.path.join(out_dir, f"{slugs[name]}.json"))
+        write_json(written[-1], {
+            'name': name,
+            'forms': entity['forms'],
+            'count': entity['count'],
+            'books': entity['books'],
+            'verses': verses,
+        })
+
+    write_json(os.path.join(out_dir, "index.json"), {
+        'names': ranked,
+        'slugs': [slugs[name] for name in ranked],
+        'counts': [entities[name]['count'] for name in ranked],
+        'forms': [entities[name]['forms'] for name in ranked],
+    })
+    remove_stale(out_dir, written)
+    return {'entities': len(ranked), 'occurrences': sum(e['count'] for e in entities.values())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the named-entity index")
+    parser.add_argument("--show", nargs="+", metavar="NAME")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    args = parser.parse_args()
+
+    if args.show:
+        base = generated_path(args.translation, "entities")
+        with open(os.path.join(base, "index.json"), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        slugs = dict(zip(index['names'], index['slugs']))
+        for name in args.show:
+            if name not in slugs:
+                print(f"{name}: -")
+                continue
+            with open(os.path.join(base, f"{slugs[name]}.json"), 'r', encoding='utf-8') as f:
+                entity = json.load(f)
+            books = ", ".join(f"{book} {count}" for book, count in
+                              sorted(entity['books'].items(), key=lambda item: -item[1])[:8])
+            first = split_verse_id(entity['verses'][0])
+            print(f"{name} ({'/'.join(entity['forms'])}): {entity['count']}× in {len(entity['verses'])} verses; "
+                  f"{books}; first {first[1]},{first[2]}")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        counts = build_index(translation_id)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {counts['entities']} entities, {counts['occurrences']} occurrences "
+              f"in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
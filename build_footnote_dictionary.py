@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Deduplicate the footnotes of every translation into a footnote dictionary
+and report the savings.
+
+Footnote strings that occur at least twice are interned into a per-
+translation dictionary, most frequent first, so the common ones get short
+references. A verse footnote list then holds integers (index into the
+dictionary) for interned strings and the string itself for footnotes that
+occur only once; strings whose reference would not be shorter than the
+string stay inline as well.
+
+With --apply the dictionary is written to data/bibel/<folder>/footnotes.json,
+then the <book>.cold.json companions (see split_cold_fields in
+bible_corpus.py) of a translation are rewritten to this encoding and the
+manifest is rebuilt (hasFootnoteDictionary). Footnotes still inline in the
+book modules are only counted for the report; the app resolves references
+when it loads the cold data (lib/bible-loader.ts).
+
+Usage:
+    python3 build_footnote_dictionary.py                # Report for all translations
+    python3 build_footnote_dictionary.py --top 10       # ... with the most repeated footnotes
+    python3 build_footnote_dictionary.py --apply        # Rewrite cold companions and manifest
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Union
+
+from bible_corpus import (
+    DATA_DIR,
+    FOOTNOTE_DICTIONARY,
+    available_translations,
+    book_path,
+    cold_path,
+    iter_books,
+    manifest_path,
+    split_cold_fields,
+    write_json,
+)
+from build_manifest import build_manifest
+from safe_io import translation_lock
+
+MIN_REPEATS = 2
+
+FootnoteRef = Union[int, str]
+
+
+def json_size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def build_dictionary(counts: Counter) -> List[str]:
+    """Interned strings, most frequent first (ties in first-seen order)."""
+    ranked = [s for s, n in counts.most_common() if n >= MIN_REPEATS]
+    return [s for index, s in enumerate(ranked) if json_size(s) > len(str(index))]
+
+
+def encode(footnotes: List[str], index: Dict[str, int]) -> List[FootnoteRef]:
+    return [index.get(footnote, footnote) for footnote in footnotes]
+
+
+def apply_dictionary(translation_id: str, folder: str, dictionary: Optional[List[str]],
+                     companions: List[Tuple[str, Dict]]) -> None:
+    """
+    Write the dictionary (or remove it if None), then the re-encoded cold
+    companions, then the manifest, all under the translation lock: a reader
+    never sees references into a dictionary that is not there, and the
+    manifest's hasFootnoteDictionary matches the files.
+    """
+    dictionary_path = os.path.join(DATA_DIR, folder, FOOTNOTE_DICTIONARY)
+    with translation_lock(dictionary_path):
+        if dictionary is not None:
+            write_json(dictionary_path, dictionary)
+        for path, cold in companions:
+            write_json(path, cold)
+        if dictionary is None and os.path.exists(dictionary_path):
+            os.remove(dictionary_path)
+        write_json(manifest_path(folder), build_manifest(translation_id, folder))
+
+
+def footnote_report(translation_id: str, apply: bool = False) -> Dict:
+    folder = available_translations()[translation_id]
+    books = list(iter_books(translation_id))
+    counts = Counter(
+        footnote
+        for _, book in books
+        for chapter in book['chapters']
+        for verse in chapter['verses']
+        for footnote in verse.get('footnotes') or []
+    )
+    dictionary = build_dictionary(counts)
+    index = {s: i for i, s in enumerate(dictionary)}
+
+    inline_bytes, encoded_bytes = 0, json_size(dictionary)
+    inline_heap = sum(2 * len(s) * n for s, n in counts.items())   # UTF-16 strings in the JS heap
+    interned_heap = sum(2 * len(s) * (1 if s in index else n) for s, n in counts.items())
+    companions = []
+
+    for meta, book in books:
+        _, cold = split_cold_fields(book, meta['index'])
+        for footnotes in cold['footnotes'].values():
+            inline_bytes += json_size(footnotes)
+            encoded_bytes += json_size(encode(footnotes, index))
+
+        path = cold_path(book_path(folder, meta['testament'], meta['id']))
+        if os.path.exists(path):
+            cold['footnotes'] = {key: encode(f, index) for key, f in cold['footnotes'].items()}
+            companions.append((path, cold))
+
+    if apply:
+        apply_dictionary(translation_id, folder, dictionary if companions else None, companions)
+
+    return {
+        'footnotes': sum(counts.values()),
+        'unique': len(counts),
+        'interned': len(dictionary),
+        'inline_bytes': inline_bytes,
+        'encoded_bytes': encoded_bytes,
+        'inline_heap': inline_heap,
+        'interned_heap': interned_heap,
+        'rewritten': len(companions) if apply else 0,
+        'top': counts.most_common(),
+    }
+
+
+def saving(before: int, after: int) -> str:
+    return f"{before / 1024:.0f} KB -> {after / 1024:.0f} KB ({(after - before) / max(before, 1):+.1%})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intern footnotes into a per-translation dictionary")
+    parser.add_argument("--apply", action="store_true", help="rewrite the <book>.cold.json companions")
+    parser.add_argument("--top", type=int, default=0, metavar="N", help="show the N most repeated footnotes")
+    args = parser.parse_args()
+
+    for translation_id in available_translations():
+        stats = footnote_report(translation_id, args.apply)
+        print(f"✓ {translation_id}: {stats['footnotes']} footnotes, {stats['unique']} distinct, "
+              f"{stats['interned']} interned")
+        print(f"  JSON:  {saving(stats['inline_bytes'], stats['encoded_bytes'])}")
+        print(f"  Heap:  {saving(stats['inline_heap'], stats['interned_heap'])}")
+        if args.apply:
+            print(f"  Rewrote {stats['rewritten']} cold companions")
+        for footnote, count in stats['top'][:args.top]:
+            if count < MIN_REPEATS:
+                break
+            print(f"  {count:4d}× {footnote[:70]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Generate the book manifest of every translation from the data/bibel tree.
+
+Scans the book modules that actually exist and writes
+data/bibel/<folder>/manifest.json with, per book, its testament folder,
+export name, names, whether introduction and footnotes are split into a
+<book>.cold.json companion, chapter count (highest chapter number) and verse
+count (highest verse number) per chapter. The app (lib/bible-loader.ts) and
+the Python tools read this manifest instead of keeping their own hand-maintained book lists.
+
+Run this after every change to data/bibel:
+    python3 build_manifest.py
+"""
+
+import json
+import os
+import re
+import sys
+from typing import Dict, Optional
+
+from bible_corpus import (
+    DATA_DIR,
+    FOOTNOTE_DICTIONARY,
+    TESTAMENT_FOLDERS,
+    cold_path,
+    load_book_catalog,
+    load_translations,
+    manifest_path,
+    parse_exports,
+    write_json,
+)
+
+
+def scan_book(path: str) -> Optional[Dict]:
+    """Read one book module and return its manifest entry."""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    exports = parse_exports(source)
+    books = [(name, value) for name, value in exports.items() if isinstance(value, dict) and 'chapters' in value]
+    if not books:
+        return None
+    export, book = books[0]
+    # Introduction and footnotes may live in a <book>.cold.json companion
+    cold = None
+    if os.path.exists(cold_path(path)):
+        with open(cold_path(path), 'r', encoding='utf-8') as f:
+            cold = json.load(f)
+    # Highest verse number per chapter number; split verses (2,4a/2,4b) share
+    # a number, chapters missing from the source (EÜ Sirach 7) count 0
+    highest: Dict[int, int] = {}
+    for chapter in book['chapters']:
+        highest[chapter['number']] = max((v['number'] for v in chapter['verses']), default=0)
+    last_chapter = max(highest, default=0)
+
+    return {
+        'id': book['id'],
+        'name': book.get('name', ''),
+        'shortName': book.get('shortName', ''),
+        'testament': book.get('testament', ''),
+        'exportName': export,
+        'hasIntroduction': bool(book.get('introduction') or (cold or {}).get('introduction')),
+        'hasColdData': cold is not None,
+        'chapters': last_chapter,
+        'verses': [highest.get(number, 0) for number in range(1, last_chapter + 1)],
+    }
+
+
+def build_manifest(translation_id: str, folder: str) -> Dict:
+    """Scan a translation folder and build its manifest."""
+    base = os.path.join(DATA_DIR, folder)
+    order = {book['id']: book['index'] for book in load_book_catalog()}
+    found = []
+
+    for testament, sub in TESTAMENT_FOLDERS.items():
+        directory = os.path.join(base, sub)
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            if not filename.endswith('.ts') or filename.endswith('.d.ts'):
+                continue
+            book_id = os.path.splitext(filename)[0]
+            entry = scan_book(os.path.join(directory, filename))
+            if entry is None:
+                print(f"✗ {folder}/{sub}/{filename}: no Book export found")
+                continue
+            if entry['id'] != book_id:
+                print(f"✗ {folder}/{sub}/{filename}: id '{entry['id']}' does not match file name")
+            if entry['testament'] != testament:
+                print(f"✗ {folder}/{sub}/{filename}: testament '{entry['testament']}' stored in {sub}/")
+            entry['id'] = book_id
+            entry['testament'] = testament
+            entry['folder'] = sub
+            found.append(entry)
+
+    # Canonical order first, unknown books (not in BIBLE_BOOKS) at the end
+    found.sort(key=lambda e: (order.get(e['id'], len(order) + 1), e['id']))
+
+    books = {}
+    for entry in found:
+        book_id = entry.pop('id')
+        books[book_id] = {
+            'testament': entry['testament'],
+            'folder': entry['folder'],
+            'exportName': entry['exportName'],
+            'name': entry['name'],
+            'shortName': entry['shortName'],
+            'hasIntroduction': entry['hasIntroduction'],
+            'hasColdData': entry['hasColdData'],
+            'chapters': entry['chapters'],
+            'verses': entry['verses'],
+        }
+
+    vorwort_path = os.path.join(base, "vorwort.ts")
+    has_vorwort = False
+    if os.path.exists(vorwort_path):
+        with open(vorwort_path, 'r', encoding='utf-8') as f:
+            has_vorwort = re.search(r'^export\s+const\s+(vorwort|einleitung)\b', f.read(), re.MULTILINE) is not None
+
+    return {
+        'translation': translation_id,
+        'folder': folder,
+        'hasVorwort': has_vorwort,
+        'hasFootnoteDictionary': os.path.exists(os.path.join(base, FOOTNOTE_DICTIONARY)),
+        'books': books,
+    }
+
+
+def main():
+    translations = load_translations()
+    selected = sys.argv[1:] or list(translations)
+
+    for translation_id in selected:
+        folder = translations.get(translation_id)
+        if folder is None:
+            print(f"Error: Unknown translation '{translation_id}'")
+            sys.exit(1)
+        if not os.path.isdir(os.path.join(DATA_DIR, folder)):
+            print(f"- {translation_id}: no data folder, skipped")
+            continue
+
+        manifest = build_manifest(translation_id, folder)
+        output_path = manifest_path(folder)
+        write_json(output_path, manifest)
+
+        books = manifest['books']
+        verses = sum(sum(b['verses']) for b in books.values())
+        print(f"✓ {translation_id}: {len(books)} books, {verses} verses")
+        print(f"  Written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Build a Merkle tree over the corpus (translation -> book -> chapter -> verse)
+and verify two trees against each other.
+
+A verse hash is the SHA-256 of its compact JSON (bible_corpus.json_payload);
+every inner node hashes the sorted "key:hash" lines of its children. Equal
+hashes mean equal subtrees, so the verifier only descends into subtrees whose
+hashes differ. The tree has four fixed levels and a book file holds all its
+chapter and verse hashes, so checking an identical deployment reads the two
+root files, and each translation and each book with a changed verse adds its
+file from both trees: 2 × (1 + changed translations + changed books) reads
+instead of the whole corpus.
+
+The tree is split into files along the levels, so a verifier reading a
+remote tree only fetches what it descends into:
+
+    public/generated/merkle/root.json          {"hash": ..., "children": {translation: hash}}
+    public/generated/merkle/<translation>.json {"hash": ..., "children": {bookId: hash}}
+    public/generated/merkle/<translation>/<bookId>.json
+        {"hash": ..., "children": {chapter: {"hash": ..., "children": {verse key: hash}}}}
+
+Usage:
+    python3 build_merkle_tree.py                           # Build for data/bibel
+    python3 build_merkle_tree.py --verify SOURCE [--against SOURCE]
+        SOURCE is a tree directory or its URL (https://host/generated/merkle);
+        --against defaults to the local tree. Exits with 1 if the trees
+        differ, 2 if a SOURCE has no readable root.json.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.request
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bible_corpus import available_translations, generated_path, iter_books, json_payload, verse_id, verse_key, write_json
+from safe_io import remove_stale
+
+MERKLE_DIR = "merkle"
+
+Reader = Callable[[str], Optional[Dict]]
+
+
+def leaf_hash(verse: Dict) -> str:
+    return hashlib.sha256(json_payload(verse)).hexdigest()
+
+
+def node_hash(children: Dict[str, str]) -> str:
+    lines = '\n'.join(f"{key}:{children[key]}" for key in sorted(children))
+    return hashlib.sha256(lines.encode('utf-8')).hexdigest()
+
+
+def book_node(book: Dict, index: int) -> Dict:
+    chapters = {}
+    for chapter in book['chapters']:
+        parts: Dict[int, int] = {}
+        verses = {}
+        for verse in chapter['verses']:
+            part = parts.get(verse['number'], 0)
+            parts[verse['number']] = part + 1
+            verses[verse_key(verse_id(index, chapter['number'], verse['number']), part)] = leaf_hash(verse)
+        chapters[str(chapter['number'])] = {'hash': node_hash(verses), 'children': verses}
+    return {'hash': node_hash({n: c['hash'] for n, c in chapters.items()}), 'children': chapters}
+
+
+def build_tree(out_dir: str) -> Dict:
+    written = []
+    translations = {}
+    for translation_id in available_translations():
+        books = {}
+        for meta, book in iter_books(translation_id):
+            node = book_node(book, meta['index'])
+            written.append(os.path.join(out_dir, translation_id, f"{meta['id']}.json"))
+            write_json(written[-1], node)
+            books[meta['id']] = node['hash']
+        node = {'hash': node_hash(books), 'children': books}
+        written.append(os.path.join(out_dir, f"{translation_id}.json"))
+        write_json(written[-1], node)
+        translations[translation_id] = node['hash']
+    root = {'hash': node_hash(translations), 'children': translations}
+    written.append(os.path.join(out_dir, "root.json"))
+    write_json(written[-1], root)
+    remove_stale(out_dir, written)
+    return root
+
+
+def tree_reader(source: str) -> Reader:
+    """Read tree files from a directory or a base URL; missing files give None."""
+    def read(path: str) -> Optional[Dict]:
+        try:
+            if source.startswith(('http://', 'https://')):
+                with urllib.request.urlopen(f"{source.rstrip('/')}/{path}", timeout=30) as response:
+                    return json.load(response)
+            with open(os.path.join(source, path), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    return read
+
+
+def verify(expected: Reader, actual: Reader) -> Tuple[List[Tuple[str, str]], int]:
+    """
+    Compare two trees. Returns the differing leaves as (path, kind) with kind
+    "changed", "missing" (only in expected) or "extra" (only in actual), and the
+    number of tree files read.
+    """
+    reads = 0
+    differences: List[Tuple[str, str]] = []
+
+    def load(path: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        nonlocal reads
+        reads += 2
+        return expected(path), actual(path)
+
+    def compare(a: Dict[str, object], b: Dict[str, object], prefix: str, descend) -> None:
+        for key in sorted(set(a) | set(b), key=lambda k: (len(k), k)):
+            path = f"{prefix}/{key}" if prefix else key
+            if key not in b:
+                differences.append((path, "missing"))
+            elif key not in a:
+                differences.append((path, "extra"))
+            elif a[key] != b[key]:
+                if descend is None:
+                    differences.append((path, "changed"))
+                else:
+                    descend(key, path)
+
+    def hashes(node: Optional[Dict]) -> Dict[str, str]:
+        return {key: child if isinstance(child, str) else child['hash']
+                for key, child in (node or {}).get('children', {}).items()}
+
+    root_a, root_b = load("root.json")
+    if root_a is None or root_b is None:
+        raise FileNotFoundError("root.json missing")
+    if root_a['hash'] == root_b['hash']:
+        return differences, reads
+
+    def translation(tid: str, path: str) -> None:
+        a, b = load(f"{tid}.json")
+        compare(hashes(a), hashes(b), path, lambda book_id, book_path: book(tid, book_id, book_path))
+
+    def book(tid: str, book_id: str, path: str) -> None:
+        a, b = load(f"{tid}/{book_id}.json")
+        chapters_a, chapters_b = (a or {}).get('children', {}), (b or {}).get('children', {})
+
+        def chapter(number: str, chapter_path: str) -> None:
+            compare(chapters_a[number]['children'], chapters_b[number]['children'], chapter_path, None)
+
+        compare(hashes(a), hashes(b), path, chapter)
+
+    compare(root_a['children'], root_b['children'], "", translation)
+    return differences, reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or verify the corpus Merkle tree")
+    parser.add_argument("--verify", metavar="SOURCE")
+    parser.add_argument("--against", metavar="SOURCE", default=generated_path(None, MERKLE_DIR))
+    args = parser.parse_args()
+
+    if args.verify:
+        for source in (args.against, args.verify):
+            if tree_reader(source)("root.json") is None:
+                print(f"✗ No Merkle tree at {source} (root.json missing or unreachable)")
+                sys.exit(2)
+        start = time.perf_counter()
+        differences, reads = verify(tree_reader(args.against), tree_reader(args.verify))
+        elapsed = time.perf_counter() - start
+        for path, kind in differences:
+            print(f"  {kind:<8} {path}")
+        mark = "✓" if not differences else "✗"
+        print(f"{mark} {len(differences)} differences, {reads} tree files read in {elapsed:.2f}s")
+        sys.exit(1 if differences else 0)
+
+    start = time.perf_counter()
+    root = build_tree(generated_path(None, MERKLE_DIR))
+    elapsed = time.perf_counter() - start
+    print(f"✓ Merkle root {root['hash'][:16]} over {len(root['children'])} translations in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Build the offline pack of every translation: everything the PWA needs to read
+and search without a network, described by a precache manifest a service
+worker can download in the background.
+
+Every book is one chunk; a book larger than CHUNK_SIZE is split into fixed
+chapter ranges of equal chapter count (chapter_ranges). The first chunk of a
+book also carries its metadata (name, introduction, ...). Chunks are named by
+their content hash. Their boundaries depend on the book structure, not on
+the sizes of the other books, so a text change only alters (and an update
+only downloads) the chunk of the changed book or chapter range. The outline
+and the search indexes (PACK_FILES) are precached under their normal URLs
+with a content revision. An index file larger than CHUNK_SIZE (the trigram
+postings, a concordance shard of a very frequent word) is cut into
+content-hashed parts of CHUNK_SIZE bytes; the service worker fetches the
+parts like chunks and stores their concatenation under the file's URL.
+Render tokens are not packed: they are an optional optimization
+(VerseText.tsx works without them) and exist only for books a generator or
+build_render_tokens.py has processed. trigram/verses.json is not packed
+either, as it repeats the chunk text: position n of the trigram postings is
+the n-th verse of the chunks in pack order, and its text is the verse text
+with " / " replaced by a space (bible_corpus.plain_text), so the client
+rebuilds it from the chunks.
+
+The precache list is split into CONCURRENCY batches of about equal size
+(largest files first), one per parallel fetch lane.
+
+Output in public/generated/<translation>/offline/:
+
+    chunks/<hash>.json   {"books": {bookId: {...book without chapters}},
+                          "chapters": {"<bookId>/<chapter>": chapter}}
+    parts/<hash>.bin     consecutive CHUNK_SIZE byte ranges of a large index file
+    pack.json            {"version", "translation", "totalSize",
+                          "chunks": [{"url", "size", "chapters": [...]}],
+                          "precache": [{"url", "revision", "size"}],   (revision null for hashed URLs)
+                          "assembled": [{"url", "revision", "size", "parts": [precache index, ...]}],
+                          "batches": [[precache index, ...], ...]}
+
+Build the indexes first (build_outline.py, build_trigram_index.py, ...);
+missing ones are reported and left out.
+
+Usage:
+    python3 build_offline_pack.py                        # All translations
+    python3 build_offline_pack.py --include concordance  # Also pack optional (large) indexes
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from typing import Dict, List
+
+from bible_corpus import available_translations, generated_path, iter_books, json_payload, write_json
+from safe_io import remove_stale, write_bytes_atomic
+
+CHUNK_SIZE = 512 * 1024
+CONCURRENCY = 4
+HASH_LENGTH = 16
+OFFLINE_DIR = "offline"
+
+# Below public/generated/<translation>/; directories are packed with all their files
+PACK_FILES = ["outline.json", "autocomplete.json", "trigram", "spelling"]
+OPTIONAL_FILES = ["concordance", "semantic", "related", "entities", "parallels.json"]
+# Rebuilt by the client from the chunks
+EXCLUDED_FILES = ["trigram/verses.json"]
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def translation_url(translation_id: str, path: str) -> str:
+    return f"/generated/{translation_id}/{path}"
+
+
+def chapter_ranges(chapter_sizes: List[int]) -> List[range]:
+    """
+    Split a book's chapters into as few equal-count ranges as keep each under
+    CHUNK_SIZE on average. The ranges depend only on the chapter count and on
+    how many CHUNK_SIZEs the book spans, so editing a chapter moves no
+    boundary unless the book crosses a multiple of CHUNK_SIZE.
+    """
+    count = len(chapter_sizes)
+    parts = min(count, max(1, -(-sum(chapter_sizes) // CHUNK_SIZE)))
+    return [range(count * i // parts, count * (i + 1) // parts) for i in range(parts)]
+
+
+def build_chunks(translation_id: str, out_dir: str) -> List[Dict]:
+    """Write every book (or fixed chapter range of a large book) as a content-hashed chunk."""
+    chunks: List[Dict] = []
+    for meta, book in iter_books(translation_id):
+        book_meta = {key: value for key, value in book.items() if key != 'chapters'}
+        chapters = book['chapters']
+        for part, indexes in enumerate(chapter_ranges([len(json_payload(c)) for c in chapters])):
+            chunk = {
+                'books': {meta['id']: book_meta} if part == 0 else {},
+                'chapters': {f"{meta['id']}/{chapters[i]['number']}": chapters[i] for i in indexes},
+            }
+            data = json_payload(chunk)
+            name = f"{content_hash(data)}.json"
+            write_bytes_atomic(os.path.join(out_dir, "chunks", name), data)
+            chunks.append({
+                'url': translation_url(translation_id, f"{OFFLINE_DIR}/chunks/{name}"),
+                'size': len(data),
+                'chapters': list(chunk['chapters']),
+            })
+    return chunks
+
+
+def index_files(translation_id: str, names: List[str]) -> List[str]:
+    """Paths of the index files below the translation; missing indexes are reported."""
+    base = generated_path(translation_id)
+    excluded = {os.path.join(base, name) for name in EXCLUDED_FILES}
+    files: List[str] = []
+    for name in names:
+        path = os.path.join(base, name)
+        if os.path.isdir(path):
+            found = sorted(
+                os.path.join(directory, filename)
+                for directory, _, filenames in os.walk(path)
+                for filename in filenames
+            )
+        elif os.path.exists(path):
+            found = [path]
+        else:
+            print(f"  - {translation_id}: {name} not built, left out")
+            continue
+        files += [file for file in found if file not in excluded]
+    return files
+
+
+def index_entries(translation_id: str, names: List[str], out_dir: str,
+                  precache: List[Dict], written: List[str]) -> List[Dict]:
+    """
+    Append precache entries (url, revision, size) for the index files; files
+    larger than CHUNK_SIZE are written as parts instead. Returns the entries
+    of the files assembled from parts.
+    """
+    base = generated_path(translation_id)
+    assembled = []
+    for file in index_files(translation_id, names):
+        with open(file, 'rb') as f:
+            data = f.read()
+        url = translation_url(translation_id, os.path.relpath(file, base).replace(os.sep, '/'))
+        if len(data) <= CHUNK_SIZE:
+            precache.append({'url': url, 'revision': content_hash(data), 'size': len(data)})
+            continue
+        parts = []
+        for start in range(0, len(data), CHUNK_SIZE):
+            part = data[start:start + CHUNK_SIZE]
+            name = f"{content_hash(part)}.bin"
+            written.append(os.path.join(out_dir, "parts", name))
+            write_bytes_atomic(written[-1], part)
+            parts.append(len(precache))
+            precache.append({'url': translation_url(translation_id, f"{OFFLINE_DIR}/parts/{name}"),
+                             'revision': None, 'size': len(part)})
+        assembled.append({'url': url, 'revision': content_hash(data), 'size': len(data), 'parts': parts})
+    return assembled
+
+
+def balance_batches(entries: List[Dict], lanes: int) -> List[List[int]]:
+    """Assign entries to `lanes` batches of about equal total size (largest first)."""
+    batches: List[List[int]] = [[] for _ in range(lanes)]
+    totals = [0] * lanes
+    for i in sorted(range(len(entries)), key=lambda i: -entries[i]['size']):
+        lane = totals.index(min(totals))
+        batches[lane].append(i)
+        totals[lane] += entries[i]['size']
+    return [sorted(batch) for batch in batches if batch]
+
+
+def batch_sizes(pack: Dict) -> List[int]:
+    return [sum(pack['precache'][i]['size'] for i in batch) for batch in pack['batches']]
+
+
+def build_pack(translation_id: str, include: List[str]) -> Dict:
+    out_dir = generated_path(translation_id, OFFLINE_DIR)
+    chunks = build_chunks(translation_id, out_dir)
+    written = [os.path.join(out_dir, "chunks", chunk['url'].rsplit('/', 1)[1]) for chunk in chunks]
+    precache = [{'url': chunk['url'], 'revision': None, 'size': chunk['size']} for chunk in chunks]
+    assembled = index_entries(translation_id, PACK_FILES + include, out_dir, precache, written)
+
+    listed = [(e['url'], e['revision']) for e in precache] + [(e['url'], e['revision']) for e in assembled]
+    version = content_hash('\n'.join(f"{url} {revision}" for url, revision in listed).encode('utf-8'))
+    pack = {
+        'version': version,
+        'translation': translation_id,
+        'totalSize': sum(entry['size'] for entry in precache),
+        'chunks': chunks,
+        'precache': precache,
+        'assembled': assembled,
+        'batches': balance_batches(precache, CONCURRENCY),
+    }
+    write_json(os.path.join(out_dir, "pack.json"), pack)
+    remove_stale(out_dir, written + [os.path.join(out_dir, "pack.json")])
+    return pack
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline pack for the PWA")
+    parser.add_argument("--include", nargs="+", default=[], choices=OPTIONAL_FILES, metavar="INDEX",
+                        help=f"optional indexes to pack: {', '.join(OPTIONAL_FILES)}")
+    args = parser.parse_args()
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        pack = build_pack(translation_id, args.include)
+        elapsed = time.perf_counter() - start
+        chapters = sum(len(chunk['chapters']) for chunk in pack['chunks'])
+        print(f"✓ {translation_id} {pack['version']}: {chapters} chapters in {len(pack['chunks'])} chunks, "
+              f"{len(pack['precache'])} files, {pack['totalSize'] / 1024 / 1024:.1f} MB "
+              f"in {len(pack['batches'])} batches of "
+              f"{'/'.join(f'{size / 1024 / 1024:.1f}' for size in batch_sizes(pack))} MB ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
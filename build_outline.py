@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Build the section outline (table of contents) of every book from the verse
+headings.
+
+A heading belongs to the verse it precedes. Its parts, split on " | " like
+VerseText.tsx does, are nested levels: the last part is the section that
+starts at this verse, the parts before it open enclosing groups
+("Die Anfänge: 1,1 - 11,9 | Die Erschaffung der Welt: 1,1 - 2,4a"). Verse
+ranges written into EÜ headings are removed from the title; a group ends at
+its stated range, or, without one, where the next group is opened. Sections
+end at the verse before the next heading.
+
+Output: public/generated/<translation>/outline.json
+
+    {bookId: [{"title": ..., "start": [chapter, verse], "end": [chapter, verse],
+               "children": [...]}, ...]}      ("children" only for groups)
+
+Usage:
+    python3 build_outline.py                    # Build for all translations
+    python3 build_outline.py --show psalms [--translation neue]
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from bible_corpus import available_translations, generated_path, iter_verses, write_json
+
+HEADING_SEPARATOR = " | "
+STATED_RANGE = re.compile(r':\s*(\d+),(\d+)[a-z]?(?:\s*[-–]\s*(?:(\d+),)?(\d+)[a-z]?)?\s*$')
+
+
+def split_title(part: str) -> Tuple[str, Optional[Tuple[int, int]]]:
+    """Title without a trailing verse range, and the range's last verse if there is one."""
+    match = STATED_RANGE.search(part)
+    if not match:
+        return part.strip(), None
+    chapter, verse, end_chapter, end_verse = match.groups()
+    if end_verse is None:
+        end = (int(chapter), int(verse))
+    else:
+        end = (int(end_chapter or chapter), int(end_verse))
+    return part[:match.start()].strip(), end
+
+
+def close(node: Dict, end: List[int]) -> None:
+    if 'end' not in node:
+        node['end'] = end
+
+
+def book_outline(verses: List[Dict]) -> List[Dict]:
+    """Outline of one book from its verse records (in order)."""
+    roots: List[Dict] = []
+    groups: List[Tuple[Dict, Optional[Tuple[int, int]]]] = []   # open groups with stated end
+    section: Optional[Dict] = None
+    previous: Optional[List[int]] = None
+
+    for verse in verses:
+        position = [verse['chapter'], verse['verse']]
+        if verse['heading']:
+            parts = [split_title(p) for p in verse['heading'].split(HEADING_SEPARATOR)]
+            *group_parts, (title, _) = parts
+            if section is not None:
+                close(section, previous)
+
+            # Groups with a stated range end there; others end when a new group opens
+            while groups and groups[-1][1] is not None and groups[-1][1] < tuple(position):
+                close(groups.pop()[0], previous)
+            if group_parts:
+                while groups and groups[-1][1] is None:
+                    close(groups.pop()[0], previous)
+
+            for group_title, stated_end in group_parts:
+                node = {'title': group_title, 'start': position, 'children': []}
+                (groups[-1][0]['children'] if groups else roots).append(node)
+                groups.append((node, stated_end))
+
+            section = {'title': title, 'start': position}
+            (groups[-1][0]['children'] if groups else roots).append(section)
+        previous = position
+
+    if section is not None:
+        close(section, previous)
+    for node, _ in groups:
+        close(node, previous)
+    return roots
+
+
+def build_outline(translation_id: str) -> Dict[str, List[Dict]]:
+    books: Dict[str, List[Dict]] = {}
+    current: List[Dict] = []
+    book_id = None
+    for verse in iter_verses(translation_id):
+        if verse['bookId'] != book_id:
+            if book_id is not None:
+                books[book_id] = book_outline(current)
+            book_id, current = verse['bookId'], []
+        current.append(verse)
+    if book_id is not None:
+        books[book_id] = book_outline(current)
+    return books
+
+
+def count_nodes(nodes: List[Dict]) -> int:
+    return sum(1 + count_nodes(node.get('children', [])) for node in nodes)
+
+
+def print_outline(nodes: List[Dict], depth: int = 0) -> None:
+    for node in nodes:
+        start, end = node['start'], node['end']
+        print(f"{'  ' * depth}{start[0]},{start[1]}-{end[0]},{end[1]}  {node['title']}")
+        print_outline(node.get('children', []), depth + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or show the section outline")
+    parser.add_argument("--show", metavar="BOOK_ID")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    args = parser.parse_args()
+
+    if args.show:
+        with open(generated_path(args.translation, "outline.json"), 'r', encoding='utf-8') as f:
+            outline = json.load(f)
+        print_outline(outline.get(args.show, []))
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        outline = build_outline(translation_id)
+        write_json(generated_path(translation_id, "outline.json"), outline)
+        elapsed = time.perf_counter() - start
+        nodes = sum(count_nodes(nodes) for nodes in outline.values())
+        print(f"✓ {translation_id}: {nodes} outline entries in {len(outline)} books in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Detect parallel passages across books (synoptic gospels, Samuel/Kings and
+Chronicles) with MinHash signatures and LSH banding.
+
+Every translation is cut into pericopes at its section headings. A pericope
+is represented by the set of its content-word bigrams (shingles); words that
+occur in more than STOPWORD_SHARE of all verses are left out before
+shingling. NUM_HASHES MinHash values per pericope estimate the Jaccard
+similarity of these sets; the signatures are split into BANDS bands of
+ROWS values, and only pericopes that agree in at least one whole band become
+candidates, so the corpus is never compared pairwise. Candidates from
+different books are verified with the exact Jaccard similarity.
+
+Synopsis numbers kept by convert_numbers_to_ts.py (verse field `synopsis`)
+are added as parallels as well.
+
+Output: public/generated/<translation>/parallels.json
+
+    {"pericopes": {"books": [...], "starts": [[chapter, verse], ...],
+                   "ends": [[chapter, verse], ...], "headings": [...]},
+     "pairs": [[pericope, pericope, similarity], ...],   (similarity 1.0 for synopsis pairs)
+     "parallels": {pericope: [pericope, ...]}}           (best match first)
+
+Usage:
+    python3 build_parallel_passages.py                  # Build for all translations
+    python3 build_parallel_passages.py --show "Mk 1,40" [--translation neue]
+"""
+
+import argparse
+import json
+import time
+import zlib
+from collections import Counter, defaultdict
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from bible_corpus import available_translations, generated_path, iter_verses, normalize_term, plain_text, tokenize, write_json
+from bible_reference import parse_references
+
+NUM_HASHES = 128
+BANDS = 64
+ROWS = NUM_HASHES // BANDS
+SHINGLE_SIZE = 2
+STOPWORD_SHARE = 0.05
+MIN_SIMILARITY = 0.15
+MIN_SHINGLES = 5
+
+# Universal hashing h(x) = (a x + b) mod p with a Mersenne prime; products stay below 2^64
+_PRIME = (1 << 31) - 1
+
+
+def collect_pericopes(translation_id: str) -> Tuple[List[Dict], List[List[str]]]:
+    """Cut a translation at its headings. Returns pericope records and their token lists."""
+    verses = list(iter_verses(translation_id))
+    df = Counter()
+    tokens_per_verse = []
+    for verse in verses:
+        tokens = [normalize_term(word) for word in tokenize(plain_text(verse['text']))]
+        tokens_per_verse.append(tokens)
+        df.update(set(tokens))
+    stopwords = {term for term, count in df.items() if count > STOPWORD_SHARE * len(verses)}
+
+    pericopes: List[Dict] = []
+    tokens: List[List[str]] = []
+    for verse, verse_tokens in zip(verses, tokens_per_verse):
+        new_book = not pericopes or pericopes[-1]['book'] != verse['bookId']
+        if new_book or verse['heading']:
+            pericopes.append({
+                'book': verse['bookId'],
+                'start': [verse['chapter'], verse['verse']],
+                'heading': verse['heading'] or '',
+                'synopsis': set(),
+            })
+            tokens.append([])
+        pericopes[-1]['end'] = [verse['chapter'], verse['verse']]
+        pericopes[-1]['synopsis'].update(verse.get('synopsis') or [])
+        tokens[-1].extend(t for t in verse_tokens if t not in stopwords)
+    return pericopes, tokens
+
+
+def shingles(tokens: List[str]) -> Set[int]:
+    return {
+        zlib.crc32(' '.join(tokens[i:i + SHINGLE_SIZE]).encode('utf-8')) % _PRIME
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signatures(shingle_sets: List[Set[int]], seed: int = 0) -> np.ndarray:
+    """[pericopes × NUM_HASHES] minimum hash values (empty sets get the maximum)."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, NUM_HASHES, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, NUM_HASHES, dtype=np.uint64)
+    signatures = np.full((len(shingle_sets), NUM_HASHES), _PRIME, dtype=np.uint64)
+    for i, values in enumerate(shingle_sets):
+        if values:
+            x = np.fromiter(values, dtype=np.uint64, count=len(values))[:, None]
+            signatures[i] = ((x * a + b) % _PRIME).min(axis=0)
+    return signatures
+
+
+def candidate_pairs(signatures: np.ndarray, eligible: np.ndarray) -> Set[Tuple[int, int]]:
+    """Pairs that share at least one band."""
+    pairs = set()
+    for band in range(BANDS):
+        buckets = defaultdict(list)
+        block = signatures[:, band * ROWS:(band + 1) * ROWS]
+        for i in np.flatnonzero(eligible).tolist():
+            buckets[block[i].tobytes()].append(i)
+        for members in buckets.values():
+            if 1 < len(members) < 50:   # huge buckets are formulaic text, not parallels
+                for x in range(len(members)):
+                    for y in range(x + 1, len(members)):
+                        pairs.add((members[x], members[y]))
+    return pairs
+
+
+def find_parallels(translation_id: str) -> Dict:
+    pericopes, tokens = collect_pericopes(translation_id)
+    shingle_sets = [shingles(t) for t in tokens]
+    eligible = np.array([len(s) >= MIN_SHINGLES for s in shingle_sets])
+    signatures = minhash_signatures(shingle_sets)
+
+    scores: Dict[Tuple[int, int], float] = {}
+    candidates = candidate_pairs(signatures, eligible)
+    for i, j in candidates:
+        if pericopes[i]['book'] == pericopes[j]['book']:
+            continue
+        similarity = len(shingle_sets[i] & shingle_sets[j]) / len(shingle_sets[i] | shingle_sets[j])
+        if similarity >= MIN_SIMILARITY:
+            scores[(i, j)] = round(similarity, 3)
+
+    by_synopsis = defaultdict(list)
+    for i, pericope in enumerate(pericopes):
+        for number in pericope['synopsis']:
+            by_synopsis[number].append(i)
+    for members in by_synopsis.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                if pericopes[members[x]]['book'] != pericopes[members[y]]['book']:
+                    scores[(members[x], members[y])] = 1.0
+
+    parallels = defaultdict(list)
+    for (i, j), similarity in sorted(scores.items(), key=lambda item: -item[1]):
+        parallels[i].append(j)
+        parallels[j].append(i)
+
+    return {
+        'pericopes': {
+            'books': [p['book'] for p in pericopes],
+            'starts': [p['start'] for p in pericopes],
+            'ends': [p['end'] for p in pericopes],
+            'headings': [p['heading'] for p in pericopes],
+        },
+        'pairs': [[i, j, s] for (i, j), s in sorted(scores.items())],
+        'parallels': {str(i): parallels[i] for i in sorted(parallels)},
+        'candidates': len(candidates),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect parallel passages")
+    parser.add_argument("--show", metavar="REFERENCE")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    args = parser.parse_args()
+
+    if args.show:
+        with open(generated_path(args.translation, "parallels.json"), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        p = data['pericopes']
+        similarity = {(i, j): s for i, j, s in data['pairs']}
+        similarity.update({(j, i): s for (i, j), s in list(similarity.items())})
+
+        def describe(i):
+            return f"{p['books'][i]} {p['starts'][i][0]},{p['starts'][i][1]}-{p['ends'][i][0]},{p['ends'][i][1]} {p['headings'][i]}"
+
+        for ref in parse_references(args.show):
+            position = (ref.start_chapter, ref.start_verse or 1)
+            for i, book in enumerate(p['books']):
+                if book == ref.book and tuple(p['starts'][i]) <= position <= tuple(p['ends'][i]):
+                    print(describe(i))
+                    for j in data['parallels'].get(str(i), []):
+                        print(f"  {similarity[(i, j)]:.2f}  {describe(j)}")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        data = find_parallels(translation_id)
+        candidates = data.pop('candidates')
+        write_json(generated_path(translation_id, "parallels.json"), data)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {len(data['pericopes']['books'])} pericopes, {candidates} candidate pairs, "
+              f"{len(data['pairs'])} parallels in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Generate reading plans with an even daily reading load.
+
+Partitions the chapters of a book range into a fixed number of days so that
+every day has close to the same number of words. The partition is an exact
+dynamic program over the chapter word counts from build_corpus_stats.py
+(minimising the squared deviation of each day from the average load), and the
+result is written as a static ReadingPlan JSON (see lib/types.ts) to
+public/generated/<translation>/plans/.
+
+Usage:
+    python3 build_reading_plans.py                       # Default plans for all translations
+    python3 build_reading_plans.py neue matthew revelation 90
+    python3 build_reading_plans.py einheitsuebersetzung genesis malachi 180 --id at-180 --name "AT in 180 Tagen"
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from bible_corpus import available_translations, generated_path, load_book_catalog, write_json
+from build_corpus_stats import compute_stats
+
+# Default plans: (id, name, description, first book, last book, days)
+DEFAULT_PLANS = [
+    ("bibel-1-jahr", "Bibel in einem Jahr", "Lies die gesamte Bibel in 365 Tagen", "genesis", "revelation", 365),
+    ("nt-90-tage", "Neues Testament", "Lies das Neue Testament in 90 Tagen", "matthew", "revelation", 90),
+    ("evangelien-30-tage", "Die Evangelien", "Lies die vier Evangelien in 30 Tagen", "matthew", "john", 30),
+    ("psalmen-30-tage", "Psalmen", "Lies die Psalmen in 30 Tagen", "psalms", "psalms", 30),
+]
+
+
+def load_stats(translation_id: str) -> Dict:
+    """Read the precomputed stats table, computing it on the fly if missing."""
+    path = generated_path(translation_id, "stats.json")
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return compute_stats(translation_id)
+
+
+def chapter_range(stats: Dict, first_book: str, last_book: str) -> Tuple[List[Tuple[str, int]], np.ndarray]:
+    """Chapters and their word counts from first_book to last_book (inclusive, canonical order)."""
+    order = [b['id'] for b in load_book_catalog()]
+    for book_id in (first_book, last_book):
+        if book_id not in order:
+            raise ValueError(f"Unknown book ID '{book_id}'")
+    start, end = order.index(first_book), order.index(last_book)
+    if start > end:
+        raise ValueError(f"'{first_book}' comes after '{last_book}'")
+
+    chapters = []
+    weights = []
+    for book_id in order[start:end + 1]:
+        book = stats['books'].get(book_id)
+        if not book:
+            continue
+        chapters.extend((book_id, number) for number in book['chapters']['number'])
+        weights.extend(book['chapters']['words'])
+    return chapters, np.asarray(weights, dtype=np.float64)
+
+
+def balanced_partition(weights: np.ndarray, days: int) -> List[int]:
+    """
+    Split weights into `days` contiguous non-empty groups with near-equal sums.
+
+    Minimises sum((day_load - average)^2) exactly with a DP over prefix sums:
+    cost[k][j] = min_i cost[k-1][i] + (P[j] - P[i] - avg)^2. Each layer is
+    evaluated as one vectorised n x n matrix. Returns the start index of
+    every group.
+    """
+    n = len(weights)
+    if days < 1 or days > n:
+        raise ValueError(f"Cannot split {n} chapters into {days} days")
+
+    prefix = np.concatenate(([0.0], np.cumsum(weights)))
+    target = prefix[-1] / days
+    # seg[i, j] = cost of one day reading chapters i..j-1
+    seg = (prefix[None, :] - prefix[:, None] - target) ** 2
+    seg[np.tril_indices(n + 1)] = np.inf
+
+    cost = seg[0].copy()
+    back = np.zeros((days, n + 1), dtype=np.int32)
+    for k in range(1, days):
+        total = cost[:, None] + seg
+        back[k] = np.argmin(total, axis=0)
+        cost = total[back[k], np.arange(n + 1)]
+
+    starts = []
+    j = n
+    for k in range(days - 1, 0, -1):
+        j = int(back[k][j])
+        starts.append(j)
+    starts.append(0)
+    return starts[::-1]
+
+
+def build_plan(translation_id: str, plan_id: str, name: str, description: str,
+               first_book: str, last_book: str, days: int) -> Dict:
+    """Build a ReadingPlan dict for a book range and number of days."""
+    stats = load_stats(translation_id)
+    chapters, weights = chapter_range(stats, first_book, last_book)
+    starts = balanced_partition(weights, days)
+    ends = starts[1:] + [len(chapters)]
+
+    readings = []
+    for day, (s, e) in enumerate(zip(starts, ends), start=1):
+        passages = []
+        for book_id, number in chapters[s:e]:
+            if passages and passages[-1]['bookId'] == book_id:
+                passages[-1]['endChapter'] = number
+            else:
+                passages.append({'bookId': book_id, 'startChapter': number})
+        readings.append({
+            'day': day,
+            'words': int(weights[s:e].sum()),
+            'passages': passages,
+        })
+
+    return {
+        'id': plan_id,
+        'name': name,
+        'description': description,
+        'totalDays': days,
+        'readings': readings,
+    }
+
+
+def write_plan(translation_id: str, plan: Dict) -> str:
+    output_path = generated_path(translation_id, "plans", f"{plan['id']}.json")
+    write_json(output_path, plan)
+
+    loads = [r['words'] for r in plan['readings']]
+    print(f"✓ {plan['name']} ({translation_id}): {plan['totalDays']} days, "
+          f"{min(loads)}-{max(loads)} words/day")
+    return output_path
+
+
+def write_index(translation_id: str) -> None:
+    """List all generated plans of a translation in plans/index.json."""
+    plans_dir = generated_path(translation_id, "plans")
+    index = []
+    for filename in sorted(os.listdir(plans_dir)):
+        if not filename.endswith('.json') or filename == 'index.json':
+            continue
+        with open(os.path.join(plans_dir, filename), 'r', encoding='utf-8') as f:
+            plan = json.load(f)
+        index.append({k: plan[k] for k in ('id', 'name', 'description', 'totalDays')})
+    write_json(os.path.join(plans_dir, "index.json"), index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate balanced reading plans")
+    parser.add_argument("translation", nargs="?", help="Translation ID (default: all, with default plans)")
+    parser.add_argument("first_book", nargs="?")
+    parser.add_argument("last_book", nargs="?")
+    parser.add_argument("days", nargs="?", type=int)
+    parser.add_argument("--id", dest="plan_id")
+    parser.add_argument("--name")
+    parser.add_argument("--description", default="")
+    args = parser.parse_args()
+
+    translations = available_translations()
+
+    if args.translation is None:
+        for translation_id in translations:
+            for plan_id, name, description, first_book, last_book, days in DEFAULT_PLANS:
+                try:
+                    plan = build_plan(translation_id, plan_id, name, description, first_book, last_book, days)
+                except ValueError as e:
+                    print(f"- Skipping {plan_id} for {translation_id}: {e}")
+                    continue
+                write_plan(translation_id, plan)
+            write_index(translation_id)
+        return
+
+    if args.translation not in translations:
+        print(f"Error: Unknown or missing translation '{args.translation}'")
+        sys.exit(1)
+    if not (args.first_book and args.last_book and args.days):
+        parser.error("first_book, last_book and days are required")
+
+    plan_id = args.plan_id or f"{args.first_book}-{args.last_book}-{args.days}"
+    name = args.name or plan_id
+    try:
+        plan = build_plan(args.translation, plan_id, name, args.description,
+                          args.first_book, args.last_book, args.days)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    output_path = write_plan(args.translation, plan)
+    write_index(args.translation)
+    print(f"  Written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
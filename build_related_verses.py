@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Precompute the related verses of every verse (top-k TF-IDF cosine neighbors).
+
+Verse vectors are sublinear TF-IDF weights over the verse × term matrix of
+build_term_stats.py, L2-normalized; terms occurring in more than
+MAX_DF_SHARE of all verses ("und", "der", ...) are dropped, they only add
+noise and fill the similarity matrix. Split verses (Gen 2,4a/4b) are merged
+into one vector.
+
+Similarities are computed in row blocks of BLOCK_SIZE verses (one sparse
+product against the whole matrix per block, densified for that block only),
+so the full verses × verses matrix never exists. Blocks are distributed over
+all CPU cores.
+
+Rows are linear verse addresses (bible_reference.VerseAddressing: prefix sums
+over the manifest's verse counts), so the neighbors of a verse are one array
+lookup. Output in public/generated/<translation>/related/:
+
+    neighbors.bin   uint32 [rows × k], linear addresses, NO_NEIGHBOR if empty
+    scores.bin      float16 [rows × k], cosine similarity
+    meta.json       {"k": 10, "rows": n}
+
+Usage:
+    python3 build_related_verses.py                    # Build for all translations
+    python3 build_related_verses.py --show "Joh 3,16" [--translation neue]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from bible_corpus import available_translations, generated_path, split_verse_id, write_json
+from bible_reference import VerseAddressing, parse_references
+from build_term_stats import build_term_matrix
+from safe_io import write_bytes_atomic
+
+TOP_K = 10
+BLOCK_SIZE = 512
+MAX_DF_SHARE = 0.05
+NO_NEIGHBOR = 0xFFFFFFFF
+
+_vectors: Optional[sparse.csr_matrix] = None
+_vectors_t: Optional[sparse.csc_matrix] = None
+
+
+class TfidfModel(NamedTuple):
+    vectors: sparse.csr_matrix   # L2-normalized, one row per linear verse address
+    terms: List[str]
+    idf: np.ndarray
+
+
+def tfidf_vectors(translation_id: str, addressing: VerseAddressing) -> TfidfModel:
+    """TF-IDF rows, one per linear verse address."""
+    matrix = build_term_matrix(translation_id)
+    counts = matrix.counts
+
+    # Merge split verse records into their verse address
+    addresses = np.empty(counts.shape[0], dtype=np.int64)
+    for row, (book_id, vid) in enumerate(zip(matrix.book_ids, matrix.verse_ids.tolist())):
+        _, chapter, verse = split_verse_id(vid)
+        addresses[row] = addressing.address(book_id, chapter, verse)
+    merge = sparse.csr_matrix(
+        (np.ones(len(addresses), dtype=np.int32), (addresses, np.arange(len(addresses)))),
+        shape=(addressing.total, counts.shape[0]),
+    )
+    counts = (merge @ counts).tocsr()
+
+    df = np.diff(counts.tocsc().indptr)
+    verses = np.count_nonzero(np.diff(counts.indptr))
+    keep = np.flatnonzero((df > 0) & (df <= MAX_DF_SHARE * verses))
+    counts = counts[:, keep].tocsr().astype(np.float32)
+
+    counts.data = 1.0 + np.log(counts.data)
+    idf = np.log(verses / df[keep]).astype(np.float32)
+    vectors = (counts @ sparse.diags(idf)).tocsr()
+    norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    vectors = (sparse.diags(1.0 / norms) @ vectors).tocsr().astype(np.float32)
+    return TfidfModel(vectors, [matrix.terms[i] for i in keep], idf)
+
+
+def _init_worker(vectors: sparse.csr_matrix) -> None:
+    global _vectors, _vectors_t
+    _vectors = vectors
+    _vectors_t = vectors.T.tocsc()
+
+
+def _block_neighbors(start: int) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Top-k neighbors of rows start .. start + BLOCK_SIZE."""
+    end = min(start + BLOCK_SIZE, _vectors.shape[0])
+    similarity = (_vectors[start:end] @ _vectors_t).toarray()
+    rows = np.arange(end - start)
+    similarity[rows, rows + start] = 0.0   # not its own neighbor
+
+    top = np.argpartition(-similarity, TOP_K, axis=1)[:, :TOP_K]
+    top_scores = np.take_along_axis(similarity, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    top = np.take_along_axis(top, order, axis=1).astype(np.uint32)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+    top[top_scores <= 0] = NO_NEIGHBOR
+    return start, top, top_scores.astype(np.float16)
+
+
+def compute_neighbors(vectors: sparse.csr_matrix, workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    rows = vectors.shape[0]
+    neighbors = np.full((rows, TOP_K), NO_NEIGHBOR, dtype=np.uint32)
+    scores = np.zeros((rows, TOP_K), dtype=np.float16)
+    starts = range(0, rows, BLOCK_SIZE)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(vectors)
+        results = map(_block_neighbors, starts)
+    else:
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(vectors,))
+        results = executor.map(_block_neighbors, starts)
+
+    for start, top, top_scores in results:
+        neighbors[start:start + len(top)] = top
+        scores[start:start + len(top)] = top_scores
+
+    if workers != 1:
+        executor.shutdown()
+    return neighbors, scores
+
+
+def build_related(translation_id: str, workers: Optional[int] = None) -> Dict[str, int]:
+    """Build and write the neighbor table of one translation."""
+    addressing = VerseAddressing(translation_id)
+    vectors = tfidf_vectors(translation_id, addressing).vectors
+    neighbors, scores = compute_neighbors(vectors, workers)
+
+    out_dir = generated_path(translation_id, "related")
+    write_bytes_atomic(os.path.join(out_dir, "neighbors.bin"), neighbors.astype('<u4').tobytes())
+    write_bytes_atomic(os.path.join(out_dir, "scores.bin"), scores.astype('<f2').tobytes())
+    write_json(os.path.join(out_dir, "meta.json"), {'k': TOP_K, 'rows': int(neighbors.shape[0])})
+    return {'rows': int(neighbors.shape[0]), 'terms': int(vectors.shape[1])}
+
+
+def load_related(translation_id: str) -> Tuple[np.ndarray, np.ndarray]:
+    base = generated_path(translation_id, "related")
+    with open(os.path.join(base, "meta.json"), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    shape = (meta['rows'], meta['k'])
+    neighbors = np.memmap(os.path.join(base, "neighbors.bin"), dtype='<u4', mode='r', shape=shape)
+    scores = np.memmap(os.path.join(base, "scores.bin"), dtype='<f2', mode='r', shape=shape)
+    return neighbors, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the related-verses table")
+    parser.add_argument("--show", metavar="REFERENCE")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    if args.show:
+        addressing = VerseAddressing(args.translation)
+        neighbors, scores = load_related(args.translation)
+        for ref in parse_references(args.show):
+            for book, chapter, verse in addressing.expand(ref):
+                row = addressing.address(book, chapter, verse)
+                print(f"{book} {chapter},{verse}:")
+                for neighbor, score in zip(neighbors[row].tolist(), scores[row].tolist()):
+                    if neighbor != NO_NEIGHBOR:
+                        n_book, n_chapter, n_verse = addressing.locate(neighbor)
+                        print(f"  {score:.2f}  {n_book} {n_chapter},{n_verse}")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        counts = build_related(translation_id, args.workers)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {TOP_K} neighbors for {counts['rows']} verses "
+              f"({counts['terms']} terms) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
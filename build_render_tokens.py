@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Precompute render-ready tokens for every verse, so VerseText.tsx does no
+string processing at render time.
+
+Per verse the text is cut into segments:
+
+    "text"           a run of text
+    0, 1, ...        footnote marker for footnotes[n] (the n-th "*" in the
+                     text; verses with footnotes but no "*" get their markers
+                     at the end, as VerseText.tsx does)
+    -1 (LINE_BREAK)  poetry line break (" / " in the source text)
+
+`quotes` lists [start, end) character offsets of quotation spans („…“, «…»,
+»…«, ‚…‘) counted over the text runs only; a quote opened in an earlier verse
+starts at 0, one continuing into the next verse ends at the verse end.
+Headings are pre-split on " | " into `heading`.
+
+Output per book: public/generated/<translation>/render/<bookId>.json
+
+    {"chapters": [{"number": 1, "verses": [{"segments": [...], "quotes": [...],
+                                            "heading": [...]}, ...]}, ...]}
+
+scrape_neue.py and convert_numbers_to_ts.py write this file for every book
+they generate; this script rebuilds it for the whole data tree.
+
+Usage:
+    python3 build_render_tokens.py            # All translations
+    python3 build_render_tokens.py neue       # One translation
+"""
+
+import sys
+import time
+from typing import Dict, List, Optional, Union
+
+from bible_corpus import available_translations, generated_path, iter_books, write_json
+
+LINE_BREAK = -1
+LINE_SEPARATOR = " / "
+HEADING_SEPARATOR = " | "
+FOOTNOTE_MARKER = "*"
+QUOTE_PAIRS = {'„': '“', '«': '»', '»': '«', '‚': '‘'}
+
+Segment = Union[str, int]
+
+
+def verse_segments(text: str, footnotes: Optional[List[str]]) -> List[Segment]:
+    footnote_count = len(footnotes or [])
+    segments: List[Segment] = []
+    marker = 0
+
+    for line_index, line in enumerate(text.split(LINE_SEPARATOR)):
+        if line_index:
+            segments.append(LINE_BREAK)
+        run = []
+        for ch in line:
+            if ch == FOOTNOTE_MARKER and marker < footnote_count:
+                if run:
+                    segments.append(''.join(run))
+                    run = []
+                segments.append(marker)
+                marker += 1
+            else:
+                run.append(ch)
+        if run:
+            segments.append(''.join(run))
+
+    if marker == 0:
+        segments.extend(range(footnote_count))
+    return segments
+
+
+def quote_spans(segments: List[Segment]) -> List[List[int]]:
+    spans = []
+    expected: List[str] = []   # closing characters of open quotes
+    starts: List[int] = []
+    offset = 0
+    for segment in segments:
+        if not isinstance(segment, str):
+            continue
+        for ch in segment:
+            if expected and ch == expected[-1]:
+                expected.pop()
+                spans.append([starts.pop(), offset + 1])
+            elif ch in QUOTE_PAIRS:
+                expected.append(QUOTE_PAIRS[ch])
+                starts.append(offset)
+            elif ch in QUOTE_PAIRS.values():
+                spans.append([0, offset + 1])   # opened in an earlier verse
+            offset += 1
+    spans.extend([start, offset] for start in starts)
+    return sorted(spans)
+
+
+def verse_tokens(verse: Dict) -> Dict:
+    segments = verse_segments(verse.get('text', ''), verse.get('footnotes'))
+    tokens: Dict = {'segments': segments}
+    quotes = quote_spans(segments)
+    if quotes:
+        tokens['quotes'] = quotes
+    if verse.get('heading'):
+        tokens['heading'] = [part.strip() for part in verse['heading'].split(HEADING_SEPARATOR)]
+    return tokens
+
+
+def book_tokens(book: Dict) -> Dict:
+    return {
+        'chapters': [
+            {'number': chapter['number'], 'verses': [verse_tokens(v) for v in chapter['verses']]}
+            for chapter in book['chapters']
+        ]
+    }
+
+
+def write_book_tokens(book: Dict, path: str) -> bool:
+    """Write the render tokens of a book; returns True if the file changed."""
+    return write_json(path, book_tokens(book))
+
+
+def main():
+    selected = sys.argv[1:] or list(available_translations())
+    for translation_id in selected:
+        start = time.perf_counter()
+        books = changed = 0
+        for meta, book in iter_books(translation_id):
+            books += 1
+            changed += write_book_tokens(book, generated_path(translation_id, "render", f"{meta['id']}.json"))
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {books} books ({changed} changed) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Semantic verse search via latent semantic analysis (truncated SVD).
+
+The TF-IDF verse × term matrix of build_related_verses.py is factorized with
+a truncated SVD, X ≈ U S Vᵀ, keeping DIMENSIONS components. Verses are
+embedded as rows of X V (= U S), queries are folded in the same way (q V),
+and both are compared by cosine similarity. Verses that share no word with
+the query still match when their words co-occur with the query's words
+elsewhere ("Vergebung der Schuld" -> "Sünden erlassen").
+
+Output in public/generated/<translation>/semantic/ (raw little-endian arrays
+that can be memory-mapped):
+
+    embeddings.bin  float16 [verse addresses × DIMENSIONS], L2-normalized
+    projection.bin  float16 [terms × DIMENSIONS], V
+    terms.json      {"dimensions": n, "terms": [...], "idf": [...]}
+
+Rows are linear verse addresses as in build_related_verses.py.
+
+Usage:
+    python3 build_semantic_index.py                     # Build for all translations
+    python3 build_semantic_index.py --query "Vergebung der Schuld" [--translation neue]
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy.sparse.linalg import svds
+
+from bible_corpus import available_translations, generated_path, normalize_term, tokenize, write_json
+from bible_reference import VerseAddressing
+from build_related_verses import tfidf_vectors
+from safe_io import write_bytes_atomic
+
+DIMENSIONS = 200
+# Rows widened to float32 at a time when scoring (float16 has no BLAS kernels)
+SCORE_BLOCK = 4096
+
+
+def build_index(translation_id: str) -> Dict[str, int]:
+    """Factorize the TF-IDF matrix of one translation and write the embeddings."""
+    addressing = VerseAddressing(translation_id)
+    model = tfidf_vectors(translation_id, addressing)
+
+    _, singular_values, vt = svds(model.vectors, k=DIMENSIONS, random_state=0)
+    order = np.argsort(-singular_values)   # svds returns ascending order
+    projection = vt[order].T.astype(np.float32)
+
+    embeddings = np.asarray(model.vectors @ projection, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    embeddings /= norms
+
+    out_dir = generated_path(translation_id, "semantic")
+    write_bytes_atomic(os.path.join(out_dir, "embeddings.bin"), embeddings.astype('<f2').tobytes())
+    write_bytes_atomic(os.path.join(out_dir, "projection.bin"), projection.astype('<f2').tobytes())
+    write_json(os.path.join(out_dir, "terms.json"), {
+        'dimensions': DIMENSIONS,
+        'terms': model.terms,
+        'idf': np.round(model.idf, 4).tolist(),
+    })
+    return {'verses': embeddings.shape[0], 'terms': len(model.terms)}
+
+
+class SemanticIndex:
+    """Memory-mapped LSA index of one translation."""
+
+    def __init__(self, translation_id: str):
+        base = generated_path(translation_id, "semantic")
+        with open(os.path.join(base, "terms.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        dimensions = meta['dimensions']
+        self.term_index = {term: i for i, term in enumerate(meta['terms'])}
+        self.idf = np.asarray(meta['idf'], dtype=np.float32)
+        self.projection = np.memmap(os.path.join(base, "projection.bin"), dtype='<f2', mode='r').reshape(-1, dimensions)
+        # Stays memory-mapped; search() widens one block of rows at a time
+        embeddings = np.memmap(os.path.join(base, "embeddings.bin"), dtype='<f2', mode='r')
+        self.embeddings = embeddings.reshape(-1, dimensions)
+        self.addressing = VerseAddressing(translation_id)
+
+    def embed(self, query: str) -> np.ndarray:
+        counts = Counter(self.term_index[t] for t in map(normalize_term, tokenize(query)) if t in self.term_index)
+        vector = np.zeros(self.projection.shape[1], dtype=np.float32)
+        for i, count in counts.items():
+            vector += (1.0 + np.log(count)) * self.idf[i] * self.projection[i].astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Tuple[str, int, int], float]]:
+        """Return [((book, chapter, verse), similarity)] of the best matching verses."""
+        vector = self.embed(query)
+        if not vector.any():
+            return []
+        scores = np.empty(self.embeddings.shape[0], dtype=np.float32)
+        for start in range(0, len(scores), SCORE_BLOCK):
+            block = self.embeddings[start:start + SCORE_BLOCK]
+            scores[start:start + len(block)] = block.astype(np.float32) @ vector
+        top = np.argpartition(-scores, limit)[:limit]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.addressing.locate(int(row)), float(scores[row])) for row in top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the LSA semantic index")
+    parser.add_argument("--query", nargs="+")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.query:
+        index = SemanticIndex(args.translation)
+        for query in args.query:
+            start = time.perf_counter()
+            results = index.search(query, args.limit)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{query}  [{elapsed:.1f} ms]")
+            for (book, chapter, verse), score in results:
+                print(f"  {score:.2f}  {book} {chapter},{verse}")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        counts = build_index(translation_id)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {counts['verses']} verses × {DIMENSIONS} dimensions "
+              f"({counts['terms']} terms) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
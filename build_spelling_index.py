@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Spelling suggestions ("Meinten Sie …") with a SymSpell deletion dictionary.
+
+Build step: the vocabulary of a translation (case-folded words from verse
+texts and headings, with frequencies) is expanded into all strings reachable
+by deleting up to MAX_DISTANCE characters from each term's first
+PREFIX_LENGTH characters. Every (delete, term) pair is stored as a CRC32 of
+the delete string plus the term index, sharded by the first character of
+the delete string, in public/generated/<translation>/spelling/:
+
+    vocabulary.json      {"terms": [...], "counts": [...], "indexType": "u2"|"u4"}
+                         (most frequent first)
+    deletes/<shard>.bin  uint32 crc32(delete) [n], then term index [n] as
+                         indexType, little-endian, sorted by hash; <shard> is
+                         the hex code point of the first character ("-" for
+                         the empty string)
+
+Lookup generates the (few dozen) deletes of the query, finds their hashes
+with a binary search and verifies the candidate terms with a real edit
+distance, so hash collisions never produce wrong suggestions. No edit
+distance against the whole vocabulary is computed at query time. The
+deletes of a word start with one of its first MAX_DISTANCE + 1 characters,
+so a lookup reads at most three shards instead of the whole table (EÜ:
+largest shard about 0.5 MB of 4.2 MB).
+
+Usage:
+    python3 build_spelling_index.py                     # Build for all translations
+    python3 build_spelling_index.py --suggest Nebukadnezzar Habakuk [--translation neue]
+"""
+
+import argparse
+import json
+import os
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from bible_corpus import (
+    available_translations,
+    generated_path,
+    iter_verses,
+    normalize_term,
+    plain_text,
+    tokenize,
+    write_json,
+)
+from safe_io import remove_stale, write_bytes_atomic
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+
+def deletes(term: str, max_distance: int = MAX_DISTANCE) -> Set[str]:
+    """All strings obtained by deleting up to max_distance characters (term included)."""
+    result = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for word in frontier:
+            for i in range(len(word)):
+                next_frontier.add(word[:i] + word[i + 1:])
+        next_frontier -= result
+        result |= next_frontier
+        frontier = next_frontier
+    return result
+
+
+def shard_name(delete: str) -> str:
+    return f"{ord(delete[0]):x}" if delete else "-"
+
+
+def string_hash(text: str) -> int:
+    return zlib.crc32(text.encode('utf-8'))
+
+
+def edit_distance(a: str, b: str, limit: int = MAX_DISTANCE) -> int:
+    """Optimal string alignment distance (adjacent transpositions count 1), capped at limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev_prev = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev_prev[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev_prev, prev = prev, cur
+    return prev[-1]
+
+
+def build_vocabulary(translation_id: str) -> Counter:
+    counts = Counter()
+    for verse in iter_verses(translation_id):
+        text = plain_text(verse['text'])
+        if verse['heading']:
+            text += ' ' + verse['heading']
+        counts.update(normalize_term(word) for word in tokenize(text))
+    return counts
+
+
+def build_index(translation_id: str) -> Dict[str, int]:
+    """Build and write vocabulary and deletion dictionary of one translation."""
+    counts = build_vocabulary(translation_id)
+    terms = [term for term, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+
+    shards: Dict[str, List[Tuple[int, int]]] = {}
+    for index, term in enumerate(terms):
+        for delete in deletes(term[:PREFIX_LENGTH]):
+            shards.setdefault(shard_name(delete), []).append((string_hash(delete), index))
+
+    index_type = 'u2' if len(terms) <= 1 << 16 else 'u4'
+    out_dir = generated_path(translation_id, "spelling")
+    written = [os.path.join(out_dir, "vocabulary.json")]
+    write_json(written[0], {
+        'terms': terms,
+        'counts': [counts[term] for term in terms],
+        'indexType': index_type,
+    })
+    pairs = size = 0
+    for name, shard in shards.items():
+        table = np.unique(np.asarray(shard, dtype=np.uint32), axis=0)  # sorted by hash, then term
+        data = table[:, 0].astype('<u4').tobytes() + table[:, 1].astype('<' + index_type).tobytes()
+        written.append(os.path.join(out_dir, "deletes", f"{name}.bin"))
+        write_bytes_atomic(written[-1], data)
+        pairs += len(table)
+        size += len(data)
+    remove_stale(out_dir, written)
+
+    return {'terms': len(terms), 'deletes': pairs, 'shards': len(shards), 'bytes': size}
+
+
+class SpellingIndex:
+    """Loaded deletion dictionary of one translation."""
+
+    def __init__(self, translation_id: str):
+        base = generated_path(translation_id, "spelling")
+        with open(os.path.join(base, "vocabulary.json"), 'r', encoding='utf-8') as f:
+            vocabulary = json.load(f)
+        self.terms: List[str] = vocabulary['terms']
+        self.counts: List[int] = vocabulary['counts']
+        self.term_index = {term: i for i, term in enumerate(self.terms)}
+        self.index_type = '<' + vocabulary['indexType']
+        self.shard_dir = os.path.join(base, "deletes")
+        self.shards: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def shard(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(hashes, term indexes) of one shard, loaded on first use."""
+        if name not in self.shards:
+            path = os.path.join(self.shard_dir, f"{name}.bin")
+            data = np.fromfile(path, dtype=np.uint8) if os.path.exists(path) else np.zeros(0, dtype=np.uint8)
+            count = len(data) // (4 + np.dtype(self.index_type).itemsize)
+            self.shards[name] = (data[:4 * count].view('<u4'), data[4 * count:].view(self.index_type))
+        return self.shards[name]
+
+    def suggest(self, word: str, limit: int = 5, max_distance: int = MAX_DISTANCE) -> List[Tuple[str, int, int]]:
+        """Return [(term, distance, count)] ordered by distance, then frequency."""
+        query = normalize_term(word)
+        if query in self.term_index:
+            i = self.term_index[query]
+            return [(query, 0, self.counts[i])]
+
+        by_shard: Dict[str, List[int]] = {}
+        for delete in deletes(query[:PREFIX_LENGTH], max_distance):
+            by_shard.setdefault(shard_name(delete), []).append(string_hash(delete))
+        candidates = set()
+        for name, hashes in by_shard.items():
+            shard_hashes, targets = self.shard(name)
+            keys = np.asarray(hashes, dtype=np.uint32)
+            left = np.searchsorted(shard_hashes, keys, side='left')
+            right = np.searchsorted(shard_hashes, keys, side='right')
+            for lo, hi in zip(left.tolist(), right.tolist()):
+                candidates.update(targets[lo:hi].tolist())
+
+        results = []
+        for index in candidates:
+            term = self.terms[index]
+            distance = edit_distance(query, term, max_distance)
+            if distance <= max_distance:
+                results.append((term, distance, self.counts[index]))
+        results.sort(key=lambda r: (r[1], -r[2], r[0]))
+        return results[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the spelling suggestion index")
+    parser.add_argument("--suggest", nargs="+", metavar="WORD")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    args = parser.parse_args()
+
+    if args.suggest:
+        index = SpellingIndex(args.translation)
+        for word in args.suggest:
+            start = time.perf_counter()
+            suggestions = index.suggest(word)
+            elapsed = (time.perf_counter() - start) * 1e6
+            found = ", ".join(f"{term} ({distance}, {count}×)" for term, distance, count in suggestions)
+            print(f"{word}: {found or '-'}  [{elapsed:.0f} µs]")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        counts = build_index(translation_id)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {counts['terms']} terms, {counts['deletes']} deletes in {counts['shards']} "
+              f"shards ({counts['bytes'] / 1024 / 1024:.1f} MB) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
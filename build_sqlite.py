@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Build a SQLite database of the whole corpus with FTS5 full-text search.
+
+Streams every available translation into public/generated/bibel.sqlite:
+
+    translations(id, ordinal, folder)
+    books(translation_id, book_id, book_index, name, short_name, testament, introduction)
+    chapters(translation_id, book_id, chapter, verse_count)
+    verses(id, translation_id, book_id, chapter, verse, part, text, heading)
+    footnotes(verse_rowid, position, text)
+    verses_fts  -- FTS5 index over verses.text and verses.heading
+
+verses.id is translation_ordinal * 10^6 + the verse's position in the
+translation, so rowid order is reading order. A reference resolves to a
+rowid range through the unique (translation_id, book_id, chapter, verse,
+part) index, which covers that lookup (it carries the rowid); the verses are
+then read with one rowid range scan. `part` separates split verses that share
+a number (Gen 2,4a/4b). All rows are inserted with executemany() in one
+transaction.
+
+The FTS index keeps diacritics, so "Bär" and "Bar" stay different words.
+--search takes plain words; each is matched as a term (a trailing * makes
+it a prefix query), so FTS5 operators and quotes in the input are literal.
+
+Usage:
+    python3 build_sqlite.py                         # Build the database
+    python3 build_sqlite.py --search "Licht Finsternis" [--translation neue]
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from bible_corpus import available_translations, generated_path, iter_books
+from safe_io import atomic_path
+
+DB_PATH = generated_path(None, "bibel.sqlite")
+
+# Umlauts are distinct letters in German (Bar/Bär, schon/schön), so no
+# diacritics folding; 2/3-character prefixes are indexed for fast prefix
+# queries on German compounds.
+FTS_TOKENIZER = "unicode61 remove_diacritics 0"
+FTS_PREFIXES = "2 3"
+
+SCHEMA = f"""
+CREATE TABLE translations (
+    id TEXT PRIMARY KEY,
+    ordinal INTEGER NOT NULL,
+    folder TEXT NOT NULL
+);
+
+CREATE TABLE books (
+    translation_id TEXT NOT NULL,
+    book_id TEXT NOT NULL,
+    book_index INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    short_name TEXT NOT NULL,
+    testament TEXT NOT NULL,
+    introduction TEXT,
+    PRIMARY KEY (translation_id, book_id)
+) WITHOUT ROWID;
+
+CREATE TABLE chapters (
+    translation_id TEXT NOT NULL,
+    book_id TEXT NOT NULL,
+    chapter INTEGER NOT NULL,
+    verse_count INTEGER NOT NULL,
+    PRIMARY KEY (translation_id, book_id, chapter)
+) WITHOUT ROWID;
+
+CREATE TABLE verses (
+    id INTEGER PRIMARY KEY,
+    translation_id TEXT NOT NULL,
+    book_id TEXT NOT NULL,
+    chapter INTEGER NOT NULL,
+    verse INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    heading TEXT
+);
+
+CREATE TABLE footnotes (
+    verse_rowid INTEGER NOT NULL REFERENCES verses(id),
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (verse_rowid, position)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE verses_fts USING fts5(
+    text, heading,
+    content='verses', content_rowid='id',
+    tokenize='{FTS_TOKENIZER}', prefix='{FTS_PREFIXES}'
+);
+"""
+
+# Created after the bulk load, which is much faster than maintaining them row by row
+INDEXES = [
+    "CREATE UNIQUE INDEX verses_reference ON verses(translation_id, book_id, chapter, verse, part)",
+]
+
+_REFERENCE = "FROM verses WHERE translation_id = ? AND book_id = ? AND chapter = ? AND verse BETWEEN ? AND ?"
+PASSAGE_SQL = (
+    f"SELECT verse, text FROM verses WHERE id BETWEEN (SELECT min(id) {_REFERENCE}) "
+    f"AND (SELECT max(id) {_REFERENCE}) ORDER BY id"
+)
+
+
+def verse_rowid(ordinal: int, seq: int) -> int:
+    return ordinal * 1_000_000 + seq
+
+
+def corpus_rows(translations: Dict[str, str], footnotes: List[Tuple], books: List[Tuple],
+                chapters: List[Tuple]) -> Iterator[Tuple]:
+    """
+    Stream verse rows for all translations. Book, chapter and footnote rows are
+    collected into the given lists on the way (they are small).
+    """
+    for ordinal, translation_id in enumerate(translations, start=1):
+        seq = 0
+        for meta, book in iter_books(translation_id):
+            books.append((
+                translation_id, meta['id'], meta['index'], book.get('name', meta['name']),
+                book.get('shortName', meta['shortName']), meta['testament'], book.get('introduction') or None,
+            ))
+            for chapter in book['chapters']:
+                chapters.append((translation_id, meta['id'], chapter['number'], len(chapter['verses'])))
+                parts: Dict[int, int] = {}
+                for verse in chapter['verses']:
+                    part = parts.get(verse['number'], 0)
+                    parts[verse['number']] = part + 1
+                    rowid = verse_rowid(ordinal, seq)
+                    seq += 1
+                    for position, text in enumerate(verse.get('footnotes') or []):
+                        footnotes.append((rowid, position, text))
+                    yield (rowid, translation_id, meta['id'], chapter['number'], verse['number'], part,
+                           verse.get('text', ''), verse.get('heading') or None)
+
+
+def build_database(path: str) -> Dict[str, int]:
+    """Create the database at `path` (replaced atomically) and return row counts."""
+    translations = available_translations()
+
+    with atomic_path(path) as tmp_path:
+        conn = sqlite3.connect(tmp_path, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("PRAGMA page_size = 4096")
+            conn.executescript(SCHEMA)
+
+            footnotes, books, chapters = [], [], []
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO translations (id, ordinal, folder) VALUES (?, ?, ?)",
+                [(tid, i, folder) for i, (tid, folder) in enumerate(translations.items(), start=1)],
+            )
+            conn.executemany(
+                "INSERT INTO verses (id, translation_id, book_id, chapter, verse, part, text, heading) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                corpus_rows(translations, footnotes, books, chapters),
+            )
+            conn.executemany("INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?)", books)
+            conn.executemany("INSERT INTO chapters VALUES (?, ?, ?, ?)", chapters)
+            conn.executemany("INSERT INTO footnotes VALUES (?, ?, ?)", footnotes)
+            for statement in INDEXES:
+                conn.execute(statement)
+            conn.execute("INSERT INTO verses_fts (verses_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO verses_fts (verses_fts) VALUES ('optimize')")
+            conn.execute("COMMIT")
+            conn.execute("ANALYZE")
+            conn.execute("VACUUM")
+
+            counts = {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('books', 'chapters', 'verses', 'footnotes')
+            }
+        finally:
+            conn.close()
+
+    return counts
+
+
+def fts_query(query: str) -> str:
+    """
+    FTS5 query matching all words of `query`: every word becomes a quoted
+    string (prefix query with a trailing *), so no input is FTS5 syntax.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith('*') and len(word) > 1
+        word = word.rstrip('*') if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+def search(conn: sqlite3.Connection, query: str, translation_id: str = None, limit: int = 20) -> List[Tuple]:
+    """
+    Full-text search for all words of `query`; returns (translation, book,
+    chapter, verse, text) ranked by bm25.
+    """
+    query = fts_query(query)
+    if not query:
+        return []
+    sql = (
+        "SELECT v.translation_id, v.book_id, v.chapter, v.verse, v.text "
+        "FROM verses_fts JOIN verses v ON v.id = verses_fts.rowid "
+        "WHERE verses_fts MATCH ?"
+    )
+    params = [query]
+    if translation_id:
+        sql += " AND v.translation_id = ?"
+        params.append(translation_id)
+    sql += " ORDER BY bm25(verses_fts) LIMIT ?"
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+
+def passage(conn: sqlite3.Connection, translation_id: str, book_id: str, chapter: int,
+            first_verse: int = 1, last_verse: int = 999) -> List[Tuple]:
+    """Verses of one chapter range as (verse, text): rowid range from the reference index, then a range scan."""
+    reference = (translation_id, book_id, chapter, first_verse, last_verse)
+    return conn.execute(PASSAGE_SQL, reference + reference).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQLite/FTS5 corpus database")
+    parser.add_argument("--search", help="Run a full-text query against the existing database")
+    parser.add_argument("--translation", help="Restrict --search to one translation")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.search:
+        if not os.path.exists(DB_PATH):
+            print(f"Error: {DB_PATH} not found, build it first")
+            return
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+        start = time.perf_counter()
+        rows = search(conn, args.search, args.translation, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        for translation_id, book_id, chapter, verse, text in rows:
+            print(f"{translation_id} {book_id} {chapter},{verse}: {text}")
+        print(f"\n{len(rows)} results in {elapsed:.1f} ms")
+        return
+
+    start = time.perf_counter()
+    counts = build_database(DB_PATH)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(DB_PATH) / (1024 * 1024)
+    print(f"✓ {counts['books']} books, {counts['chapters']} chapters, {counts['verses']} verses, "
+          f"{counts['footnotes']} footnotes in {elapsed:.1f}s")
+    print(f"  Written to {DB_PATH} ({size:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
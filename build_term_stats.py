@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Build term statistics of every translation from a sparse verse × term matrix.
+
+One streaming pass over the verse records produces a SciPy CSR count matrix
+(rows: verse records in reading order, columns: case-folded terms). Everything
+else is derived from it with vectorized sparse operations:
+
+    frequencies.json   {"terms": [...], "counts": [...], "df": [...]}
+                       corpus frequency and document (verse) frequency,
+                       most frequent term first
+    books.json         {bookId: {"words": n, "terms": [...], "counts": [...],
+                       "ratios": [...]}} the BOOK_TERMS most characteristic
+                       terms per book (relative frequency in the book divided
+                       by the relative frequency in the whole translation)
+    collocations.json  {"terms": [...], "collocates": [[...]], "pmi": [[...]],
+                       "counts": [[...]]} the COLLOCATES partners per term with
+                       the highest pointwise mutual information of verse
+                       co-occurrence, log2(n(x,y) N / (df(x) df(y)))
+
+Files go to public/generated/<translation>/terms/. The matrix builder is
+reused by build_related_verses.py and build_semantic_index.py.
+
+Usage:
+    python3 build_term_stats.py                       # Build for all translations
+    python3 build_term_stats.py --collocates Licht Hirte [--translation neue]
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+from scipy import sparse
+
+from bible_corpus import available_translations, generated_path, iter_verses, normalize_term, plain_text, tokenize, write_json
+
+BOOK_TERMS = 50
+COLLOCATES = 10
+MIN_BOOK_COUNT = 3
+MIN_DF = 5
+MIN_PAIR_COUNT = 3
+
+
+class TermMatrix(NamedTuple):
+    counts: sparse.csr_matrix   # verse records × terms
+    terms: List[str]
+    verse_ids: np.ndarray       # BBCCCVVV id per row
+    book_ids: List[str]         # book id per row
+
+
+def build_term_matrix(translation_id: str) -> TermMatrix:
+    """Count the terms of every verse record in one pass."""
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    verse_ids: List[int] = []
+    book_ids: List[str] = []
+
+    for row, verse in enumerate(iter_verses(translation_id)):
+        for word in tokenize(plain_text(verse['text'])):
+            term = normalize_term(word)
+            col = vocabulary.get(term)
+            if col is None:
+                col = vocabulary[term] = len(vocabulary)
+            rows.append(row)
+            cols.append(col)
+        verse_ids.append(verse['id'])
+        book_ids.append(verse['bookId'])
+
+    data = np.ones(len(rows), dtype=np.int32)
+    counts = sparse.csr_matrix(
+        (data, (np.asarray(rows, dtype=np.int32), np.asarray(cols, dtype=np.int32))),
+        shape=(len(verse_ids), len(vocabulary)),
+    )
+    counts.sum_duplicates()
+    return TermMatrix(counts, list(vocabulary), np.asarray(verse_ids, dtype=np.int64), book_ids)
+
+
+def term_frequencies(matrix: TermMatrix) -> Dict:
+    counts = np.asarray(matrix.counts.sum(axis=0)).ravel()
+    df = np.diff(matrix.counts.tocsc().indptr)
+    order = np.lexsort((np.asarray(matrix.terms), -counts))
+    return {
+        'terms': [matrix.terms[i] for i in order],
+        'counts': counts[order].tolist(),
+        'df': df[order].tolist(),
+    }
+
+
+def book_profiles(matrix: TermMatrix) -> Dict:
+    """Characteristic terms per book from a book × term matrix (rows summed per book)."""
+    book_order = list(dict.fromkeys(matrix.book_ids))
+    book_index = {book_id: i for i, book_id in enumerate(book_order)}
+    rows = np.fromiter((book_index[b] for b in matrix.book_ids), dtype=np.int32, count=len(matrix.book_ids))
+    indicator = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, np.arange(len(rows)))),
+        shape=(len(book_order), len(rows)),
+    )
+    by_book = (indicator @ matrix.counts).tocsr()
+
+    corpus_counts = np.asarray(by_book.sum(axis=0)).ravel()
+    corpus_share = corpus_counts / corpus_counts.sum()
+    profiles = {}
+    for i, book_id in enumerate(book_order):
+        start, end = by_book.indptr[i], by_book.indptr[i + 1]
+        cols = by_book.indices[start:end]
+        values = by_book.data[start:end]
+        words = int(values.sum())
+        keep = values >= MIN_BOOK_COUNT
+        cols, values = cols[keep], values[keep]
+        ratios = (values / words) / corpus_share[cols]
+        top = np.lexsort((-values, -ratios))[:BOOK_TERMS]
+        profiles[book_id] = {
+            'words': words,
+            'terms': [matrix.terms[c] for c in cols[top]],
+            'counts': values[top].tolist(),
+            'ratios': np.round(ratios[top], 2).tolist(),
+        }
+    return profiles
+
+
+def collocations(matrix: TermMatrix) -> Dict:
+    """Top PMI partners per term, from verse co-occurrence of terms with df >= MIN_DF."""
+    presence = (matrix.counts > 0).astype(np.int32).tocsc()
+    df = np.diff(presence.indptr)
+    selected = np.flatnonzero(df >= MIN_DF)
+    presence = presence[:, selected].tocsr()
+    df = df[selected].astype(np.float64)
+    verses = presence.shape[0]
+
+    cooccurrence = (presence.T @ presence).tocsr()
+    cooccurrence.setdiag(0)
+    cooccurrence.eliminate_zeros()
+    cooccurrence.data[cooccurrence.data < MIN_PAIR_COUNT] = 0
+    cooccurrence.eliminate_zeros()
+
+    # PMI for all non-zero pairs at once
+    coo = cooccurrence.tocoo()
+    pmi = np.log2(coo.data * verses / (df[coo.row] * df[coo.col]))
+    scores = sparse.csr_matrix((pmi, (coo.row, coo.col)), shape=cooccurrence.shape)
+
+    terms, partners, values, pair_counts = [], [], [], []
+    for i in range(scores.shape[0]):
+        start, end = scores.indptr[i], scores.indptr[i + 1]
+        if start == end:
+            continue
+        cols = scores.indices[start:end]
+        row_scores = scores.data[start:end]
+        top = np.argsort(-row_scores, kind='stable')[:COLLOCATES]
+        terms.append(matrix.terms[selected[i]])
+        partners.append([matrix.terms[selected[c]] for c in cols[top]])
+        values.append(np.round(row_scores[top], 2).tolist())
+        pair_counts.append(np.asarray(cooccurrence[i, cols[top]].todense()).ravel().tolist())
+    return {'terms': terms, 'collocates': partners, 'pmi': values, 'counts': pair_counts}
+
+
+def build_stats(translation_id: str) -> Dict[str, int]:
+    """Build and write all term tables of one translation."""
+    matrix = build_term_matrix(translation_id)
+    out_dir = generated_path(translation_id, "terms")
+
+    frequencies = term_frequencies(matrix)
+    write_json(os.path.join(out_dir, "frequencies.json"), frequencies)
+    write_json(os.path.join(out_dir, "books.json"), book_profiles(matrix))
+    pairs = collocations(matrix)
+    write_json(os.path.join(out_dir, "collocations.json"), pairs)
+
+    return {
+        'verses': matrix.counts.shape[0],
+        'terms': len(matrix.terms),
+        'tokens': int(matrix.counts.sum()),
+        'collocation_terms': len(pairs['terms']),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build corpus term statistics")
+    parser.add_argument("--collocates", nargs="+", metavar="WORD", help="Show collocations from the built tables")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    args = parser.parse_args()
+
+    if args.collocates:
+        with open(generated_path(args.translation, "terms", "collocations.json"), 'r', encoding='utf-8') as f:
+            pairs = json.load(f)
+        index = {term: i for i, term in enumerate(pairs['terms'])}
+        for word in args.collocates:
+            i = index.get(normalize_term(word))
+            if i is None:
+                print(f"{word}: -")
+                continue
+            found = ", ".join(f"{t} ({p:.1f}, {c}×)" for t, p, c in
+                              zip(pairs['collocates'][i], pairs['pmi'][i], pairs['counts'][i]))
+            print(f"{word}: {found}")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        counts = build_stats(translation_id)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {counts['tokens']} tokens, {counts['terms']} terms in "
+              f"{counts['verses']} verses, collocations for {counts['collocation_terms']} terms in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Trigram index for regular-expression search over the corpus.
+
+Build step: every verse (lowercased plain text) is split into overlapping
+3-character windows and an inverted index trigram -> sorted verse positions
+is written to public/generated/<translation>/trigram/:
+
+    trigrams.json   {"trigram": [offset, count], ...}
+    postings.bin    little-endian uint32 verse positions, concatenated
+    verses.json     {"ids": [...], "texts": [...]}  (verse id and plain text per position)
+
+Query step (the approach of Google Code Search): the regex is parsed and a
+boolean query of trigrams that every match must contain is derived from it.
+The posting lists are intersected/united accordingly and the real regex
+only runs on the surviving candidate verses. Matching is case-insensitive.
+
+Usage:
+    python3 build_trigram_index.py                       # Build for all translations
+    python3 build_trigram_index.py --query "Licht[^.]*Finsternis" [--translation neue]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from itertools import product
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from bible_corpus import available_translations, generated_path, iter_verses, plain_text, write_json
+from safe_io import write_bytes_atomic
+
+# Largest character class or exact-string set tracked before giving up on it
+MAX_SET = 16
+# Upper bound for repetitions expanded into exact strings
+MAX_EXACT_REPEAT = 3
+
+
+def trigrams_of(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# --- Build ---------------------------------------------------------------
+
+def build_index(translation_id: str) -> Dict[str, int]:
+    """Build and write the trigram index of one translation."""
+    postings: Dict[str, List[int]] = defaultdict(list)
+    ids = []
+    texts = []
+
+    for seq, verse in enumerate(iter_verses(translation_id)):
+        text = plain_text(verse['text'])
+        ids.append(verse['id'])
+        texts.append(text)
+        for trigram in trigrams_of(text.lower()):
+            postings[trigram].append(seq)
+
+    table = {}
+    chunks = []
+    offset = 0
+    for trigram in sorted(postings):
+        positions = postings[trigram]
+        table[trigram] = [offset, len(positions)]
+        chunks.append(np.asarray(positions, dtype='<u4'))
+        offset += len(positions)
+
+    out_dir = generated_path(translation_id, "trigram")
+    write_json(os.path.join(out_dir, "trigrams.json"), table)
+    write_bytes_atomic(os.path.join(out_dir, "postings.bin"), np.concatenate(chunks).tobytes())
+    write_json(os.path.join(out_dir, "verses.json"), {'ids': ids, 'texts': texts})
+
+    return {'verses': len(ids), 'trigrams': len(table), 'postings': offset}
+
+
+# --- Query planning --------------------------------------------------------
+#
+# A query is ALL (no restriction), NONE, a trigram string, or a tuple
+# ('and' | 'or', [queries]).
+
+ALL = ('all',)
+NONE = ('none',)
+
+
+def _unique(items: List) -> List:
+    seen = []
+    for item in items:
+        if item not in seen:
+            seen.append(item)
+    return seen
+
+
+def q_and(a, b):
+    if a == ALL:
+        return b
+    if b == ALL:
+        return a
+    if a == NONE or b == NONE:
+        return NONE
+    items = (list(a[1]) if isinstance(a, tuple) and a[0] == 'and' else [a]) + \
+            (list(b[1]) if isinstance(b, tuple) and b[0] == 'and' else [b])
+    return ('and', _unique(items))
+
+
+def q_or(a, b):
+    if a == ALL or b == ALL:
+        return ALL
+    if a == NONE:
+        return b
+    if b == NONE:
+        return a
+    items = (list(a[1]) if isinstance(a, tuple) and a[0] == 'or' else [a]) + \
+            (list(b[1]) if isinstance(b, tuple) and b[0] == 'or' else [b])
+    return ('or', _unique(items))
+
+
+def q_strings(strings: Set[str]):
+    """Query satisfied if the text contains any of `strings` (OR of ANDed trigrams)."""
+    query = NONE
+    for s in strings:
+        if len(s) < 3:
+            return ALL
+        conj = ALL
+        for trigram in sorted(trigrams_of(s)):
+            conj = q_and(conj, trigram)
+        query = q_or(query, conj)
+    return query
+
+
+class Info:
+    """
+    What is known about the strings a sub-pattern can match: the exact set
+    (or None if unknown), possible prefixes and suffixes, and a trigram query
+    every match must satisfy.
+    """
+
+    def __init__(self, exact: Optional[Set[str]], prefix: Set[str], suffix: Set[str], match=ALL):
+        self.exact = exact
+        self.prefix = prefix
+        self.suffix = suffix
+        self.match = match
+
+    @classmethod
+    def literal(cls, chars: Set[str]) -> 'Info':
+        return cls(set(chars), set(chars), set(chars))
+
+    @classmethod
+    def empty(cls) -> 'Info':
+        return cls({''}, {''}, {''})
+
+    @classmethod
+    def anything(cls) -> 'Info':
+        return cls(None, {''}, {''})
+
+    def drop_exact(self) -> 'Info':
+        """Forget the exact set, folding what it implies into match."""
+        if self.exact is not None:
+            self.match = q_and(self.match, q_strings(self.exact))
+            self.exact = None
+        return self
+
+    def simplify(self) -> 'Info':
+        if self.exact is not None and len(self.exact) > MAX_SET:
+            self.prefix = {s[:2] for s in self.exact}
+            self.suffix = {s[-2:] for s in self.exact}
+            self.drop_exact()
+        if any(len(s) > 2 for s in self.prefix):
+            self.match = q_and(self.match, q_strings(self.prefix))
+            self.prefix = {s[:2] for s in self.prefix}
+        if any(len(s) > 2 for s in self.suffix):
+            self.match = q_and(self.match, q_strings(self.suffix))
+            self.suffix = {s[-2:] for s in self.suffix}
+        return self
+
+
+def cross(a: Set[str], b: Set[str]) -> Set[str]:
+    return {x + y for x, y in product(a, b)}
+
+
+def concat(x: Info, y: Info) -> Info:
+    match = q_and(x.match, y.match)
+    if x.exact is not None and y.exact is not None and len(x.exact) * len(y.exact) <= MAX_SET:
+        exact = cross(x.exact, y.exact)
+        return Info(exact, set(exact), set(exact), match).simplify()
+
+    prefix = cross(x.exact, y.prefix) if x.exact is not None and len(x.exact) * len(y.prefix) <= MAX_SET else x.prefix
+    suffix = cross(x.suffix, y.exact) if y.exact is not None and len(x.suffix) * len(y.exact) <= MAX_SET else y.suffix
+    # Strings spanning the boundary between x and y
+    if len(x.suffix) * len(y.prefix) <= MAX_SET:
+        match = q_and(match, q_strings(cross(x.suffix, y.prefix)))
+    for part in (x, y):
+        if part.exact is not None:
+            match = q_and(match, q_strings(part.exact))
+    return Info(None, prefix, suffix, match).simplify()
+
+
+def alternate(x: Info, y: Info) -> Info:
+    if x.exact is not None and y.exact is not None and len(x.exact) + len(y.exact) <= MAX_SET:
+        return Info(x.exact | y.exact, x.prefix | y.prefix, x.suffix | y.suffix, q_or(x.match, y.match))
+    x.drop_exact()
+    y.drop_exact()
+    return Info(None, x.prefix | y.prefix, x.suffix | y.suffix, q_or(x.match, y.match)).simplify()
+
+
+def class_chars(items) -> Optional[Set[str]]:
+    """Characters of a small positive character class, or None."""
+    chars = set()
+    for op, arg in items:
+        if op == sre_constants.LITERAL:
+            chars.add(chr(arg).lower())
+        elif op == sre_constants.RANGE and arg[1] - arg[0] < MAX_SET:
+            chars.update(chr(c).lower() for c in range(arg[0], arg[1] + 1))
+        else:
+            return None
+        if len(chars) > MAX_SET:
+            return None
+    return chars
+
+
+def analyze(pattern) -> Info:
+    """Info for a parsed sequence of regex nodes."""
+    info = Info.empty()
+    for op, arg in pattern:
+        info = concat(info, analyze_node(op, arg))
+    return info
+
+
+def analyze_node(op, arg) -> Info:
+    c = sre_constants
+    if op == c.LITERAL:
+        return Info.literal({chr(arg).lower()})
+    if op == c.IN:
+        chars = class_chars(arg)
+        return Info.literal(chars) if chars else Info.anything()
+    if op == c.SUBPATTERN:
+        return analyze(arg[-1])
+    if op == c.BRANCH:
+        info = None
+        for branch in arg[1]:
+            sub = analyze(branch)
+            info = sub if info is None else alternate(info, sub)
+        return info
+    if op in (c.MAX_REPEAT, c.MIN_REPEAT) or op == getattr(c, 'POSSESSIVE_REPEAT', None):
+        low, high, sub_pattern = arg
+        sub = analyze(sub_pattern)
+        if low == 0:
+            return Info.anything() if high != 1 else alternate(Info.empty(), sub)
+        if low == high and low <= MAX_EXACT_REPEAT:
+            info = Info.empty()
+            for _ in range(low):
+                info = concat(info, analyze(sub_pattern))
+            return info
+        # At least one occurrence: what one copy implies still holds
+        sub.drop_exact()
+        return Info(None, sub.prefix, sub.suffix, sub.match).simplify()
+    if op == getattr(c, 'ATOMIC_GROUP', None):
+        return analyze(arg)
+    if op == c.AT:
+        return Info.empty()
+    if op in (c.ASSERT, c.ASSERT_NOT):
+        return Info.empty()
+    # ANY, NOT_LITERAL, GROUPREF, CATEGORY, ...
+    return Info.anything()
+
+
+def plan(regex: str):
+    """Trigram query that every match of `regex` must satisfy."""
+    info = analyze(sre_parse.parse(regex, re.IGNORECASE))
+    if info.exact is not None:
+        return q_and(info.match, q_strings(info.exact))
+    return q_and(info.match, q_and(q_strings(info.prefix), q_strings(info.suffix)))
+
+
+# --- Query execution -------------------------------------------------------
+
+class TrigramIndex:
+    """Loaded trigram index of one translation."""
+
+    def __init__(self, translation_id: str):
+        base = generated_path(translation_id, "trigram")
+        with open(os.path.join(base, "trigrams.json"), 'r', encoding='utf-8') as f:
+            self.table = json.load(f)
+        with open(os.path.join(base, "verses.json"), 'r', encoding='utf-8') as f:
+            verses = json.load(f)
+        self.ids = verses['ids']
+        self.texts = verses['texts']
+        self.postings = np.memmap(os.path.join(base, "postings.bin"), dtype='<u4', mode='r')
+
+    def posting(self, trigram: str) -> np.ndarray:
+        entry = self.table.get(trigram)
+        if entry is None:
+            return np.empty(0, dtype=np.uint32)
+        offset, count = entry
+        return np.asarray(self.postings[offset:offset + count])
+
+    def evaluate(self, query) -> Optional[np.ndarray]:
+        """Candidate verse positions; None means 'all verses'."""
+        if query == ALL:
+            return None
+        if query == NONE:
+            return np.empty(0, dtype=np.uint32)
+        if isinstance(query, str):
+            return self.posting(query)
+        op, items = query
+        if op == 'and':
+            # Intersect the shortest lists first
+            result = None
+            evaluated = [self.evaluate(item) for item in items]
+            for candidates in sorted((e for e in evaluated if e is not None), key=len):
+                result = candidates if result is None else np.intersect1d(result, candidates, assume_unique=True)
+                if len(result) == 0:
+                    break
+            return result
+        result = np.empty(0, dtype=np.uint32)
+        for item in items:
+            candidates = self.evaluate(item)
+            if candidates is None:
+                return None
+            result = np.union1d(result, candidates)
+        return result
+
+    def search(self, regex: str, limit: int = 50) -> Tuple[List[Tuple[int, str, int, int]], int]:
+        """Return ([(verse id, text, match start, match end)], candidate count)."""
+        compiled = re.compile(regex, re.IGNORECASE)
+        candidates = self.evaluate(plan(regex))
+        positions = range(len(self.texts)) if candidates is None else candidates.tolist()
+
+        results = []
+        for seq in positions:
+            match = compiled.search(self.texts[seq])
+            if match:
+                results.append((self.ids[seq], self.texts[seq], match.start(), match.end()))
+                if len(results) >= limit:
+                    break
+        return results, len(positions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the trigram regex index")
+    parser.add_argument("--query", help="Regular expression to search for")
+    parser.add_argument("--translation", default="einheitsuebersetzung")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.query:
+        index = TrigramIndex(args.translation)
+        start = time.perf_counter()
+        results, candidates = index.search(args.query, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        for vid, text, s, e in results:
+            print(f"{vid}: {text[:s]}[{text[s:e]}]{text[e:]}")
+        print(f"\n{len(results)} results from {candidates} candidates "
+              f"(of {len(index.texts)} verses) in {elapsed:.1f} ms")
+        print(f"Plan: {plan(args.query)}")
+        return
+
+    for translation_id in available_translations():
+        start = time.perf_counter()
+        counts = build_index(translation_id)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {translation_id}: {counts['verses']} verses, {counts['trigrams']} trigrams, "
+              f"{counts['postings']} postings in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,13 +16,15 @@ import {
   type Note,
   type Bookmark,
 } from "@/lib/db/index";
-import type { Verse } from "@/lib/types";
+import { getVerseKey, type Verse, type VerseTokens } from "@/lib/types";
 
 interface ChapterViewProps {
   bookId: string;
   bookName: string;
   chapterNumber: number;
   verses: Verse[];
+  tokens?: VerseTokens[];
+  coldFootnotes?: Record<string, string[]>;
   introduction?: string;
 }
 
@@ -31,6 +33,8 @@ function ChapterContent({
   bookName,
   chapterNumber,
   verses,
+  tokens,
+  coldFootnotes,
   introduction,
 }: ChapterViewProps) {
   const { toggleVerse, isSelected, clearSelection, setContext } = useSelection();
@@ -58,6 +62,21 @@ function ChapterContent({
     [bookId, chapterNumber, refreshKey]
   );
 
+  // Vorberechnete Darstellung nur verwenden, wenn sie zum geladenen Kapitel passt
+  const verseTokens = tokens?.length === verses.length ? tokens : undefined;
+
+  // Ausgelagerte Fußnoten (nach Vers-ID); bis sie geladen sind, Platzhalter für die Marker
+  const verseParts = new Map<number, number>();
+  const footnotesFor = (verse: Verse): string[] | undefined => {
+    const part = verseParts.get(verse.number) ?? 0;
+    verseParts.set(verse.number, part + 1);
+    if (verse.footnotes || !verse.footnoteCount) return verse.footnotes;
+    return (
+      coldFootnotes?.[getVerseKey(bookId, chapterNumber, verse.number, part)] ??
+      Array(verse.footnoteCount).fill("…")
+    );
+  };
+
   // Build lookup maps
   const highlightMap = new Map<number, Highlight["color"]>();
   highlights?.forEach((h) => highlightMap.set(h.verse, h.color));
@@ -120,13 +139,14 @@ function ChapterContent({
 
         {/* Bibeltext */}
         <div className="bible-text leading-relaxed text-[var(--text-primary)]">
-          {verses.map((verse) => (
+          {verses.map((verse, index) => (
             <VerseText
               key={verse.number}
               number={verse.number}
               text={verse.text}
               heading={verse.heading}
-              footnotes={verse.footnotes}
+              footnotes={footnotesFor(verse)}
+              tokens={verseTokens?.[index]}
               highlight={highlightMap.get(verse.number) || null}
               hasNote={noteVerses.has(verse.number)}
               isBookmarked={bookmarkVerses.has(verse.number)}
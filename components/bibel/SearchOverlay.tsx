@@ -4,8 +4,9 @@ import { useState, useEffect, useCallback, useRef } from "react";
 import { createPortal } from "react-dom";
 import { motion, AnimatePresence } from "framer-motion";
 import { useRouter } from "next/navigation";
-import { getBookById, BIBLE_BOOKS, Book } from "@/lib/types";
-import { loadBook } from "@/lib/bible-loader";
+import { getBookById, Book } from "@/lib/types";
+import { getAvailableBooks, loadBook, loadBookAliases } from "@/lib/bible-loader";
+import { formatReference, getReferencePath, parseReference } from "@/lib/bible-reference";
 import { useTranslation } from "@/components/providers/TranslationProvider";
 
 interface SearchResult {
@@ -29,6 +30,7 @@ export function SearchOverlay({ isOpen, onClose }: SearchOverlayProps) {
   const [mounted, setMounted] = useState(false);
   const [isSearching, setIsSearching] = useState(false);
   const [loadedBooks, setLoadedBooks] = useState<Map<string, Book>>(new Map());
+  const [bookAliases, setBookAliases] = useState<Record<string, string>>({});
   const inputRef = useRef<HTMLInputElement>(null);
   const router = useRouter();
   const { translation: translationId } = useTranslation();
@@ -42,11 +44,11 @@ export function SearchOverlay({ isOpen, onClose }: SearchOverlayProps) {
     if (isOpen && loadedBooks.size === 0) {
       const loadAllBooks = async () => {
         const books = new Map<string, Book>();
-        // Load both AT and NT books
-        for (const book of [...BIBLE_BOOKS.old, ...BIBLE_BOOKS.new]) {
-          const loaded = await loadBook(translationId, book.id);
+        // Load all books available in this translation (AT and NT)
+        for (const bookId of getAvailableBooks(translationId)) {
+          const loaded = await loadBook(translationId, bookId);
           if (loaded) {
-            books.set(book.id, loaded);
+            books.set(bookId, loaded);
           }
         }
         setLoadedBooks(books);
@@ -55,6 +57,15 @@ export function SearchOverlay({ isOpen, onClose }: SearchOverlayProps) {
     }
   }, [isOpen, translationId, loadedBooks.size]);
 
+  // Abkürzungen für "Gehe zu Stelle" (Joh 3,16, 1 Kor 13,4-7)
+  useEffect(() => {
+    if (isOpen) {
+      loadBookAliases().then(setBookAliases);
+    }
+  }, [isOpen]);
+
+  const reference = parseReference(query, translationId, bookAliases);
+
   // Auto-focus input when opened
   useEffect(() => {
     if (isOpen && inputRef.current) {
@@ -132,6 +143,12 @@ export function SearchOverlay({ isOpen, onClose }: SearchOverlayProps) {
     return () => clearTimeout(timer);
   }, [query, searchBible]);
 
+  const handleReferenceClick = () => {
+    if (!reference) return;
+    router.push(getReferencePath(reference));
+    onClose();
+  };
+
   const handleResultClick = (result: SearchResult) => {
     router.push(`/lesen/${result.bookId}/${result.chapter}`);
     onClose();
@@ -217,6 +234,9 @@ export function SearchOverlay({ isOpen, onClose }: SearchOverlayProps) {
                   type="text"
                   value={query}
                   onChange={(e) => setQuery(e.target.value)}
+                  onKeyDown={(e) => {
+                    if (e.key === "Enter") handleReferenceClick();
+                  }}
                   placeholder="Suche in der Bibel..."
                   className="flex-1 bg-transparent text-[var(--text-primary)] placeholder:text-[var(--text-muted)] text-lg outline-none"
                 />
@@ -253,6 +273,19 @@ export function SearchOverlay({ isOpen, onClose }: SearchOverlayProps) {
                 </button>
               </div>
 
+              {/* Gehe zu Stelle */}
+              {reference && (
+                <button
+                  onClick={handleReferenceClick}
+                  className="w-full flex items-center justify-between gap-2 px-4 py-3 border-b border-[var(--border)] text-left hover:bg-[var(--bg-hover)] transition-colors"
+                >
+                  <span className="font-medium text-[var(--text-primary)]">
+                    Gehe zu {formatReference(reference)}
+                  </span>
+                  <span className="text-xs text-[var(--text-muted)] font-mono">↵</span>
+                </button>
+              )}
+
               {/* Results */}
               <div className="max-h-[60vh] overflow-y-auto">
                 {loadedBooks.size === 0 ? (
@@ -3,12 +3,14 @@
 import { useRef, useState, useEffect } from "react";
 import clsx from "clsx";
 import { motion, AnimatePresence } from "framer-motion";
+import { LINE_BREAK, type VerseTokens } from "@/lib/types";
 
 interface VerseTextProps {
   number: number;
   text: string;
   heading?: string;
   footnotes?: string[];
+  tokens?: VerseTokens;
   highlight?: "yellow" | "green" | "blue" | "pink" | "orange" | null;
   hasNote?: boolean;
   isBookmarked?: boolean;
@@ -21,6 +23,7 @@ export function VerseText({
   text,
   heading,
   footnotes,
+  tokens,
   highlight = null,
   hasNote = false,
   isBookmarked = false,
@@ -103,8 +106,64 @@ export function VerseText({
 
   const hasFootnotes = footnotes && footnotes.length > 0;
 
+  // Textstück an den Grenzen der Zitate teilen; offset ist die Position des Stücks
+  // über alle Textstücke des Verses (wie in build_render_tokens.quote_spans)
+  const renderQuoted = (segment: string, offset: number, quotes: [number, number][], key: string) => {
+    const cuts = [0, segment.length];
+    for (const [start, end] of quotes) {
+      if (start > offset && start < offset + segment.length) cuts.push(start - offset);
+      if (end > offset && end < offset + segment.length) cuts.push(end - offset);
+    }
+    cuts.sort((a, b) => a - b);
+
+    return cuts.slice(0, -1).map((from, i) => {
+      const part = segment.slice(from, cuts[i + 1]);
+      const quoted = quotes.some(([start, end]) => start <= offset + from && offset + from < end);
+      return quoted ? (
+        <span key={`${key}-${i}`} className="verse-quote">{part}</span>
+      ) : (
+        part
+      );
+    });
+  };
+
+  // Vorberechnete Segmente rendern: keine String-Verarbeitung pro Vers
+  const renderSegments = (verseTokens: VerseTokens) => {
+    let offset = 0;
+    return verseTokens.segments.map((segment, index) => {
+      if (typeof segment === "string") {
+        const start = offset;
+        offset += segment.length;
+        return (
+          <span key={`text-${index}`}>
+            {verseTokens.quotes
+              ? renderQuoted(segment, start, verseTokens.quotes, `quote-${index}`)
+              : segment}
+          </span>
+        );
+      }
+      if (segment === LINE_BREAK) {
+        return <br key={`line-${index}`} />;
+      }
+      return (
+        <sup
+          key={`footnote-${segment}`}
+          className="footnote-marker ml-0.5 px-1 py-0.5 cursor-pointer text-[var(--accent)] hover:text-[var(--accent-hover)] transition-colors select-none text-sm"
+          onClick={handleFootnoteClick(segment)}
+          onTouchEnd={handleFootnoteClick(segment)}
+        >
+          *
+        </sup>
+      );
+    });
+  };
+
   // Text mit Fußnoten-Markern und Schrägstrichen formatieren
   const formatText = (inputText: string) => {
+    if (tokens) {
+      return renderSegments(tokens);
+    }
+
     let processedText = inputText;
     const parts: React.ReactNode[] = [];
 
@@ -188,7 +247,7 @@ export function VerseText({
   const renderHeading = () => {
     if (!heading) return null;
 
-    const parts = heading.split(" | ");
+    const parts = tokens?.heading ?? heading.split(" | ");
 
     if (parts.length === 2) {
       // Beide Überschriften vorhanden
@@ -227,6 +286,7 @@ export function VerseText({
           highlight && `verse-highlight verse-highlight-${highlight}`,
           isSelected && "verse-selected",
         )}
+        data-verse={number}
         onClick={handleClick}
         onTouchStart={handleTouchStart}
         onTouchEnd={handleTouchEnd}
@@ -2,79 +2,43 @@
 """
 Convert Numbers document to TypeScript files for Bible app.
 Extracts verses, footnotes, and chapters from the Numbers document.
+
+Pass --split-cold to write introductions and footnotes into <book>.cold.json
+companions instead of the book modules.
 """
 
 import zipfile
 import re
 import json
 import os
+import sys
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-import re
 from collections import defaultdict
 
-# Book name mapping (German -> ID)
-# Note: CSV uses "1 Korinther" not "1. Korinther"
-BOOK_MAPPING = {
-    "Matthäus": "matthew",
-    "Markus": "mark",
-    "Lukas": "luke",
-    "Johannes": "john",
-    "Apostelgeschichte": "acts",
-    "Römer": "romans",
-    "1 Korinther": "1corinthians",
-    "2 Korinther": "2corinthians",
-    "Galater": "galatians",
-    "Epheser": "ephesians",
-    "Philipper": "philippians",
-    "Kolosser": "colossians",
-    "1 Thessalonicher": "1thessalonians",
-    "2 Thessalonicher": "2thessalonians",
-    "1 Timotheus": "1timothy",
-    "2 Timotheus": "2timothy",
-    "Titus": "titus",
-    "Philemon": "philemon",
-    "Hebräer": "hebrews",
-    "Jakobus": "james",
-    "1 Petrus": "1peter",
-    "2 Petrus": "2peter",
-    "1 Johannes": "1john",
-    "2 Johannes": "2john",
-    "3 Johannes": "3john",
-    "Judas": "jude",
-    "Offenbarung": "revelation",
-}
+from bible_corpus import book_index, book_name_mapping, generated_path, load_book_catalog, split_cold_fields, write_json
+from bible_reference import book_id_for_name
+from build_render_tokens import write_book_tokens
+from safe_io import write_text_atomic
+
+# Translation the converted NT is imported into (render tokens go to its generated/ tree)
+TRANSLATION_ID = "einheitsuebersetzung"
+
+# Book name mapping (German -> ID), built from BIBLE_BOOKS in lib/types.ts.
+# Accepts both "1 Korinther" (CSV export) and "1. Korinther".
+BOOK_MAPPING = book_name_mapping('new')
+
+# Canonical German name per book ID
+BOOK_NAMES = {book['id']: book['name'] for book in load_book_catalog() if book['testament'] == 'new'}
 
 # Book abbreviation mapping
-ABBREV_MAPPING = {
-    "matthew": "Mt",
-    "mark": "Mk",
-    "luke": "Lk",
-    "john": "Joh",
-    "acts": "Apg",
-    "romans": "Röm",
-    "1corinthians": "1. Kor",
-    "2corinthians": "2. Kor",
-    "galatians": "Gal",
-    "ephesians": "Eph",
-    "philippians": "Phil",
-    "colossians": "Kol",
-    "1thessalonians": "1. Thess",
-    "2thessalonians": "2. Thess",
-    "1timothy": "1. Tim",
-    "2timothy": "2. Tim",
-    "titus": "Tit",
-    "philemon": "Phlm",
-    "hebrews": "Hebr",
-    "james": "Jak",
-    "1peter": "1. Petr",
-    "2peter": "2. Petr",
-    "1john": "1. Joh",
-    "2john": "2. Joh",
-    "3john": "3. Joh",
-    "jude": "Jud",
-    "revelation": "Offb",
-}
+ABBREV_MAPPING = {book['id']: book['shortName'] for book in load_book_catalog() if book['testament'] == 'new'}
+
+
+def nt_book_id(name: str) -> Optional[str]:
+    """Book ID for a name or abbreviation in column A ("Römer", "1 Kor", "Offb"), NT only."""
+    book_id = BOOK_MAPPING.get(name) or book_id_for_name(name)
+    return book_id if book_id in BOOK_NAMES else None
 
 
 def extract_text_from_iwa(file_path: str) -> bytes:
@@ -254,8 +218,9 @@ def process_rows_to_books(rows: List[Dict]) -> Tuple[Dict[str, Dict], Dict[str,
         
         # Column A: Book name
         book_name = row.get('A', '').strip()
-        if book_name and book_name in BOOK_MAPPING:
-            current_book = BOOK_MAPPING[book_name]
+        book_id = nt_book_id(book_name) if book_name else None
+        if book_id:
+            current_book = book_id
             current_chapter = None
         
         if not current_book:
@@ -303,6 +268,7 @@ def process_rows_to_books(rows: List[Dict]) -> Tuple[Dict[str, Dict], Dict[str,
         
         # Column G: Footnote content (in following rows)
         footnotes = []
+        synopsis = []
         if footnote_count > 0:
             for j in range(footnote_count):
                 if i + 1 + j < len(rows):
@@ -315,7 +281,8 @@ def process_rows_to_books(rows: List[Dict]) -> Tuple[Dict[str, Dict], Dict[str,
                     if next_f == '*' and next_g:
                         # Clean up footnote text (remove special markers like ℘)
                         footnote_text = next_g.replace('℘', '').strip()
-                        # Remove "⇨Esyn: Synopse Nr. X" patterns
+                        # Move "⇨Esyn: Synopse Nr. X" markers out of the footnote text
+                        synopsis.extend(int(n) for n in re.findall(r'⇨Esyn: Synopse Nr\. (\d+)', footnote_text))
                         footnote_text = re.sub(r'⇨Esyn: Synopse Nr\. \d+', '', footnote_text).strip()
                         if footnote_text:
                             footnotes.append(footnote_text)
@@ -334,7 +301,8 @@ def process_rows_to_books(rows: List[Dict]) -> Tuple[Dict[str, Dict], Dict[str,
         verse_data = {
             'number': verse_num,
             'text': verse_text,
-            'footnotes': footnotes if footnotes else None
+            'footnotes': footnotes if footnotes else None,
+            'synopsis': synopsis if synopsis else None,
         }
         
         books[current_book][current_chapter].append(verse_data)
@@ -348,15 +316,26 @@ def process_rows_to_books(rows: List[Dict]) -> Tuple[Dict[str, Dict], Dict[str,
     return books, introductions
 
 
-def generate_typescript_file(book_id: str, book_name: str, book_data: Dict[int, List[Dict]], introduction: str, output_dir: str):
-    """Generate a TypeScript file for a book."""
+def generate_typescript_file(book_id: str, book_name: str, book_data: Dict[int, List[Dict]], introduction: str,
+                             output_dir: str, split_cold: bool = False):
+    """
+    Generate a TypeScript file for a book. With split_cold the introduction
+    and the footnotes are written to <book_id>.cold.json instead.
+    """
     
     short_name = ABBREV_MAPPING.get(book_id, book_name)
+    chapters = [{'number': number, 'verses': book_data[number]} for number in sorted(book_data)]
+    if split_cold:
+        hot, cold = split_cold_fields({'introduction': introduction, 'chapters': chapters}, book_index(book_id))
+        write_json(os.path.join(output_dir, f"{book_id}.cold.json"), cold)
+    else:
+        hot = {'chapters': chapters}
     
     # Build chapters array
     chapters_code = []
-    for chapter_num in sorted(book_data.keys()):
-        verses = book_data[chapter_num]
+    for chapter in hot['chapters']:
+        chapter_num = chapter['number']
+        verses = chapter['verses']
         verses_code = []
         
         for verse in verses:
@@ -370,6 +349,12 @@ def generate_typescript_file(book_id: str, book_name: str, book_data: Dict[int,
             if verse.get('footnotes'):
                 footnotes_json = json.dumps(verse['footnotes'], ensure_ascii=False)
                 verse_obj += f", footnotes: {footnotes_json}"
+            elif verse.get('footnoteCount'):
+                verse_obj += f", footnoteCount: {verse['footnoteCount']}"
+
+            # Synopsis numbers of the synoptic parallels (used by build_parallel_passages.py)
+            if verse.get('synopsis'):
+                verse_obj += f", synopsis: {json.dumps(verse['synopsis'])}"
             
             verse_obj += " }"
             verses_code.append(verse_obj)
@@ -379,25 +364,28 @@ def generate_typescript_file(book_id: str, book_name: str, book_data: Dict[int,
     
     # Escape introduction text for JSON
     intro_json = json.dumps(introduction, ensure_ascii=False) if introduction else '""'
+    intro_line = "" if split_cold else f"\n  introduction: {intro_json},"
     
     # Generate full file content
     file_content = f'''import {{ Book }} from "@/lib/types";
 
 export const {book_id}: Book = {{
-  id: "{book_id}", name: "{book_name}", shortName: "{short_name}", testament: "new",
-  introduction: {intro_json},
+  id: "{book_id}", name: "{book_name}", shortName: "{short_name}", testament: "new",{intro_line}
   chapters: [
 {",\n".join(chapters_code)}
   ]
 }};
 '''
     
-    # Write file
+    # Write file (atomically, skipped if unchanged)
     output_path = os.path.join(output_dir, f"{book_id}.ts")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(file_content)
-    
-    print(f"Generated: {output_path}")
+    if write_text_atomic(output_path, file_content):
+        print(f"Generated: {output_path}")
+    else:
+        print(f"Unchanged: {output_path}")
+
+    # Render-ready tokens for VerseText.tsx, where the app loads them
+    write_book_tokens({'chapters': chapters}, generated_path(TRANSLATION_ID, "render", f"{book_id}.json"))
 
 
 def parse_csv_file(csv_path: str) -> List[Dict]:
@@ -427,7 +415,7 @@ def parse_csv_file(csv_path: str) -> List[Dict]:
                 continue
             
             # Skip rows without book name
-            if not book or book not in BOOK_MAPPING:
+            if not book or not nt_book_id(book):
                 continue
             
             row_dict = {
@@ -489,9 +477,10 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
     
     for book_id, book_data in books.items():
-        book_name = next((k for k, v in BOOK_MAPPING.items() if v == book_id), book_id)
+        book_name = BOOK_NAMES.get(book_id, book_id)
         introduction = introductions.get(book_id, "")
-        generate_typescript_file(book_id, book_name, book_data, introduction, output_dir)
+        generate_typescript_file(book_id, book_name, book_data, introduction, output_dir,
+                                 split_cold='--split-cold' in sys.argv)
     
     # Create ZIP file
     import shutil
@@ -10,6 +10,8 @@ import os
 import re
 import sys
 
+from safe_io import translation_lock, write_text_atomic
+
 def fix_export_names(content: str, filename: str) -> str:
     """Add underscore prefix to exports starting with numbers."""
     # Get the base name without extension (e.g., "1chronicles" from "1chronicles.ts")
@@ -239,8 +241,7 @@ def process_file(filepath: str) -> bool:
 
     if content != original_content:
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            write_text_atomic(filepath, content)
             return True
         except Exception as e:
             print(f"  Error writing {filepath}: {e}")
@@ -267,7 +268,9 @@ def process_directory(directory: str) -> tuple[int, int]:
                     processed += 1
                     print(f"Processing: {filepath}")
 
-                    if process_file(filepath):
+                    with translation_lock(filepath):
+                        changed = process_file(filepath)
+                    if changed:
                         modified += 1
                         print(f"  -> Modified")
 
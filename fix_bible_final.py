@@ -9,6 +9,8 @@ import os
 import re
 import sys
 
+from safe_io import translation_lock, write_text_atomic
+
 
 def process_file(filepath: str) -> bool:
     """Verarbeitet eine einzelne Datei. Gibt True zurück wenn geändert."""
@@ -35,8 +37,7 @@ def process_file(filepath: str) -> bool:
     content = fix_inner_quotes(content)
 
     if content != original:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_text_atomic(filepath, content)
         return True
 
     return False
@@ -259,7 +260,9 @@ def main():
             print(f"Verarbeite: {filepath}")
 
             try:
-                if process_file(filepath):
+                with translation_lock(filepath):
+                    changed = process_file(filepath)
+                if changed:
                     modified += 1
                     print("  -> Geändert")
             except Exception as e:
@@ -8,6 +8,8 @@ import os
 import re
 import sys
 
+from safe_io import translation_lock, write_text_atomic
+
 
 def fix_file(filepath: str) -> bool:
     """Korrigiert eine Datei. Gibt True zurück wenn geändert."""
@@ -63,8 +65,7 @@ def fix_file(filepath: str) -> bool:
     )
 
     if content != original:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_text_atomic(filepath, content)
         return True
 
     return False
@@ -97,7 +98,9 @@ def main():
             count += 1
 
             try:
-                if fix_file(filepath):
+                with translation_lock(filepath):
+                    changed = fix_file(filepath)
+                if changed:
                     modified += 1
                     print(f"OK: {filename}")
             except Exception as e:
@@ -8,6 +8,8 @@ import os
 import re
 import sys
 
+from safe_io import translation_lock, write_text_atomic
+
 
 def process_file(filepath: str) -> bool:
     """Verarbeitet eine einzelne Datei. Gibt True zurück wenn geändert."""
@@ -41,8 +43,7 @@ def process_file(filepath: str) -> bool:
     content = '\n'.join(fixed_lines)
 
     if content != original:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_text_atomic(filepath, content)
         return True
 
     return False
@@ -307,7 +308,9 @@ def main():
             processed += 1
 
             try:
-                if process_file(filepath):
+                with translation_lock(filepath):
+                    changed = process_file(filepath)
+                if changed:
                     modified += 1
                     print(f"Geändert: {filepath}")
             except Exception as e:
@@ -1,33 +1,38 @@
-import { Book, TRANSLATIONS, TranslationId } from "./types";
+import {
+  Book,
+  BookColdData,
+  BookManifestEntry,
+  BookRenderTokens,
+  FootnoteRef,
+  TRANSLATIONS,
+  TranslationId,
+  TranslationManifest,
+} from "./types";
+import einheitsuebersetzungManifest from "@/data/bibel/Einheitsuebersetzung_1980/manifest.json";
+import neueManifest from "@/data/bibel/Neue_Evangelistische_Uebersetzung/manifest.json";
 
 // Cache für geladene Bücher
 const bookCache = new Map<string, Book>();
-
-// Mapping von Buch-ID zu Testament
-const bookTestament: Record<string, "old" | "new"> = {
-  // Altes Testament
-  genesis: "old", exodus: "old", leviticus: "old", numbers: "old", deuteronomy: "old",
-  joshua: "old", judges: "old", ruth: "old", "1samuel": "old", "2samuel": "old",
-  "1kings": "old", "2kings": "old", "1chronicles": "old", "2chronicles": "old",
-  ezra: "old", nehemiah: "old", esther: "old", job: "old", psalms: "old",
-  proverbs: "old", ecclesiastes: "old", songofsolomon: "old", isaiah: "old",
-  jeremiah: "old", lamentations: "old", ezekiel: "old", daniel: "old",
-  hosea: "old", joel: "old", amos: "old", obadiah: "old", jonah: "old",
-  micah: "old", nahum: "old", habakkuk: "old", zephaniah: "old", haggai: "old",
-  zechariah: "old", malachi: "old",
-  // Apokryphen (Einheitsübersetzung)
-  tobit: "old", judith: "old", "1maccabees": "old", "2maccabees": "old",
-  wisdom: "old", sirach: "old", baruch: "old",
-  // Neues Testament
-  matthew: "new", mark: "new", luke: "new", john: "new", acts: "new",
-  romans: "new", "1corinthians": "new", "2corinthians": "new", galatians: "new",
-  ephesians: "new", philippians: "new", colossians: "new",
-  "1thessalonians": "new", "2thessalonians": "new", "1timothy": "new",
-  "2timothy": "new", titus: "new", philemon: "new", hebrews: "new",
-  james: "new", "1peter": "new", "2peter": "new", "1john": "new",
-  "2john": "new", "3john": "new", jude: "new", revelation: "new",
+const renderTokenCache = new Map<string, BookRenderTokens>();
+const coldDataCache = new Map<string, BookColdData>();
+const footnoteDictionaryCache = new Map<TranslationId, Promise<string[]>>();
+let bookAliasesPromise: Promise<Record<string, string>> | null = null;
+
+// Buch-Manifeste (generiert von build_manifest.py aus data/bibel)
+const manifests: Partial<Record<TranslationId, TranslationManifest>> = {
+  einheitsuebersetzung: einheitsuebersetzungManifest as TranslationManifest,
+  neue: neueManifest as TranslationManifest,
 };
 
+export function getManifest(translationId: TranslationId): TranslationManifest | null {
+  return manifests[translationId] ?? null;
+}
+
+function getBookEntry(translationId: TranslationId, bookId: string): BookManifestEntry | null {
+  const books = manifests[translationId]?.books;
+  return books && Object.hasOwn(books, bookId) ? books[bookId] : null;
+}
+
 export async function loadBook(
   translationId: TranslationId,
   bookId: string
@@ -39,23 +44,20 @@ export async function loadBook(
   }
 
   const translation = TRANSLATIONS[translationId];
-  const testament = bookTestament[bookId];
+  const entry = getBookEntry(translationId, bookId);
 
-  if (!testament) {
-    console.error(`Unknown book: ${bookId}`);
+  if (!entry) {
+    console.error(`Book ${bookId} not available in ${translationId}`);
     return null;
   }
 
-  const folder = testament === "old" ? "AT" : "NT";
-
   try {
     const module = await import(
-      `@/data/bibel/${translation.folder}/${folder}/${bookId}.ts`
+      `@/data/bibel/${translation.folder}/${entry.folder}/${bookId}.ts`
     );
 
-    // Bücher mit Zahlen am Anfang (1kings, 2chronicles) haben "_" prefix im Export
-    const exportName = bookId.match(/^\d/) ? `_${bookId}` : bookId;
-    const book = module[exportName] as Book;
+    // Export-Name aus dem Manifest (Bücher mit Zahlen am Anfang haben "_" prefix)
+    const book = module[entry.exportName] as Book;
 
     if (book) {
       bookCache.set(cacheKey, book);
@@ -69,9 +71,110 @@ export async function loadBook(
   }
 }
 
+// Vorberechnete Vers-Darstellung (optional, von build_render_tokens.py)
+export async function loadRenderTokens(
+  translationId: TranslationId,
+  bookId: string
+): Promise<BookRenderTokens | null> {
+  const cacheKey = `${translationId}:${bookId}`;
+
+  if (renderTokenCache.has(cacheKey)) {
+    return renderTokenCache.get(cacheKey)!;
+  }
+
+  if (!getBookEntry(translationId, bookId)) {
+    return null;
+  }
+
+  try {
+    const response = await fetch(`/generated/${translationId}/render/${bookId}.json`);
+    if (!response.ok) {
+      return null;
+    }
+    const tokens = (await response.json()) as BookRenderTokens;
+    renderTokenCache.set(cacheKey, tokens);
+    return tokens;
+  } catch {
+    return null;
+  }
+}
+
+// Ausgelagerte Einleitung und Fußnoten (<buch>.cold.json), nur für Bücher mit hasColdData
+export async function loadColdData(
+  translationId: TranslationId,
+  bookId: string
+): Promise<BookColdData | null> {
+  const cacheKey = `${translationId}:${bookId}`;
+
+  if (coldDataCache.has(cacheKey)) {
+    return coldDataCache.get(cacheKey)!;
+  }
+
+  const translation = TRANSLATIONS[translationId];
+  const entry = getBookEntry(translationId, bookId);
+
+  if (!entry?.hasColdData) {
+    return null;
+  }
+
+  try {
+    const module = await import(
+      `@/data/bibel/${translation.folder}/${entry.folder}/${bookId}.cold.json`
+    );
+    const raw = (module.default ?? module) as {
+      introduction?: string;
+      footnotes: Record<string, FootnoteRef[]>;
+    };
+
+    // Wiederholte Fußnoten sind Indizes ins Wörterbuch; alle Verse teilen sich denselben String
+    const dictionary = await loadFootnoteDictionary(translationId);
+    const footnotes: Record<string, string[]> = {};
+    for (const [key, refs] of Object.entries(raw.footnotes)) {
+      footnotes[key] = refs.map((ref) => (typeof ref === "number" ? dictionary[ref] ?? "" : ref));
+    }
+
+    const data: BookColdData = { introduction: raw.introduction, footnotes };
+    coldDataCache.set(cacheKey, data);
+    return data;
+  } catch (error) {
+    console.error(`Failed to load cold data of ${bookId} for ${translationId}:`, error);
+    return null;
+  }
+}
+
+function loadFootnoteDictionary(translationId: TranslationId): Promise<string[]> {
+  if (!manifests[translationId]?.hasFootnoteDictionary) {
+    return Promise.resolve([]);
+  }
+
+  let dictionary = footnoteDictionaryCache.get(translationId);
+  if (!dictionary) {
+    const translation = TRANSLATIONS[translationId];
+    dictionary = import(`@/data/bibel/${translation.folder}/footnotes.json`)
+      .then((module) => (module.default ?? module) as string[])
+      .catch(() => []);
+    footnoteDictionaryCache.set(translationId, dictionary);
+  }
+  return dictionary;
+}
+
+// Alle Schreibweisen der Buchnamen für "Gehe zu Stelle" (bible_reference.py --export-aliases)
+export function loadBookAliases(): Promise<Record<string, string>> {
+  if (!bookAliasesPromise) {
+    bookAliasesPromise = fetch("/generated/book-aliases.json")
+      .then((response) => (response.ok ? response.json() : {}))
+      .catch(() => ({}));
+  }
+  return bookAliasesPromise;
+}
+
 export async function loadVorwort(translationId: TranslationId): Promise<string | null> {
   const translation = TRANSLATIONS[translationId];
 
+  if (!manifests[translationId]?.hasVorwort) {
+    return null;
+  }
+
   try {
     const module = await import(
       `@/data/bibel/${translation.folder}/vorwort.ts`
@@ -92,24 +195,19 @@ export async function loadVorwort(translationId: TranslationId): Promise<string
 
 // Prüft ob ein Buch in einer Übersetzung verfügbar ist
 export function isBookAvailable(translationId: TranslationId, bookId: string): boolean {
-  // Apokryphen nur in Einheitsübersetzung
-  const apocrypha = ["tobit", "judith", "1maccabees", "2maccabees", "wisdom", "sirach", "baruch"];
-
-  if (apocrypha.includes(bookId)) {
-    return translationId === "einheitsuebersetzung";
-  }
-
-  // NeÜ hat nur Neues Testament
-  if (translationId === "neue" && bookTestament[bookId] === "old") {
-    return false;
-  }
-
-  return bookId in bookTestament;
+  return getBookEntry(translationId, bookId) !== null;
 }
 
-// Gibt alle verfügbaren Bücher für eine Übersetzung zurück
+// Gibt alle verfügbaren Bücher für eine Übersetzung zurück (kanonische Reihenfolge)
 export function getAvailableBooks(translationId: TranslationId): string[] {
-  return Object.keys(bookTestament).filter(bookId =>
-    isBookAvailable(translationId, bookId)
-  );
+  return Object.keys(manifests[translationId]?.books ?? {});
+}
+
+// Anzahl der Verse eines Kapitels, ohne das Buch zu laden
+export function getVerseCount(
+  translationId: TranslationId,
+  bookId: string,
+  chapter: number
+): number | null {
+  return getBookEntry(translationId, bookId)?.verses[chapter - 1] ?? null;
 }
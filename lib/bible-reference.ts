@@ -0,0 +1,102 @@
+import { getVerseCount } from "./bible-loader";
+import { BIBLE_BOOKS, getBookById, TranslationId } from "./types";
+
+// Bibelstelle aus einer Eingabe wie "1 Kor 13,4-7", "Mt 5,3–7,29", "Ex 13-15",
+// "Joh 3:16", "Ps 23" oder "Jud 5"
+export interface BibleReference {
+  bookId: string;
+  chapter: number;
+  verse?: number;
+  endChapter?: number;
+  endVerse?: number;
+}
+
+// Buch, Kapitel, dann ",Vers[-[Kapitel,]Vers]" oder "-Kapitel" (bei einkapiteligen Büchern "-Vers")
+const REFERENCE_PATTERN =
+  /^\s*(.*?[A-Za-zÄÖÜäöüß)]\.?)\s*(\d+)(?:\s*[,:]\s*(\d+)(?:\s*[-–]\s*(?:(\d+)\s*[,:]\s*)?(\d+))?|\s*[-–]\s*(\d+))?\s*$/;
+
+// Schreibweise wie in bible_reference.py (_alias_key): klein, ohne Leerzeichen und Punkte
+export function normalizeBookAlias(name: string): string {
+  return name.toLowerCase().replace(/[\s.]/g, "");
+}
+
+// Namen und Kurznamen aus BIBLE_BOOKS; book-aliases.json ergänzt die Abkürzungen
+const builtinAliases: Record<string, string> = Object.fromEntries(
+  [...BIBLE_BOOKS.old, ...BIBLE_BOOKS.new].flatMap((book) => [
+    [normalizeBookAlias(book.name), book.id],
+    [normalizeBookAlias(book.shortName), book.id],
+  ])
+);
+
+// Wie _parse_spec/_parse_verses in bible_reference.py; Kapitel und Verse werden
+// gegen die Verszahlen im Manifest der Übersetzung geprüft
+export function parseReference(
+  input: string,
+  translationId: TranslationId,
+  aliases: Record<string, string> = {}
+): BibleReference | null {
+  const match = REFERENCE_PATTERN.exec(input);
+  if (!match) return null;
+
+  const key = normalizeBookAlias(match[1]);
+  const bookId = aliases[key] ?? builtinAliases[key];
+  const book = bookId ? getBookById(bookId) : undefined;
+  if (!book) return null;
+
+  const number = (group: string | undefined) => (group ? parseInt(group, 10) : undefined);
+  const first = parseInt(match[2], 10);
+  let reference: BibleReference;
+
+  if (book.chapters === 1 && match[3] === undefined) {
+    // Einkapitelige Bücher (Obadja, Philemon, 2./3. Johannes, Judas): "Jud 5" ist Vers 5
+    reference = { bookId, chapter: 1, verse: first, endVerse: number(match[6]) };
+  } else if (match[3] === undefined) {
+    // Kapitel oder Kapitelbereich ("Ex 13-15")
+    reference = { bookId, chapter: first, endChapter: number(match[6]) };
+  } else {
+    // Verse, auch über Kapitelgrenzen ("Mt 5,3–7,29")
+    reference = {
+      bookId,
+      chapter: first,
+      verse: number(match[3]),
+      endChapter: number(match[4]),
+      endVerse: number(match[5]),
+    };
+  }
+  return isValidReference(reference, translationId) ? reference : null;
+}
+
+// Alle Kapitel und Verse müssen in der Übersetzung existieren, das Ende darf nicht vor dem Anfang liegen
+function isValidReference(reference: BibleReference, translationId: TranslationId): boolean {
+  const { bookId, chapter, verse } = reference;
+  const endChapter = reference.endChapter ?? chapter;
+  const endVerse = reference.endVerse ?? verse;
+
+  const firstCount = getVerseCount(translationId, bookId, chapter);
+  const endCount = getVerseCount(translationId, bookId, endChapter);
+  if (chapter < 1 || !firstCount || !endCount || endChapter < chapter) return false;
+  if (verse === undefined || endVerse === undefined) return true;
+  if (verse < 1 || verse > firstCount || endVerse > endCount) return false;
+  return endChapter > chapter || endVerse >= verse;
+}
+
+// Leseseite der Stelle; der Vers wird als Anker (#v16) angesprungen
+export function getReferencePath(reference: BibleReference): string {
+  const anchor = reference.verse ? `#v${reference.verse}` : "";
+  return `/lesen/${reference.bookId}/${reference.chapter}${anchor}`;
+}
+
+export function formatReference(reference: BibleReference): string {
+  const { chapter, verse, endChapter, endVerse } = reference;
+  const name = getBookById(reference.bookId)?.name ?? reference.bookId;
+  if (verse === undefined) {
+    return `${name} ${chapter}${endChapter && endChapter !== chapter ? `-${endChapter}` : ""}`;
+  }
+  const end =
+    endChapter && endChapter !== chapter
+      ? `-${endChapter}:${endVerse ?? verse}`
+      : endVerse && endVerse !== verse
+        ? `-${endVerse}`
+        : "";
+  return `${name} ${chapter}:${verse}${end}`;
+}
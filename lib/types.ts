@@ -4,6 +4,9 @@ export interface Verse {
   text: string;
   heading?: string;
   footnotes?: string[];
+  // Anzahl der Fußnoten, wenn sie in <buch>.cold.json ausgelagert sind
+  footnoteCount?: number;
+  synopsis?: number[];
 }
 
 export interface Chapter {
@@ -20,6 +23,34 @@ export interface Book {
   chapters: Chapter[];
 }
 
+// Vorberechnete Darstellung eines Verses (generiert von build_render_tokens.py):
+// Textstücke, Fußnoten-Marker (Index in footnotes) und Zeilenumbrüche (LINE_BREAK);
+// quotes sind [Anfang, Ende)-Offsets der Zitate („…“, »…«), gezählt über die Textstücke
+export const LINE_BREAK = -1;
+
+export type VerseSegment = string | number;
+
+export interface VerseTokens {
+  segments: VerseSegment[];
+  quotes?: [number, number][];
+  heading?: string[];
+}
+
+// Ausgelagerte, erst bei Bedarf geladene Felder eines Buchs (<buch>.cold.json):
+// Fußnoten nach Vers-ID (siehe getVerseKey)
+export interface BookColdData {
+  introduction?: string;
+  footnotes: Record<string, string[]>;
+}
+
+// Fußnote in einer cold.json: Text oder Index ins Fußnoten-Wörterbuch
+// der Übersetzung (footnotes.json, von build_footnote_dictionary.py)
+export type FootnoteRef = string | number;
+
+export interface BookRenderTokens {
+  chapters: { number: number; verses: VerseTokens[] }[];
+}
+
 // Übersetzungen
 export const TRANSLATIONS = {
   einheitsuebersetzung: {
@@ -47,6 +78,27 @@ export const TRANSLATIONS = {
 
 export type TranslationId = keyof typeof TRANSLATIONS;
 
+// Buch-Manifest je Übersetzung (generiert von build_manifest.py)
+export interface BookManifestEntry {
+  testament: "old" | "new";
+  folder: "AT" | "NT";
+  exportName: string;
+  name: string;
+  shortName: string;
+  hasIntroduction: boolean;
+  hasColdData: boolean;
+  chapters: number;
+  verses: number[];
+}
+
+export interface TranslationManifest {
+  translation: string;
+  folder: string;
+  hasVorwort: boolean;
+  hasFootnoteDictionary: boolean;
+  books: Record<string, BookManifestEntry>;
+}
+
 export interface BibleTranslation {
   id: string;
   name: string;
@@ -99,6 +151,7 @@ export interface ReadingPlan {
   totalDays: number;
   readings: {
     day: number;
+    words?: number;
     passages: {
       bookId: string;
       startChapter: number;
@@ -216,3 +269,10 @@ export function getBookIndex(id: string): number {
   const allBooks = [...BIBLE_BOOKS.old, ...BIBLE_BOOKS.new];
   return allBooks.findIndex((book) => book.id === id);
 }
+
+// Vers-ID im Format BBCCCVVV (wie verse_id in bible_corpus.py);
+// geteilte Verse (Gen 2,4a/4b) ab dem zweiten Teil als "<id>.<teil>"
+export function getVerseKey(bookId: string, chapter: number, verse: number, part = 0): string {
+  const id = (getBookIndex(bookId) + 1) * 1_000_000 + chapter * 1000 + verse;
+  return part === 0 ? String(id) : `${id}.${part}`;
+}
@@ -1,7 +1,15 @@
 import type { NextConfig } from "next";
 
 const nextConfig: NextConfig = {
-  /* config options here */
+  // Inhaltsadressierte Artefakte (build_content_manifest.py, build_offline_pack.py)
+  // ändern nie ihren Inhalt
+  async headers() {
+    const immutable = [{ key: "Cache-Control", value: "public, max-age=31536000, immutable" }];
+    return [
+      { source: "/generated/:translation/content/:path*", headers: immutable },
+      { source: "/generated/:translation/offline/chunks/:path*", headers: immutable },
+    ];
+  },
 };
 
 export default nextConfig;
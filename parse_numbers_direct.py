@@ -10,27 +10,12 @@ import os
 from pathlib import Path
 from typing import List, Dict, Optional
 
-# Book name mapping
-BOOK_MAPPING = {
-    "Matthäus": "matthew", "Markus": "mark", "Lukas": "luke", "Johannes": "john",
-    "Apostelgeschichte": "acts", "Römer": "romans", "1. Korinther": "1corinthians",
-    "2. Korinther": "2corinthians", "Galater": "galatians", "Epheser": "ephesians",
-    "Philipper": "philippians", "Kolosser": "colossians", "1. Thessalonicher": "1thessalonians",
-    "2. Thessalonicher": "2thessalonians", "1. Timotheus": "1timothy", "2. Timotheus": "2timothy",
-    "Titus": "titus", "Philemon": "philemon", "Hebräer": "hebrews", "Jakobus": "james",
-    "1. Petrus": "1peter", "2. Petrus": "2peter", "1. Johannes": "1john", "2. Johannes": "2john",
-    "3. Johannes": "3john", "Judas": "jude", "Offenbarung": "revelation",
-}
+from bible_corpus import book_name_mapping, load_book_catalog
 
-ABBREV_MAPPING = {
-    "matthew": "Mt", "mark": "Mk", "luke": "Lk", "john": "Joh", "acts": "Apg",
-    "romans": "Röm", "1corinthians": "1. Kor", "2corinthians": "2. Kor",
-    "galatians": "Gal", "ephesians": "Eph", "philippians": "Phil", "colossians": "Kol",
-    "1thessalonians": "1. Thess", "2thessalonians": "2. Thess", "1timothy": "1. Tim",
-    "2timothy": "2. Tim", "titus": "Tit", "philemon": "Phlm", "hebrews": "Hebr",
-    "james": "Jak", "1peter": "1. Petr", "2peter": "2. Petr", "1john": "1. Joh",
-    "2john": "2. Joh", "3john": "3. Joh", "jude": "Jud", "revelation": "Offb",
-}
+# Book name mapping (German -> ID), shared with convert_numbers_to_ts.py
+BOOK_MAPPING = book_name_mapping('new')
+
+ABBREV_MAPPING = {book['id']: book['shortName'] for book in load_book_catalog() if book['testament'] == 'new'}
 
 
 def extract_strings_from_binary(content: bytes, min_length: int = 3) -> List[tuple]:
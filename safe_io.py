@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Safe writes for data/bibel and the build artifacts.
+
+All scripts that create or modify book modules go through this module:
+
+- write_text_atomic() writes to a temporary file in the target directory and
+  moves it into place with os.replace(), so a crash never leaves a truncated
+  file behind. Content that is byte-identical to the existing file is not
+  written at all, which keeps timestamps (and incremental builds) stable.
+- translation_lock() takes an advisory lock per translation directory
+  (data/bibel/<folder>/.lock), so two scripts working on the same
+  translation run one after the other instead of interleaving. Build
+  artifacts in public/generated/<translation>/ share one lock per
+  translation, .locks/<translation>.lock at the repository root, so no lock
+  files end up next to deployed artifacts in public/. Any other output is
+  locked per top-level directory of the repository.
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking is a no-op
+    fcntl = None
+
+# Absolute, so the lock of a translation is the same from any working directory
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(REPO_DIR, "data", "bibel")
+GENERATED_DIR = os.path.join(REPO_DIR, "public", "generated")
+LOCK_DIR = os.path.join(REPO_DIR, ".locks")
+LOCK_NAME = ".lock"
+
+# Locks held by this process: (thread id, lock path) -> (file descriptor, depth)
+_held: Dict[Tuple[int, str], Tuple[int, int]] = {}
+_held_guard = threading.Lock()
+
+
+def _first_directory(path: str, base: str) -> Optional[str]:
+    """First directory of `path` below `base`, None if `path` is not inside a subdirectory of it."""
+    rel = os.path.relpath(path, base)
+    if rel.startswith(os.pardir) or os.sep not in rel:
+        return None
+    return rel.split(os.sep)[0]
+
+
+def lock_path_for(path: str) -> str:
+    """
+    Lock file protecting `path`: data/bibel/<folder>/.lock for files below a
+    translation folder, LOCK_DIR/<translation>.lock for build artifacts in
+    public/generated/<translation>/, otherwise LOCK_DIR/<top-level
+    directory>.lock (LOCK_DIR/repo.lock outside any of them).
+    """
+    abs_path = os.path.abspath(path)
+    folder = _first_directory(abs_path, DATA_DIR)
+    if folder:
+        return os.path.join(DATA_DIR, folder, LOCK_NAME)
+    name = _first_directory(abs_path, GENERATED_DIR) or _first_directory(abs_path, REPO_DIR) or "repo"
+    return os.path.join(LOCK_DIR, f"{name}.lock")
+
+
+@contextmanager
+def translation_lock(path: str) -> Iterator[None]:
+    """
+    Hold the advisory lock of the translation directory containing `path`.
+    Re-entrant within a thread, so locked helpers can be nested; other
+    threads of the same process wait like other processes do.
+    """
+    key = (threading.get_ident(), lock_path_for(path))
+
+    with _held_guard:
+        held = _held.get(key)
+        if held:
+            _held[key] = (held[0], held[1] + 1)
+    if not held:
+        os.makedirs(os.path.dirname(key[1]), exist_ok=True)
+        fd = os.open(key[1], os.O_RDWR | os.O_CREAT, 0o644)
+        # flock() locks the open file description: a second thread with its own
+        # descriptor blocks here like another process would
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        with _held_guard:
+            _held[key] = (fd, 1)
+
+    try:
+        yield
+    finally:
+        with _held_guard:
+            fd, depth = _held[key]
+            if depth > 1:
+                _held[key] = (fd, depth - 1)
+            else:
+                del _held[key]
+        if depth == 1:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+def write_bytes_atomic(path: str, data: bytes) -> bool:
+    """
+    Atomically replace `path` with `data`. Returns False (and leaves the file
+    untouched) when the existing content is already identical.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with translation_lock(path):
+        try:
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+        except FileNotFoundError:
+            pass
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(path):
+                os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+            else:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    return True
+
+
+def write_text_atomic(path: str, content: str) -> bool:
+    """UTF-8 text variant of write_bytes_atomic()."""
+    return write_bytes_atomic(path, content.encode('utf-8'))
+
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """
+    Yield a temporary path next to `path`; if the block succeeds it is moved
+    into place with os.replace(), otherwise it is removed. For outputs that
+    are produced by libraries writing to a path themselves (e.g. SQLite).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with translation_lock(path):
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            yield tmp_path
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+def remove_stale(directory: str, keep: Iterable[str]) -> int:
+    """
+    Remove every file below `directory` that is not in `keep` (paths as
+    written), then empty subdirectories. Builders write their outputs in place
+    with write_bytes_atomic() and call this afterwards, so unchanged files keep
+    their timestamps. Returns the number of files removed.
+    """
+    keep_abs = {os.path.abspath(path) for path in keep}
+    removed = 0
+    for root, dirs, files in os.walk(directory, topdown=False):
+        for filename in files:
+            path = os.path.join(root, filename)
+            if os.path.abspath(path) not in keep_abs:
+                os.remove(path)
+                removed += 1
+        if root != directory and not os.listdir(root):
+            os.rmdir(root)
+    return removed
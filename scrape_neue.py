@@ -4,51 +4,74 @@ Scrape the NeÜ (neue Evangelistische Übersetzung) from neue.derbibelvertrauen.
 and create TypeScript files in the same structure as Einheitsübersetzung.
 
 Usage:
-    python3 scrape_neue.py [book_id]  # Scrape specific book
-    python3 scrape_neue.py --all-nt   # Scrape all New Testament books
+    python3 scrape_neue.py [book_id]            # Scrape specific book
+    python3 scrape_neue.py --all-nt             # Scrape all New Testament books
+    python3 scrape_neue.py --all-nt --resume    # Continue an interrupted --all-nt run
+
+Add --split-cold to write introductions and footnotes into <book>.cold.json
+companions instead of the book modules.
 """
 
 import requests
 from bs4 import BeautifulSoup
+import hashlib
 import json
 import os
 import sys
 import re
+import time
+from datetime import datetime, timezone
 from typing import List, Dict, Optional
 
+from bible_corpus import (
+    book_index,
+    cold_path,
+    generated_path,
+    load_book_catalog,
+    manifest_path,
+    split_cold_fields,
+    write_json,
+)
+from build_manifest import build_manifest
+from build_render_tokens import write_book_tokens
+from safe_io import write_text_atomic
+
+# Page of each New Testament book on the NeÜ website
+NT_BOOK_URLS = {
+    "matthew": "mt.html", "mark": "mk.html", "luke": "lk.html", "john": "jo.html",
+    "acts": "apg.html", "romans": "roe.html", "1corinthians": "1kor.html",
+    "2corinthians": "2kor.html", "galatians": "gal.html", "ephesians": "eph.html",
+    "philippians": "phil.html", "colossians": "kol.html", "1thessalonians": "1thes.html",
+    "2thessalonians": "2thes.html", "1timothy": "1tim.html", "2timothy": "2tim.html",
+    "titus": "tit.html", "philemon": "phm.html", "hebrews": "hebr.html", "james": "jak.html",
+    "1peter": "1pt.html", "2peter": "2pt.html", "1john": "1jo.html", "2john": "2jo.html",
+    "3john": "3jo.html", "jude": "jud.html", "revelation": "off.html",
+}
+
 # New Testament books mapping: book_id -> (url_suffix, german_name, short_name)
+# Names come from BIBLE_BOOKS in lib/types.ts; NeÜ writes short names without
+# the space ("1Kor" instead of "1. Kor").
 NT_BOOKS = {
-    "matthew": ("mt.html", "Matthäus", "Mt"),
-    "mark": ("mk.html", "Markus", "Mk"),
-    "luke": ("lk.html", "Lukas", "Lk"),
-    "john": ("jo.html", "Johannes", "Joh"),
-    "acts": ("apg.html", "Apostelgeschichte", "Apg"),
-    "romans": ("roe.html", "Römer", "Röm"),
-    "1corinthians": ("1kor.html", "1. Korinther", "1Kor"),
-    "2corinthians": ("2kor.html", "2. Korinther", "2Kor"),
-    "galatians": ("gal.html", "Galater", "Gal"),
-    "ephesians": ("eph.html", "Epheser", "Eph"),
-    "philippians": ("phil.html", "Philipper", "Phil"),
-    "colossians": ("kol.html", "Kolosser", "Kol"),
-    "1thessalonians": ("1thes.html", "1. Thessalonicher", "1Thess"),
-    "2thessalonians": ("2thes.html", "2. Thessalonicher", "2Thess"),
-    "1timothy": ("1tim.html", "1. Timotheus", "1Tim"),
-    "2timothy": ("2tim.html", "2. Timotheus", "2Tim"),
-    "titus": ("tit.html", "Titus", "Tit"),
-    "philemon": ("phm.html", "Philemon", "Phlm"),
-    "hebrews": ("hebr.html", "Hebräer", "Hebr"),
-    "james": ("jak.html", "Jakobus", "Jak"),
-    "1peter": ("1pt.html", "1. Petrus", "1Petr"),
-    "2peter": ("2pt.html", "2. Petrus", "2Petr"),
-    "1john": ("1jo.html", "1. Johannes", "1Joh"),
-    "2john": ("2jo.html", "2. Johannes", "2Joh"),
-    "3john": ("3jo.html", "3. Johannes", "3Joh"),
-    "jude": ("jud.html", "Judas", "Jud"),
-    "revelation": ("off.html", "Offenbarung", "Offb"),
+    book['id']: (NT_BOOK_URLS[book['id']], book['name'], book['shortName'].replace('. ', ''))
+    for book in load_book_catalog()
+    if book['testament'] == 'new'
 }
 
 BASE_URL = "https://neue.derbibelvertrauen.de/"
 OUTPUT_DIR = "data/bibel/Neue_Evangelistische_Uebersetzung/NT"
+TRANSLATION_ID = "neue"
+
+# Checkpoint journal of --all-nt runs (one JSON record per line)
+JOURNAL_PATH = "scrape_neue.journal.jsonl"
+
+# Retries per book, with exponential backoff: 2s, 4s, 8s, ...
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 2.0
+
+
+class FetchError(Exception):
+    """Raised when a page cannot be downloaded."""
+
 
 def fetch_html(url: str) -> BeautifulSoup:
     """Fetch and parse HTML from URL."""
@@ -58,8 +81,7 @@ def fetch_html(url: str) -> BeautifulSoup:
         response.encoding = 'utf-8'
         return BeautifulSoup(response.text, 'html.parser')
     except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        sys.exit(1)
+        raise FetchError(f"Error fetching {url}: {e}") from e
 
 def clean_text(text: str) -> str:
     """Clean text by removing extra whitespace and normalizing."""
@@ -263,8 +285,22 @@ def escape_string(s: str) -> str:
     s = s.replace('${', '\\${')
     return s
 
-def generate_typescript(book: Dict, output_path: str) -> None:
-    """Generate TypeScript file from book data."""
+def generate_typescript(book: Dict, output_path: str, split_cold: bool = False) -> str:
+    """
+    Generate TypeScript file from book data. Returns the SHA-256 of the content.
+
+    With split_cold the introduction and the footnotes go into the companion
+    <book>.cold.json (see bible_corpus.split_cold_fields), which the app loads
+    only when they are shown.
+    """
+    full_book = book
+    cold_file = cold_path(output_path)
+    if split_cold:
+        book, cold = split_cold_fields(book, book_index(book['id']))
+        if write_json(cold_file, cold):
+            print(f"✓ Written to {cold_file}")
+    elif os.path.exists(cold_file):
+        os.remove(cold_file)
 
     # Start building the TypeScript content
     # Add underscore prefix if book ID starts with a digit (for valid TypeScript identifiers)
@@ -280,8 +316,9 @@ def generate_typescript(book: Dict, output_path: str) -> None:
     ]
 
     # Add introduction
-    intro = escape_string(book['introduction'])
-    lines.append(f'  introduction: `{intro}`,')
+    if 'introduction' in book:
+        intro = escape_string(book['introduction'])
+        lines.append(f'  introduction: `{intro}`,')
 
     # Add chapters
     lines.append('  chapters: [')
@@ -309,6 +346,8 @@ def generate_typescript(book: Dict, output_path: str) -> None:
                     if i < len(verse['footnotes']) - 1:
                         verse_line += ', '
                 verse_line += ']'
+            elif 'footnoteCount' in verse:
+                verse_line += f', footnoteCount: {verse["footnoteCount"]}'
 
             verse_line += ' },'
             lines.append(verse_line)
@@ -318,34 +357,115 @@ def generate_typescript(book: Dict, output_path: str) -> None:
     lines.append('  ]')
     lines.append('};')
 
-    # Write to file
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    # Write to file (atomically, skipped if unchanged)
+    content = '\n'.join(lines)
+    if write_text_atomic(output_path, content):
+        print(f"✓ Written to {output_path}")
+    else:
+        print(f"✓ Unchanged: {output_path}")
+
+    # Render-ready tokens for VerseText.tsx
+    write_book_tokens(full_book, generated_path(TRANSLATION_ID, "render", f"{book['id']}.json"))
+
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
-    print(f"✓ Written to {output_path}")
+def file_sha256(path: str) -> Optional[str]:
+    """SHA-256 of a file on disk, or None if it does not exist."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def read_journal() -> Dict[str, Dict]:
+    """Replay the checkpoint journal: book_id -> latest record."""
+    state = {}
+    if not os.path.exists(JOURNAL_PATH):
+        return state
+    with open(JOURNAL_PATH, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn last line from an interrupted run
+            state[record['book']] = record
+    return state
+
+def append_journal(record: Dict) -> None:
+    """Append one record to the journal and flush it to disk."""
+    record['time'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    with open(JOURNAL_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+def is_completed(book_id: str, journal: Dict[str, Dict]) -> bool:
+    """A book is done if the journal says so and the file still has the recorded hash."""
+    record = journal.get(book_id)
+    if not record or record.get('status') != 'done':
+        return False
+    return file_sha256(os.path.join(OUTPUT_DIR, f"{book_id}.ts")) == record.get('sha256')
+
+def scrape_with_retry(book_id: str, split_cold: bool = False) -> str:
+    """Scrape and write one book, retrying with exponential backoff. Returns the content hash."""
+    url_suffix, german_name, short_name = NT_BOOKS[book_id]
+    output_path = os.path.join(OUTPUT_DIR, f"{book_id}.ts")
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            book_data = scrape_book(book_id, url_suffix, german_name, short_name)
+            return generate_typescript(book_data, output_path, split_cold)
+        except Exception as e:
+            if attempt == MAX_ATTEMPTS:
+                raise
+            delay = BACKOFF_BASE ** attempt
+            print(f"✗ Attempt {attempt}/{MAX_ATTEMPTS} for {book_id} failed: {e}")
+            print(f"  Retrying in {delay:.0f}s...")
+            time.sleep(delay)
 
 def main():
+    split_cold = '--split-cold' in sys.argv
+    if split_cold:
+        sys.argv.remove('--split-cold')
+
     if len(sys.argv) < 2:
         print("Usage:")
         print("  python3 scrape_neue.py [book_id]   # Scrape specific book")
         print("  python3 scrape_neue.py --all-nt    # Scrape all NT books")
+        print("  python3 scrape_neue.py --all-nt --resume  # Continue an interrupted run")
+        print("  ... --split-cold                   # Introductions/footnotes as <book>.cold.json")
         print("\nAvailable book IDs:")
         for book_id in NT_BOOKS.keys():
             print(f"  - {book_id}")
         sys.exit(1)
 
     if sys.argv[1] == '--all-nt':
-        print("Scraping all New Testament books...")
-        for book_id, (url_suffix, german_name, short_name) in NT_BOOKS.items():
+        resume = '--resume' in sys.argv[2:]
+        journal = read_journal() if resume else {}
+        if not resume and os.path.exists(JOURNAL_PATH):
+            os.remove(JOURNAL_PATH)
+
+        pending = [book_id for book_id in NT_BOOKS if not is_completed(book_id, journal)]
+        if resume:
+            print(f"Resuming: {len(NT_BOOKS) - len(pending)} books done, {len(pending)} remaining...")
+        else:
+            print("Scraping all New Testament books...")
+
+        failed = []
+        for book_id in pending:
             try:
-                book_data = scrape_book(book_id, url_suffix, german_name, short_name)
-                output_path = os.path.join(OUTPUT_DIR, f"{book_id}.ts")
-                generate_typescript(book_data, output_path)
+                sha256 = scrape_with_retry(book_id, split_cold)
+                append_journal({'book': book_id, 'status': 'done', 'sha256': sha256})
             except Exception as e:
                 print(f"✗ Error scraping {book_id}: {e}")
                 import traceback
                 traceback.print_exc()
+                append_journal({'book': book_id, 'status': 'failed', 'error': str(e)})
+                failed.append(book_id)
+
+        if failed:
+            print(f"\n✗ {len(failed)} books failed: {', '.join(failed)}")
+            print("  Run again with --all-nt --resume to retry only these.")
     else:
         book_id = sys.argv[1]
         if book_id not in NT_BOOKS:
@@ -356,9 +476,18 @@ def main():
             sys.exit(1)
 
         url_suffix, german_name, short_name = NT_BOOKS[book_id]
-        book_data = scrape_book(book_id, url_suffix, german_name, short_name)
+        try:
+            book_data = scrape_book(book_id, url_suffix, german_name, short_name)
+        except FetchError as e:
+            print(e)
+            sys.exit(1)
         output_path = os.path.join(OUTPUT_DIR, f"{book_id}.ts")
-        generate_typescript(book_data, output_path)
+        generate_typescript(book_data, output_path, split_cold)
+
+    # Keep the book manifest in sync with the files on disk
+    manifest = build_manifest(TRANSLATION_ID, "Neue_Evangelistische_Uebersetzung")
+    write_json(manifest_path(manifest['folder']), manifest)
+    print(f"✓ Manifest updated ({len(manifest['books'])} books)")
 
     print("\n✓ Done!")
 
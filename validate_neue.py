@@ -7,17 +7,13 @@ import os
 import re
 import sys
 
+from bible_corpus import cold_path, export_name, load_book_catalog, load_manifest
+
 OUTPUT_DIR = "data/bibel/Neue_Evangelistische_Uebersetzung/NT"
 
-# Expected books
-EXPECTED_BOOKS = [
-    "matthew", "mark", "luke", "john", "acts",
-    "romans", "1corinthians", "2corinthians", "galatians", "ephesians",
-    "philippians", "colossians", "1thessalonians", "2thessalonians",
-    "1timothy", "2timothy", "titus", "philemon",
-    "hebrews", "james", "1peter", "2peter",
-    "1john", "2john", "3john", "jude", "revelation"
-]
+# Expected books: the New Testament of BIBLE_BOOKS in lib/types.ts
+CATALOG = {book['id']: book for book in load_book_catalog() if book['testament'] == 'new'}
+EXPECTED_BOOKS = list(CATALOG)
 
 def validate_file(filepath: str) -> tuple[bool, list]:
     """Validate a single TypeScript file."""
@@ -35,12 +31,15 @@ def validate_file(filepath: str) -> tuple[bool, list]:
 
     # Check for export statement
     book_name = os.path.splitext(os.path.basename(filepath))[0]
-    export_pattern = f'export const {book_name}: Book = {{'
+    export_pattern = f'export const {export_name(book_name)}: Book = {{'
     if export_pattern not in content:
         errors.append(f"Missing or incorrect export statement (expected: {export_pattern})")
 
     # Check for required fields
-    required_fields = ['id:', 'name:', 'shortName:', 'testament:', 'introduction:', 'chapters:']
+    # (the introduction may be split into the <book>.cold.json companion)
+    required_fields = ['id:', 'name:', 'shortName:', 'testament:', 'chapters:']
+    if not os.path.exists(cold_path(filepath)):
+        required_fields.insert(4, 'introduction:')
     for field in required_fields:
         if field not in content:
             errors.append(f"Missing required field: {field}")
@@ -60,6 +59,9 @@ def validate_file(filepath: str) -> tuple[bool, list]:
     else:
         num_chapters = len(chapter_matches)
         print(f"    Chapters: {num_chapters}")
+        expected_chapters = CATALOG[book_name]['chapters'] if book_name in CATALOG else None
+        if expected_chapters and num_chapters != expected_chapters:
+            errors.append(f"Expected {expected_chapters} chapters, found {num_chapters}")
 
     # Count verses
     verse_matches = re.findall(r'{ number: \d+, text:', content)
@@ -72,7 +74,7 @@ def validate_file(filepath: str) -> tuple[bool, list]:
         print(f"    Headings: {len(heading_matches)}")
 
     # Check for footnotes
-    footnote_matches = re.findall(r'footnotes:', content)
+    footnote_matches = re.findall(r'footnotes:|footnoteCount:', content)
     if footnote_matches:
         print(f"    Footnotes: {len(footnote_matches)}")
 
@@ -105,6 +107,18 @@ def main():
                 print(f"    - {error}")
             all_valid = False
 
+    # The manifest must list exactly the books present on disk
+    manifest = load_manifest("neue")
+    present = [book for book in EXPECTED_BOOKS if book not in missing_books]
+    if manifest is None:
+        print("\n✗ manifest.json missing (run build_manifest.py)")
+        all_valid = False
+    else:
+        listed = [book for book, entry in manifest['books'].items() if entry['folder'] == 'NT']
+        if sorted(listed) != sorted(present):
+            print("\n✗ manifest.json is out of date (run build_manifest.py)")
+            all_valid = False
+
     print("\n" + "=" * 80)
     if all_valid:
         print("✓ All files are valid!")